@@ -2,5 +2,16 @@
 
 from backend.arxiv.analyzer import ArxivPaperAnalyzer
 from backend.arxiv.client import ArxivClient
+from backend.arxiv.harvester import ArxivHarvester
+from backend.arxiv.index import ArxivIndex
+from backend.arxiv.ranking import PaperRanker
+from backend.arxiv.store import ArxivAnalysisStore
 
-__all__ = ["ArxivClient", "ArxivPaperAnalyzer"]
+__all__ = [
+    "ArxivAnalysisStore",
+    "ArxivClient",
+    "ArxivHarvester",
+    "ArxivIndex",
+    "ArxivPaperAnalyzer",
+    "PaperRanker",
+]
@@ -2,36 +2,97 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import re
 
+from backend.arxiv.store import ArxivAnalysisStore
 from backend.config import get_settings
 from backend.llm.client import LLMClient
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Keys the model returns, and the analysis fields they fill.
+PARSED_FIELDS = (
+    ("summary_3_lines", "ai_summary_3lines"),
+    ("method_highlights", "method_highlights"),
+    ("limitations", "limitations"),
+    ("reproduction_difficulty", "reproduction_difficulty"),
+    ("code_repo_url", "code_repo_url"),
+)
+
 
 class ArxivPaperAnalyzer:
     def __init__(self) -> None:
         self.settings = get_settings()
         self.client = LLMClient()
+        self.store = (
+            ArxivAnalysisStore(self.settings.arxiv_analysis_store_path)
+            if self.settings.arxiv_analysis_store_path
+            else None
+        )
 
     async def analyze_many(
         self, papers: list[dict], query: str, llm_config: dict | None = None
     ) -> list[dict]:
-        llm_budget = min(len(papers), max(0, self.settings.arxiv_analysis_llm_budget))
+        analyses: list[dict | None] = [None] * len(papers)
+        if self.store is not None:
+            stored = await asyncio.to_thread(self.store.get_many, papers)
+            for index, paper in enumerate(papers):
+                analyses[index] = stored.get(self.store.key_for(paper))
+
+        # Only papers missing from the store spend LLM budget.
+        unseen = [index for index, analysis in enumerate(analyses) if analysis is None]
+        llm_budget = min(len(unseen), max(0, self.settings.arxiv_analysis_llm_budget))
         can_use_llm = llm_budget > 0 and self.client.is_available_for(llm_config)
+        semaphore = asyncio.Semaphore(self.settings.arxiv_analysis_concurrency)
+        batch_size = self.settings.arxiv_analysis_batch_size
+
+        async def analyze(chunk: list[dict]) -> list[dict]:
+            async with semaphore:
+                # A 429 from a sibling analysis starts a cooldown; do not queue more calls behind it.
+                if self.client.is_cooling_down:
+                    return [self._fallback_analysis(paper) for paper in chunk]
+                try:
+                    if len(chunk) == 1:
+                        analysis = await asyncio.wait_for(
+                            self.analyze_paper(query=query, paper=chunk[0], llm_config=llm_config),
+                            timeout=self.settings.arxiv_analysis_timeout_seconds,
+                        )
+                        return [analysis]
+                    return await asyncio.wait_for(
+                        self.analyze_batch(query=query, papers=chunk, llm_config=llm_config),
+                        timeout=self.settings.arxiv_analysis_timeout_seconds,
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        "ArXiv paper analysis timed out: %s",
+                        ", ".join(paper.get("arxiv_id", "") for paper in chunk),
+                    )
+                    return [self._fallback_analysis(paper) for paper in chunk]
+
+        llm_indices = unseen[:llm_budget] if can_use_llm else []
+        chunks = [
+            llm_indices[start : start + batch_size] for start in range(0, len(llm_indices), batch_size)
+        ]
+        results = await asyncio.gather(
+            *(analyze([papers[index] for index in chunk]) for chunk in chunks)
+        )
+
+        fresh: list[tuple[dict, dict]] = []
+        for chunk, chunk_analyses in zip(chunks, results):
+            for index, analysis in zip(chunk, chunk_analyses):
+                analyses[index] = analysis
+                if analysis != self._fallback_analysis(papers[index]):
+                    fresh.append((papers[index], analysis))
+        if self.store is not None and fresh:
+            await asyncio.to_thread(self.store.put_many, fresh)
+
         enriched: list[dict] = []
-        for index, paper in enumerate(papers):
-            analysis = await self.analyze_paper(
-                query=query,
-                paper=paper,
-                llm_config=llm_config,
-                use_llm=can_use_llm and index < llm_budget,
-            )
+        for paper, analysis in zip(papers, analyses):
             item = dict(paper)
-            item.update(analysis)
+            item.update(analysis or self._fallback_analysis(paper))
             enriched.append(item)
         return enriched
 
@@ -53,10 +114,7 @@ class ArxivPaperAnalyzer:
         )
         user_prompt = (
             f"User intent: {query}\n"
-            f"Title: {paper.get('title', '')}\n"
-            f"Summary: {paper.get('summary', '')}\n"
-            f"Authors: {', '.join(paper.get('authors', []))}\n"
-            f"Categories: {', '.join(paper.get('categories', []))}\n"
+            f"{self._paper_block(paper)}"
             "If code repository is unknown, use empty string."
         )
 
@@ -71,19 +129,83 @@ class ArxivPaperAnalyzer:
             parsed = self._parse_json(raw)
             if not parsed:
                 return fallback
-            return {
-                "ai_summary_3lines": parsed.get("summary_3_lines") or fallback["ai_summary_3lines"],
-                "method_highlights": parsed.get("method_highlights") or fallback["method_highlights"],
-                "limitations": parsed.get("limitations") or fallback["limitations"],
-                "reproduction_difficulty": self._normalize_difficulty(
-                    parsed.get("reproduction_difficulty", fallback["reproduction_difficulty"])
-                ),
-                "code_repo_url": parsed.get("code_repo_url") or fallback["code_repo_url"],
-            }
+            return self._merge_analysis(parsed, fallback)
         except Exception as exc:  # pragma: no cover - external provider failures vary by env
             logger.warning("ArXiv paper analysis failed: %s", exc)
             return fallback
 
+    async def analyze_batch(
+        self, query: str, papers: list[dict], llm_config: dict | None = None
+    ) -> list[dict]:
+        """Analyze several papers with one LLM request, falling back per paper."""
+        fallbacks = [self._fallback_analysis(paper) for paper in papers]
+        if not papers or not self.client.is_available_for(llm_config):
+            return fallbacks
+
+        keys = [paper.get("arxiv_id") or f"paper-{index}" for index, paper in enumerate(papers)]
+        system_prompt = (
+            "You are an ML paper analyst. Return a strict JSON array with one object per paper. "
+            "Each object has keys: arxiv_id, summary_3_lines, method_highlights, limitations, "
+            "reproduction_difficulty, code_repo_url. Copy arxiv_id exactly as given. "
+            "Use concise plain text. reproduction_difficulty must be one of: low, medium, high."
+        )
+        blocks = [
+            f"arxiv_id: {key}\n{self._paper_block(paper)}" for key, paper in zip(keys, papers)
+        ]
+        user_prompt = (
+            f"User intent: {query}\n\n"
+            + "\n".join(blocks)
+            + "\nIf code repository is unknown, use empty string."
+        )
+
+        # `complete` logs provider failures itself and returns an empty string for them.
+        raw = await self.client.complete(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            runtime_config=llm_config,
+        )
+        if not raw.strip():
+            return fallbacks
+
+        by_id = self._parse_json_items(raw)
+        analyses: list[dict] = []
+        for key, fallback in zip(keys, fallbacks):
+            parsed = by_id.get(key)
+            if not parsed:
+                analyses.append(fallback)
+                continue
+            # One malformed entry falls back on its own; the rest of the batch still merges.
+            try:
+                analyses.append(self._merge_analysis(parsed, fallback))
+            except ValueError as exc:
+                logger.warning("Malformed arXiv batch analysis for %s: %s", key, exc)
+                analyses.append(fallback)
+        return analyses
+
+    def _paper_block(self, paper: dict) -> str:
+        return (
+            f"Title: {paper.get('title', '')}\n"
+            f"Summary: {paper.get('summary', '')}\n"
+            f"Authors: {', '.join(paper.get('authors', []))}\n"
+            f"Categories: {', '.join(paper.get('categories', []))}\n"
+        )
+
+    def _merge_analysis(self, parsed: dict, fallback: dict) -> dict:
+        """Fill missing fields from `fallback`; raise ValueError when a field is not a string."""
+        merged: dict[str, str] = {}
+        for source, target in PARSED_FIELDS:
+            value = parsed.get(source)
+            if value is None or value == "":
+                merged[target] = fallback[target]
+            elif isinstance(value, str):
+                merged[target] = value
+            else:
+                raise ValueError(f"{source} is {type(value).__name__}, not a string")
+        merged["reproduction_difficulty"] = self._normalize_difficulty(
+            merged["reproduction_difficulty"]
+        )
+        return merged
+
     def _fallback_analysis(self, paper: dict) -> dict:
         summary = paper.get("summary", "")
         lines = self._three_line_summary(summary)
@@ -97,20 +219,53 @@ class ArxivPaperAnalyzer:
         }
 
     def _parse_json(self, raw: str) -> dict:
+        payload = self._load_json(raw)
+        return payload if isinstance(payload, dict) else {}
+
+    def _parse_json_items(self, raw: str) -> dict[str, dict]:
+        payload = self._load_json(raw)
+        if payload is None:
+            # Models sometimes wrap the array in prose; retry on the outermost brackets.
+            start, end = raw.find("["), raw.rfind("]")
+            if 0 <= start < end:
+                payload = self._load_json(raw[start : end + 1])
+
+        if isinstance(payload, dict) and "arxiv_id" in payload:
+            payload = [payload]
+        elif isinstance(payload, dict):
+            nested = next((value for value in payload.values() if isinstance(value, list)), None)
+            if nested is not None:
+                payload = nested
+            else:
+                payload = [
+                    {**value, "arxiv_id": key}
+                    for key, value in payload.items()
+                    if isinstance(value, dict)
+                ]
+        if not isinstance(payload, list):
+            return {}
+
+        items: dict[str, dict] = {}
+        for entry in payload:
+            if not isinstance(entry, dict):
+                continue
+            key = str(entry.get("arxiv_id") or "").strip()
+            if key:
+                items[key] = entry
+        return items
+
+    def _load_json(self, raw: str) -> dict | list | None:
         text = raw.strip()
         if not text:
-            return {}
+            return None
         if text.startswith("```"):
             text = text.strip("`")
             if text.lower().startswith("json"):
                 text = text[4:].strip()
         try:
-            payload = json.loads(text)
-            if isinstance(payload, dict):
-                return payload
+            return json.loads(text)
         except json.JSONDecodeError:
-            return {}
-        return {}
+            return None
 
     def _three_line_summary(self, summary: str) -> str:
         clean = " ".join(summary.split())
@@ -3,58 +3,206 @@
 from __future__ import annotations
 
 import asyncio
-import re
-import time
+import os
+import tempfile
 import urllib.parse
 import xml.etree.ElementTree as ET
-from datetime import datetime, timezone
-
-import aiohttp
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
 
+from backend.arxiv.index import ArxivIndex
+from backend.arxiv.ranking import PaperRanker
 from backend.config import get_settings
+from backend.utils.cache import TTLCache
 from backend.utils.logger import get_logger
+from backend.utils.metrics import metrics
+from backend.utils.ratelimit import RateLimiter
+from backend.utils.timings import record_timing
 
 logger = get_logger(__name__)
 
 ATOM_NS = {"atom": "http://www.w3.org/2005/Atom", "arxiv": "http://arxiv.org/schemas/atom"}
+ATOM = "{" + ATOM_NS["atom"] + "}"
+ARXIV = "{" + ATOM_NS["arxiv"] + "}"
+ATOM_ENTRY = f"{ATOM}entry"
+ATOM_ID = f"{ATOM}id"
+ATOM_TITLE = f"{ATOM}title"
+ATOM_SUMMARY = f"{ATOM}summary"
+ATOM_PUBLISHED = f"{ATOM}published"
+ATOM_UPDATED = f"{ATOM}updated"
+ATOM_AUTHOR = f"{ATOM}author"
+ATOM_NAME = f"{ATOM}name"
+ATOM_CATEGORY = f"{ATOM}category"
+ATOM_LINK = f"{ATOM}link"
+ARXIV_COMMENT = f"{ARXIV}comment"
+ARXIV_PRIMARY_CATEGORY = f"{ARXIV}primary_category"
+FEED_CHUNK_SIZE = 64 * 1024
+# Overall bound on one user-facing feed request; harvester paging only uses per-socket timeouts.
+FEED_TIMEOUT_SECONDS = 20.0
+FEED_SOCKET_TIMEOUT_SECONDS = 20.0
+
+
+class FeedParser:
+    """Incremental Atom parser that emits entries as their closing tag arrives.
+
+    Finished entries are detached from the tree, so memory stays bounded by one
+    entry plus the unparsed tail of the byte stream.
+    """
+
+    def __init__(self, client: ArxivClient) -> None:
+        self._client = client
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._root: ET.Element | None = None
+
+    def feed(self, data: bytes) -> list[dict]:
+        self._parser.feed(data)
+        return self._drain()
+
+    def close(self) -> list[dict]:
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> list[dict]:
+        entries: list[dict] = []
+        for event, element in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = element
+                continue
+            if element.tag != ATOM_ENTRY:
+                continue
+            entries.append(self._client._parse_entry(element))
+            element.clear()
+            if self._root is not None:
+                self._root.remove(element)
+        return entries
 
 
 class ArxivClient:
     def __init__(self) -> None:
         self.settings = get_settings()
-        self._request_lock = asyncio.Lock()
-        self._last_request_ts = 0.0
+        state_path = None
+        if self.settings.arxiv_rate_limit_shared:
+            state_path = self.settings.arxiv_rate_limit_state_path or os.path.join(
+                tempfile.gettempdir(), "autosearch-arxiv-ratelimit"
+            )
+        self.rate_limiter = RateLimiter(
+            interval_seconds=self.settings.arxiv_min_interval_seconds,
+            burst=self.settings.arxiv_rate_limit_burst,
+            state_path=state_path,
+            max_waiters=self.settings.arxiv_rate_limit_max_waiters,
+            timeout_seconds=self.settings.arxiv_rate_limit_timeout_seconds,
+        )
+        self.index = (
+            ArxivIndex(self.settings.arxiv_index_path) if self.settings.arxiv_index_path else None
+        )
+        self._feed_cache = TTLCache(
+            ttl_seconds=self.settings.arxiv_feed_cache_ttl,
+            max_size=self.settings.arxiv_feed_cache_max_size,
+        )
+        self._inflight: dict[str, tuple[int, asyncio.Task]] = {}
+        self.ranker = PaperRanker()
 
     async def search(
         self,
         query: str,
         max_results: int = 12,
         categories: list[str] | None = None,
+        queue_timeout: float | None = None,
     ) -> list[dict]:
+        """Search the local index, else the API; `queue_timeout` caps the rate-limiter wait."""
         allowed_categories = categories or self.settings.arxiv_categories
         request_count = max(1, min(max_results, self.settings.arxiv_max_results))
-        search_query = self._build_query(query, allowed_categories)
-        encoded_query = urllib.parse.quote_plus(search_query)
-        url = (
-            f"{self.settings.arxiv_base_url}?search_query={encoded_query}"
-            f"&start=0&max_results={request_count}&sortBy=submittedDate&sortOrder=descending"
-        )
 
-        xml_text = await self._fetch(url)
-        return self._parse_feed(xml_text)
+        if self.index is not None:
+            indexed = await asyncio.to_thread(
+                self.index.search, query, allowed_categories, request_count
+            )
+            if indexed:
+                return indexed
 
-    def rank_papers(self, papers: list[dict], query: str) -> list[dict]:
-        query_tokens = self._tokenize(query)
+        search_query = self._build_query(query, allowed_categories)
+        return await self._cached_fetch(search_query, request_count, queue_timeout)
 
-        scored: list[dict] = []
-        for item in papers:
-            score = self._score(item, query_tokens)
-            enriched = dict(item)
-            enriched["relevance_score"] = round(score, 4)
-            scored.append(enriched)
+    async def _cached_fetch(
+        self, search_query: str, request_count: int, queue_timeout: float | None = None
+    ) -> list[dict]:
+        # `max_results` is left out of the key so a larger cached fetch can serve smaller requests.
+        key = self._query_url(search_query, start=0, max_results=None, sort_by="submittedDate")
+
+        cached = self._feed_cache.get(key)
+        if cached is not None:
+            fetched_count, papers = cached
+            # A short page means the result set was exhausted, so it answers any size.
+            if fetched_count >= request_count or len(papers) < fetched_count:
+                metrics.inc("autosearch_cache_requests_total", cache="arxiv_feed", result="hit")
+                return papers[:request_count]
+        metrics.inc("autosearch_cache_requests_total", cache="arxiv_feed", result="miss")
+
+        inflight = self._inflight.get(key)
+        if inflight is None or inflight[0] < request_count:
+            task = asyncio.ensure_future(
+                self.fetch_page(
+                    search_query,
+                    start=0,
+                    max_results=request_count,
+                    queue_timeout=queue_timeout,
+                )
+            )
+            inflight = (request_count, task)
+            self._inflight[key] = inflight
+            task.add_done_callback(lambda done: self._store_feed(key, request_count, done))
+
+        # Shield the shared fetch so one cancelled caller does not cancel the others.
+        papers = await asyncio.shield(inflight[1])
+        return papers[:request_count]
+
+    def _store_feed(self, key: str, request_count: int, task: asyncio.Task) -> None:
+        if self._inflight.get(key, (0, None))[1] is task:
+            self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        cached = self._feed_cache.get(key)
+        if cached is None or cached[0] <= request_count:
+            self._feed_cache.set(key, (request_count, task.result()))
+
+    async def fetch_page(
+        self,
+        search_query: str,
+        start: int = 0,
+        max_results: int = 12,
+        sort_by: str = "submittedDate",
+        timeout: float | None = FEED_TIMEOUT_SECONDS,
+        queue_timeout: float | None = None,
+    ) -> list[dict]:
+        url = self._query_url(search_query, start=start, max_results=max_results, sort_by=sort_by)
+        entries = self._stream_entries(url, total_timeout=timeout, queue_timeout=queue_timeout)
+        async with aclosing(entries):
+            return [paper async for paper in entries]
 
-        scored.sort(key=lambda paper: paper.get("relevance_score", 0.0), reverse=True)
-        return scored
+    async def iter_search(
+        self,
+        search_query: str,
+        page_size: int = 100,
+        max_total: int | None = None,
+        sort_by: str = "submittedDate",
+    ) -> AsyncGenerator[dict, None]:
+        """Page through a result set with `start`/`max_results` windows, one record at a time."""
+        start = 0
+        while max_total is None or start < max_total:
+            window = page_size if max_total is None else min(page_size, max_total - start)
+            url = self._query_url(search_query, start=start, max_results=window, sort_by=sort_by)
+            received = 0
+            async with aclosing(self._stream_entries(url)) as entries:
+                async for paper in entries:
+                    received += 1
+                    yield paper
+            if received < window:
+                return
+            start += window
+
+    def rank_papers(self, papers: list[dict], query: str) -> list[dict]:
+        return self.ranker.rank(papers, query)
 
     def _build_query(self, query: str, categories: list[str]) -> str:
         category_expr = " OR ".join(f"cat:{item}" for item in categories if item)
@@ -66,129 +214,104 @@ class ArxivClient:
             return f"(all:{stripped_query}) AND ({category_expr})"
         return f"({category_expr})"
 
-    async def _fetch(self, url: str) -> str:
-        timeout = aiohttp.ClientTimeout(total=20)
-        connector = aiohttp.TCPConnector(limit=1, ssl=False)
+    def _query_url(
+        self, search_query: str, start: int, max_results: int | None, sort_by: str
+    ) -> str:
+        encoded_query = urllib.parse.quote_plus(search_query)
+        window = f"&start={start}"
+        if max_results is not None:
+            window += f"&max_results={max_results}"
+        return (
+            f"{self.settings.arxiv_base_url}?search_query={encoded_query}"
+            f"{window}&sortBy={sort_by}&sortOrder=descending"
+        )
 
-        async with self._request_lock:
-            elapsed = time.monotonic() - self._last_request_ts
-            wait_seconds = self.settings.arxiv_min_interval_seconds - elapsed
-            if wait_seconds > 0:
-                await asyncio.sleep(wait_seconds)
+    async def _stream_entries(
+        self, url: str, total_timeout: float | None = None, queue_timeout: float | None = None
+    ) -> AsyncGenerator[dict, None]:
+        import aiohttp
 
-            async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
-                async with session.get(url, headers={"User-Agent": "AutoSearch-AI/0.1"}) as response:
-                    response.raise_for_status()
-                    text = await response.text()
-                    self._last_request_ts = time.monotonic()
-                    return text
+        # Reserve the slot first: a rejected acquire must not leave an unowned connector behind.
+        waited = await self.rate_limiter.acquire(timeout=queue_timeout)
+        record_timing("arxiv_queue_wait", waited)
 
-    def _parse_feed(self, xml_text: str) -> list[dict]:
-        root = ET.fromstring(xml_text)
-        entries: list[dict] = []
+        timeout = aiohttp.ClientTimeout(
+            total=total_timeout,
+            sock_connect=FEED_SOCKET_TIMEOUT_SECONDS,
+            sock_read=FEED_SOCKET_TIMEOUT_SECONDS,
+        )
+        connector = aiohttp.TCPConnector(limit=1, ssl=False)
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            async with session.get(url, headers={"User-Agent": "AutoSearch-AI/0.1"}) as response:
+                response.raise_for_status()
+                parser = FeedParser(self)
+                async for chunk in response.content.iter_chunked(FEED_CHUNK_SIZE):
+                    for paper in parser.feed(chunk):
+                        yield paper
+                for paper in parser.close():
+                    yield paper
 
-        for entry in root.findall("atom:entry", ATOM_NS):
-            id_url = self._normalize_arxiv_url(
-                (entry.findtext("atom:id", default="", namespaces=ATOM_NS) or "").strip()
-            )
-            arxiv_id = id_url.rsplit("/", 1)[-1] if id_url else ""
-            title = self._normalize_whitespace(
-                entry.findtext("atom:title", default="", namespaces=ATOM_NS) or ""
-            )
-            summary = self._normalize_whitespace(
-                entry.findtext("atom:summary", default="", namespaces=ATOM_NS) or ""
-            )
-            published = (entry.findtext("atom:published", default="", namespaces=ATOM_NS) or "").strip()
-            updated = (entry.findtext("atom:updated", default="", namespaces=ATOM_NS) or "").strip()
-            comment = self._normalize_whitespace(
-                entry.findtext("arxiv:comment", default="", namespaces=ATOM_NS) or ""
-            )
-            comment = comment or None
+    def _parse_feed(self, xml_text: str) -> list[dict]:
+        parser = FeedParser(self)
+        entries = parser.feed(xml_text.encode("utf-8"))
+        entries.extend(parser.close())
+        return entries
 
-            authors = []
-            for author in entry.findall("atom:author", ATOM_NS):
-                name = (author.findtext("atom:name", default="", namespaces=ATOM_NS) or "").strip()
+    def _parse_entry(self, entry: ET.Element) -> dict:
+        id_url = ""
+        title = summary = published = updated = comment = primary_category = pdf_url = ""
+        authors: list[str] = []
+        categories: list[str] = []
+
+        # One pass over the children instead of a namespaced findtext/findall per field.
+        for child in entry:
+            tag = child.tag
+            if tag == ATOM_ID:
+                id_url = self._normalize_arxiv_url((child.text or "").strip())
+            elif tag == ATOM_TITLE:
+                title = self._normalize_whitespace(child.text or "")
+            elif tag == ATOM_SUMMARY:
+                summary = self._normalize_whitespace(child.text or "")
+            elif tag == ATOM_PUBLISHED:
+                published = (child.text or "").strip()
+            elif tag == ATOM_UPDATED:
+                updated = (child.text or "").strip()
+            elif tag == ARXIV_COMMENT:
+                comment = self._normalize_whitespace(child.text or "")
+            elif tag == ATOM_AUTHOR:
+                name = (child.findtext(ATOM_NAME) or "").strip()
                 if name:
                     authors.append(name)
-
-            categories = []
-            for category in entry.findall("atom:category", ATOM_NS):
-                term = category.attrib.get("term", "").strip()
+            elif tag == ATOM_CATEGORY:
+                term = child.attrib.get("term", "").strip()
                 if term:
                     categories.append(term)
-
-            primary_category = ""
-            primary_tag = entry.find("arxiv:primary_category", ATOM_NS)
-            if primary_tag is not None:
-                primary_category = primary_tag.attrib.get("term", "").strip()
-
-            pdf_url = ""
-            for link in entry.findall("atom:link", ATOM_NS):
-                href = link.attrib.get("href", "").strip()
-                href = self._normalize_arxiv_url(href)
-                link_type = link.attrib.get("type", "").strip()
-                link_title = link.attrib.get("title", "").strip().lower()
-                if not href:
-                    continue
-                if link_type == "application/pdf" or link_title == "pdf":
+            elif tag == ARXIV_PRIMARY_CATEGORY:
+                primary_category = child.attrib.get("term", "").strip()
+            elif tag == ATOM_LINK and not pdf_url:
+                href = self._normalize_arxiv_url(child.attrib.get("href", "").strip())
+                link_type = child.attrib.get("type", "").strip()
+                link_title = child.attrib.get("title", "").strip().lower()
+                if href and (link_type == "application/pdf" or link_title == "pdf"):
                     pdf_url = href
-                    break
-
-            if not pdf_url and arxiv_id:
-                pdf_url = self._normalize_arxiv_url(f"https://arxiv.org/pdf/{arxiv_id}.pdf")
-
-            entries.append(
-                {
-                    "arxiv_id": arxiv_id,
-                    "title": title or "Untitled",
-                    "url": id_url or f"https://arxiv.org/abs/{arxiv_id}",
-                    "pdf_url": pdf_url,
-                    "summary": summary,
-                    "published_date": published,
-                    "updated_date": updated,
-                    "authors": authors,
-                    "categories": categories,
-                    "primary_category": primary_category,
-                    "comment": comment,
-                }
-            )
-
-        return entries
 
-    def _score(self, paper: dict, query_tokens: set[str]) -> float:
-        title = paper.get("title", "").lower()
-        summary = paper.get("summary", "").lower()
-        categories = " ".join(paper.get("categories", [])).lower()
-        score = 0.0
-
-        for token in query_tokens:
-            if token in title:
-                score += 2.0
-            if token in summary:
-                score += 1.0
-            if token in categories:
-                score += 0.5
-
-        published = paper.get("published_date", "")
-        score += self._recency_score(published)
-        return score
-
-    def _recency_score(self, published_date: str) -> float:
-        if not published_date:
-            return 0.0
-        try:
-            published = datetime.fromisoformat(published_date.replace("Z", "+00:00"))
-        except ValueError:
-            return 0.0
-
-        now = datetime.now(timezone.utc)
-        age_days = max(0.0, (now - published).total_seconds() / 86400)
-        # New papers get a small boost without overwhelming relevance score.
-        return max(0.0, 2.0 - (age_days / 30.0))
-
-    def _tokenize(self, text: str) -> set[str]:
-        tokens = re.findall(r"[a-zA-Z0-9]{3,}", text.lower())
-        return set(tokens)
+        arxiv_id = id_url.rsplit("/", 1)[-1] if id_url else ""
+        if not pdf_url and arxiv_id:
+            pdf_url = self._normalize_arxiv_url(f"https://arxiv.org/pdf/{arxiv_id}.pdf")
+
+        return {
+            "arxiv_id": arxiv_id,
+            "title": title or "Untitled",
+            "url": id_url or f"https://arxiv.org/abs/{arxiv_id}",
+            "pdf_url": pdf_url,
+            "summary": summary,
+            "published_date": published,
+            "updated_date": updated,
+            "authors": authors,
+            "categories": categories,
+            "primary_category": primary_category,
+            "comment": comment or None,
+        }
 
     def _normalize_whitespace(self, text: str) -> str:
         return " ".join(text.split())
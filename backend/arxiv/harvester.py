@@ -0,0 +1,84 @@
+"""Background harvester that keeps the local arXiv index up to date."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import aclosing
+from datetime import datetime, timedelta, timezone
+
+from backend.arxiv.client import ArxivClient
+from backend.arxiv.index import ArxivIndex
+from backend.config import get_settings
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ArxivHarvester:
+    """Walk `lastUpdatedDate` windows per category, resuming from the stored checkpoint."""
+
+    def __init__(self, client: ArxivClient, index: ArxivIndex | None = None) -> None:
+        self.settings = get_settings()
+        self.client = client
+        index = index or client.index
+        if index is None:
+            raise ValueError("ArxivHarvester requires ARXIV_INDEX_PATH to be configured")
+        self.index = index
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                harvested = await self.run_once()
+                logger.info("ArXiv harvest finished: %d records", harvested)
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # pragma: no cover - network failures vary by env
+                # Keep harvesting on the next interval, but keep the traceback for diagnosis.
+                logger.exception("ArXiv harvest failed")
+            await asyncio.sleep(self.settings.arxiv_harvest_interval_seconds)
+
+    async def run_once(self, until: datetime | None = None) -> int:
+        end = until or datetime.now(timezone.utc)
+        total = 0
+        for category in self.settings.arxiv_categories:
+            total += await self.harvest_category(category, until=end)
+        return total
+
+    async def harvest_category(self, category: str, until: datetime) -> int:
+        checkpoint = self.index.get_checkpoint(category)
+        if checkpoint:
+            window_start = datetime.fromisoformat(checkpoint)
+        else:
+            window_start = until - timedelta(days=self.settings.arxiv_harvest_initial_days)
+
+        step = timedelta(days=self.settings.arxiv_harvest_window_days)
+        total = 0
+        while window_start < until:
+            window_end = min(window_start + step, until)
+            total += await self._harvest_window(category, window_start, window_end)
+            # Only advance the checkpoint once a window is fully paged through.
+            self.index.set_checkpoint(category, window_end.isoformat())
+            window_start = window_end
+        return total
+
+    async def _harvest_window(self, category: str, start: datetime, end: datetime) -> int:
+        search_query = (
+            f"cat:{category} AND lastUpdatedDate:[{self._format(start)} TO {self._format(end)}]"
+        )
+        page_size = self.settings.arxiv_harvest_page_size
+        total = 0
+        batch: list[dict] = []
+        async with aclosing(
+            self.client.iter_search(search_query, page_size=page_size, sort_by="lastUpdatedDate")
+        ) as papers:
+            async for paper in papers:
+                batch.append(paper)
+                if len(batch) >= page_size:
+                    total += await asyncio.to_thread(self.index.upsert_many, batch)
+                    batch = []
+        if batch:
+            total += await asyncio.to_thread(self.index.upsert_many, batch)
+        return total
+
+    def _format(self, moment: datetime) -> str:
+        return moment.astimezone(timezone.utc).strftime("%Y%m%d%H%M")
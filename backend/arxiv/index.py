@@ -0,0 +1,123 @@
+"""Local SQLite FTS5 index of harvested arXiv paper metadata."""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+INDEXED_FIELDS = (
+    "arxiv_id",
+    "title",
+    "url",
+    "pdf_url",
+    "summary",
+    "published_date",
+    "updated_date",
+    "authors",
+    "categories",
+    "primary_category",
+    "comment",
+)
+
+
+class ArxivIndex:
+    """Paper records plus a full-text index and per-category harvest checkpoints."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS papers (
+                    arxiv_id TEXT PRIMARY KEY,
+                    published_date TEXT NOT NULL DEFAULT '',
+                    record TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS papers_published ON papers (published_date);
+                CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+                    arxiv_id UNINDEXED, title, summary, categories
+                );
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    category TEXT PRIMARY KEY,
+                    harvested_until TEXT NOT NULL
+                );
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    def upsert_many(self, papers: list[dict]) -> int:
+        rows = [paper for paper in papers if paper.get("arxiv_id")]
+        if not rows:
+            return 0
+
+        with closing(self._connect()) as conn, conn:
+            for paper in rows:
+                record = {field: paper.get(field) for field in INDEXED_FIELDS}
+                conn.execute(
+                    "INSERT OR REPLACE INTO papers VALUES (?, ?, ?)",
+                    (
+                        paper["arxiv_id"],
+                        paper.get("published_date") or "",
+                        json.dumps(record, ensure_ascii=False),
+                    ),
+                )
+                conn.execute("DELETE FROM papers_fts WHERE arxiv_id = ?", (paper["arxiv_id"],))
+                conn.execute(
+                    "INSERT INTO papers_fts VALUES (?, ?, ?, ?)",
+                    (
+                        paper["arxiv_id"],
+                        paper.get("title") or "",
+                        paper.get("summary") or "",
+                        " ".join(paper.get("categories") or []),
+                    ),
+                )
+        return len(rows)
+
+    def search(self, query: str, categories: list[str], limit: int) -> list[dict]:
+        terms = re.findall(r"\w+", query.lower())
+        clauses: list[str] = []
+        if terms:
+            clauses.append("{title summary} : (" + " AND ".join(f'"{term}"' for term in terms) + ")")
+        wanted = [category for category in categories if category]
+        if wanted:
+            clauses.append(
+                "categories : (" + " OR ".join(f'"{category}"' for category in wanted) + ")"
+            )
+
+        with closing(self._connect()) as conn:
+            if clauses:
+                rows = conn.execute(
+                    "SELECT papers.record FROM papers_fts "
+                    "JOIN papers ON papers.arxiv_id = papers_fts.arxiv_id "
+                    "WHERE papers_fts MATCH ? ORDER BY bm25(papers_fts) LIMIT ?",
+                    (" AND ".join(clauses), limit),
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT record FROM papers ORDER BY published_date DESC LIMIT ?",
+                    (limit,),
+                ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def get_checkpoint(self, category: str) -> str | None:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT harvested_until FROM checkpoints WHERE category = ?", (category,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_checkpoint(self, category: str, harvested_until: str) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?)", (category, harvested_until)
+            )
@@ -0,0 +1,140 @@
+"""BM25 ranking of arXiv papers with a precomputed recency prior."""
+
+from __future__ import annotations
+
+import math
+import re
+import time
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+
+from backend.config import get_settings
+from backend.utils.cache import TTLCache
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]{2,}")
+
+# Field weights for a BM25F-style combined term frequency.
+FIELD_WEIGHTS = (("title", 2.0), ("summary", 1.0), ("categories", 0.5))
+
+
+@dataclass(frozen=True)
+class PaperStats:
+    term_freqs: dict[str, float]
+    length: float
+    published_ts: float | None
+
+
+class PaperRanker:
+    """Score papers with BM25 over title, abstract and categories plus a recency prior.
+
+    Token statistics are computed once per paper version (`arxiv_id@updated_date`)
+    and kept in the ranker's own cache, so re-ranking cached or indexed papers
+    only pays for the query terms' columns. Callers' dicts are never modified.
+    """
+
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        recency_boost: float = 2.0,
+        recency_window_days: float = 60.0,
+        stats_cache_size: int | None = None,
+    ) -> None:
+        self.k1 = k1
+        self.b = b
+        self.recency_boost = recency_boost
+        self.recency_window_seconds = recency_window_days * 86400
+        # A few KB per entry, held separately by every worker process.
+        max_size = stats_cache_size or get_settings().arxiv_rank_stats_cache_max_size
+        self._stats_cache = TTLCache(ttl_seconds=86400, max_size=max_size)
+
+    def rank(self, papers: list[dict], query: str, now: float | None = None) -> list[dict]:
+        if not papers:
+            return []
+
+        # Papers without an id are only memoized for this call, by object identity.
+        unversioned: dict[int, PaperStats] = {}
+        stats = [self.stats_for(paper, unversioned) for paper in papers]
+        scores = self._bm25(stats, set(TOKEN_PATTERN.findall(query.lower())))
+        self._add_recency(scores, stats, time.time() if now is None else now)
+
+        ranked: list[dict] = []
+        for paper, score in zip(papers, scores):
+            enriched = dict(paper)
+            enriched["relevance_score"] = round(score, 4)
+            ranked.append(enriched)
+        ranked.sort(key=lambda paper: paper["relevance_score"], reverse=True)
+        return ranked
+
+    def stats_for(self, paper: dict, unversioned: dict[int, PaperStats] | None = None) -> PaperStats:
+        if not paper.get("arxiv_id"):
+            memo = {} if unversioned is None else unversioned
+            if id(paper) not in memo:
+                memo[id(paper)] = self._compute_stats(paper)
+            return memo[id(paper)]
+
+        key = f"{paper['arxiv_id']}@{paper.get('updated_date') or ''}"
+        stats = self._stats_cache.get(key)
+        if stats is None:
+            stats = self._compute_stats(paper)
+            self._stats_cache.set(key, stats)
+        return stats
+
+    def _compute_stats(self, paper: dict) -> PaperStats:
+        term_freqs: Counter = Counter()
+        length = 0.0
+        for field, weight in FIELD_WEIGHTS:
+            value = paper.get(field) or ""
+            if isinstance(value, list):
+                value = " ".join(value)
+            tokens = TOKEN_PATTERN.findall(value.lower())
+            length += weight * len(tokens)
+            for token in tokens:
+                term_freqs[token] += weight
+
+        return PaperStats(
+            term_freqs=dict(term_freqs),
+            length=length,
+            published_ts=self._parse_timestamp(paper.get("published_date") or ""),
+        )
+
+    def _bm25(self, stats: list[PaperStats], query_terms: set[str]) -> array:
+        count = len(stats)
+        scores = array("d", bytes(8 * count))
+        if not query_terms:
+            return scores
+
+        lengths = array("d", (item.length for item in stats))
+        avg_length = sum(lengths) / count or 1.0
+        norms = array(
+            "d", (self.k1 * (1.0 - self.b + self.b * length / avg_length) for length in lengths)
+        )
+
+        for term in query_terms:
+            column = array("d", (item.term_freqs.get(term, 0.0) for item in stats))
+            doc_freq = sum(1 for tf in column if tf)
+            if not doc_freq:
+                continue
+            idf = math.log(1.0 + (count - doc_freq + 0.5) / (doc_freq + 0.5))
+            for index, tf in enumerate(column):
+                if tf:
+                    scores[index] += idf * tf * (self.k1 + 1.0) / (tf + norms[index])
+        return scores
+
+    def _add_recency(self, scores: array, stats: list[PaperStats], now: float) -> None:
+        # New papers get a small boost without overwhelming relevance score.
+        for index, item in enumerate(stats):
+            if item.published_ts is None:
+                continue
+            age = max(0.0, now - item.published_ts)
+            scores[index] += max(0.0, self.recency_boost * (1.0 - age / self.recency_window_seconds))
+
+    def _parse_timestamp(self, published_date: str) -> float | None:
+        if not published_date:
+            return None
+        try:
+            return datetime.fromisoformat(published_date.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
@@ -0,0 +1,124 @@
+"""Persistent SQLite store for query-independent arXiv paper analyses."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ANALYSIS_FIELDS = (
+    "ai_summary_3lines",
+    "method_highlights",
+    "limitations",
+    "reproduction_difficulty",
+    "code_repo_url",
+)
+
+
+class ArxivAnalysisStore:
+    """Analyses keyed by `arxiv_id` plus `updated_date`, so a new paper version is re-analyzed."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analyses (
+                    arxiv_id TEXT NOT NULL,
+                    updated_date TEXT NOT NULL,
+                    analysis TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (arxiv_id, updated_date)
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    def key_for(self, paper: dict) -> tuple[str, str] | None:
+        arxiv_id = (paper.get("arxiv_id") or "").strip()
+        if not arxiv_id:
+            return None
+        return arxiv_id, (paper.get("updated_date") or "").strip()
+
+    def get_many(self, papers: list[dict]) -> dict[tuple[str, str], dict]:
+        keys = [key for key in (self.key_for(paper) for paper in papers) if key]
+        if not keys:
+            return {}
+
+        found: dict[tuple[str, str], dict] = {}
+        with closing(self._connect()) as conn:
+            for arxiv_id, updated_date in keys:
+                row = conn.execute(
+                    "SELECT analysis FROM analyses WHERE arxiv_id = ? AND updated_date = ?",
+                    (arxiv_id, updated_date),
+                ).fetchone()
+                if row:
+                    found[(arxiv_id, updated_date)] = json.loads(row[0])
+        return found
+
+    def put_many(self, items: list[tuple[dict, dict]]) -> int:
+        rows = []
+        now = time.time()
+        for paper, analysis in items:
+            key = self.key_for(paper)
+            if key is None:
+                continue
+            payload = {field: analysis.get(field) for field in ANALYSIS_FIELDS}
+            rows.append((*key, json.dumps(payload, ensure_ascii=False), now))
+
+        if rows:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+        return len(rows)
+
+    def export_jsonl(self, path: str) -> int:
+        count = 0
+        with closing(self._connect()) as conn, open(path, "w", encoding="utf-8") as handle:
+            for arxiv_id, updated_date, analysis, created_at in conn.execute(
+                "SELECT arxiv_id, updated_date, analysis, created_at FROM analyses "
+                "ORDER BY arxiv_id, updated_date"
+            ):
+                record = {
+                    "arxiv_id": arxiv_id,
+                    "updated_date": updated_date,
+                    "analysis": json.loads(analysis),
+                    "created_at": created_at,
+                }
+                handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+                count += 1
+        return count
+
+    def import_jsonl(self, path: str) -> int:
+        rows = []
+        with open(path, encoding="utf-8") as handle:
+            for line_number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    rows.append(
+                        (
+                            record["arxiv_id"],
+                            record.get("updated_date") or "",
+                            json.dumps(record["analysis"], ensure_ascii=False),
+                            float(record.get("created_at") or time.time()),
+                        )
+                    )
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                    logger.warning("Skipping malformed analysis record on line %d", line_number)
+
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?)", rows)
+        return len(rows)
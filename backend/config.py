@@ -18,6 +18,7 @@ class Settings(BaseSettings):
     debug: bool = False
     host: str = "0.0.0.0"
     port: int = 8000
+    workers: int = Field(default=1, ge=1)
 
     llm_provider: Literal["openai", "ollama", "groq", "together", "custom"] = "openai"
     llm_api_key: str | None = None
@@ -34,18 +35,80 @@ class Settings(BaseSettings):
     search_max_results: int = 8
     search_region: str = "wt-wt"
     search_language: str = "en"
+    duckduckgo_base_url: str = "https://html.duckduckgo.com/html/"
+    google_base_url: str = "https://www.googleapis.com/customsearch/v1"
+    bing_base_url: str = "https://api.bing.microsoft.com/v7.0/search"
+    brave_base_url: str = "https://api.search.brave.com/res/v1/web/search"
     arxiv_base_url: str = "http://export.arxiv.org/api/query"
     arxiv_categories: list[str] = Field(
         default_factory=lambda: ["cs.AI", "cs.LG", "cs.CL", "cs.CV", "stat.ML"]
     )
     arxiv_min_interval_seconds: float = 3.0
+    arxiv_rate_limit_burst: int = Field(default=1, ge=1)
+    arxiv_rate_limit_shared: bool = True
+    arxiv_rate_limit_state_path: str | None = None
+    arxiv_rate_limit_max_waiters: int = Field(default=32, ge=1)
+    arxiv_rate_limit_timeout_seconds: float = Field(default=30.0, gt=0)
     arxiv_max_results: int = 24
+    arxiv_feed_cache_ttl: int = Field(default=300, ge=0)
+    arxiv_feed_cache_max_size: int = Field(default=256, ge=1)
+    arxiv_rank_stats_cache_max_size: int = Field(default=2000, ge=1)
     arxiv_analysis_llm_budget: int = Field(default=0, ge=0, le=10)
+    arxiv_analysis_concurrency: int = Field(default=4, ge=1, le=10)
+    arxiv_analysis_timeout_seconds: float = Field(default=25.0, gt=0)
+    arxiv_analysis_batch_size: int = Field(default=1, ge=1, le=10)
+    arxiv_analysis_store_path: str | None = None
+    arxiv_index_path: str | None = None
+    arxiv_harvest_enabled: bool = False
+    arxiv_harvest_interval_seconds: float = Field(default=3600.0, gt=0)
+    arxiv_harvest_window_days: int = Field(default=1, ge=1)
+    arxiv_harvest_initial_days: int = Field(default=30, ge=1)
+    arxiv_harvest_page_size: int = Field(default=100, ge=1, le=2000)
 
     content_max_pages: int = 6
     content_max_length: int = 3500
     content_timeout: int = 10
 
+    quick_snippet_only: bool = True
+    quick_min_sources: int = Field(default=3, ge=1)
+    quick_min_snippet_chars: int = Field(default=80, ge=0)
+
+    deep_max_sub_queries: int = Field(default=4, ge=1, le=8)
+    deep_max_concurrency: int = Field(default=4, ge=1)
+    deep_results_per_query: int = Field(default=6, ge=1, le=20)
+    deep_max_pages: int = Field(default=12, ge=1)
+    deep_fetch_concurrency: int = Field(default=8, ge=1)
+    deep_time_budget_seconds: float = Field(default=20.0, gt=0)
+    deep_plan_timeout_seconds: float = Field(default=8.0, gt=0)
+
+    academic_rrf_k: int = Field(default=60, ge=1)
+    academic_arxiv_timeout_seconds: float = Field(default=4.0, gt=0)
+
+    admission_max_inflight: int = Field(default=32, ge=0)
+    admission_max_queue: int = Field(default=64, ge=0)
+    admission_queue_timeout_seconds: float = Field(default=10.0, gt=0)
+    admission_prioritize_streams: bool = True
+
+    degradation_enabled: bool = True
+    degradation_loop_lag_seconds: float = Field(default=0.25, gt=0)
+    degradation_llm_wait_seconds: float = Field(default=10.0, gt=0)
+    degradation_thresholds: list[float] = Field(default_factory=lambda: [0.9, 1.0, 1.25, 1.5])
+
+    batch_max_concurrency: int = Field(default=4, ge=1)
+    batch_max_size: int = Field(default=200, ge=1)
+    batch_shared_max_results: int = Field(default=64, ge=1)
+    batch_rerank_window_seconds: float = Field(default=0.02, ge=0)
+    batch_rerank_max_pairs: int = Field(default=256, ge=1)
+
+    near_duplicate_enabled: bool = True
+    near_duplicate_threshold: float = Field(default=0.8, gt=0, le=1)
+    near_duplicate_shingle_words: int = Field(default=5, ge=1)
+
+    passage_selection_enabled: bool = True
+    passage_window_sentences: int = Field(default=2, ge=1, le=10)
+    passage_max_per_source: int = Field(default=3, ge=1, le=10)
+    passage_max_chars: int = Field(default=900, ge=100)
+
     reranker_enabled: bool = True
     reranker_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
     reranker_top_k: int = 5
@@ -55,6 +118,18 @@ class Settings(BaseSettings):
     bing_api_key: str | None = None
     brave_api_key: str | None = None
 
+    sse_heartbeat_seconds: float = Field(default=10.0, gt=0)
+    sse_coalesce_ms: int = Field(default=40, ge=0)
+    sse_coalesce_chars: int = Field(default=256, ge=1)
+    sse_end_sources: Literal["full", "ref"] = "ref"
+    sse_disconnect_poll_seconds: float = Field(default=0.5, gt=0)
+
+    startup_preload: bool = False
+
+    metrics_enabled: bool = True
+    trace_export_endpoint: str | None = None
+    trace_service_name: str = "autosearch"
+
     cache_enabled: bool = True
     cache_ttl: int = 1800
     cache_max_size: int = 1024
@@ -63,7 +138,13 @@ class Settings(BaseSettings):
         default_factory=lambda: ["http://localhost:3000", "http://localhost:8000"]
     )
 
-    @field_validator("search_engines", "cors_origins", "arxiv_categories", mode="before")
+    @field_validator(
+        "search_engines",
+        "cors_origins",
+        "arxiv_categories",
+        "degradation_thresholds",
+        mode="before",
+    )
     @classmethod
     def parse_list_fields(cls, value: object) -> object:
         if isinstance(value, str):
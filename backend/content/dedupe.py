@@ -0,0 +1,113 @@
+"""Near-duplicate collapse of extracted sources before reranking."""
+
+from __future__ import annotations
+
+import re
+import zlib
+
+from backend.config import get_settings
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+SIGNATURE_SIZE = 64
+BANDS = 16
+ROWS = SIGNATURE_SIZE // BANDS
+EMPTY_BIN = 0xFFFFFFFF
+# Below this many shingles (snippet-only or failed extraction) there is too little text to judge.
+MIN_SHINGLES = 8
+
+
+class NearDuplicateCollapser:
+    """Fold syndicated or mirrored copies of a page into the first, highest-ranked copy.
+
+    Each extract becomes a set of word shingles and a one-permutation MinHash
+    signature: every shingle is hashed once into one of `SIGNATURE_SIZE` bins,
+    keeping the minimum per bin. Signatures are split into `BANDS` bands, and a
+    source is only compared with earlier kept sources that share a band bucket.
+    This is locality-sensitive hashing, so a batch costs O(sources x bands)
+    rather than all pairs. Bands whose bins are all empty are not bucketed. A candidate counts as a duplicate when the exact
+    Jaccard similarity of the two shingle sets reaches `threshold`. The kept
+    source lists the other URLs under `alternate_urls`.
+    """
+
+    def __init__(self, threshold: float | None = None, shingle_words: int | None = None) -> None:
+        self.settings = get_settings()
+        self.threshold = threshold or self.settings.near_duplicate_threshold
+        self.shingle_words = shingle_words or self.settings.near_duplicate_shingle_words
+
+    def collapse(self, items: list[dict]) -> list[dict]:
+        kept: list[dict] = []
+        kept_shingles: list[set[int]] = []
+        merged: set[int] = set()
+        buckets: dict[tuple[int, tuple[int, ...]], list[int]] = {}
+
+        for item in items:
+            shingles = self._shingles(item.get("content") or "")
+            if len(shingles) < MIN_SHINGLES:
+                kept.append(item)
+                kept_shingles.append(set())
+                continue
+
+            keys = self._band_keys(self._signature(shingles))
+            match = self._find_match(shingles, keys, buckets, kept_shingles)
+            if match is None:
+                # Every kept source stays in its buckets; a later source may collide with any of them.
+                for key in keys:
+                    buckets.setdefault(key, []).append(len(kept))
+                kept.append(item)
+                kept_shingles.append(shingles)
+                continue
+
+            if match not in merged:
+                merged.add(match)
+                original = kept[match]
+                kept[match] = {
+                    **original,
+                    "alternate_urls": list(original.get("alternate_urls", [])),
+                }
+            primary = kept[match]
+            for url in [item.get("url"), *item.get("alternate_urls", [])]:
+                if url and url != primary.get("url") and url not in primary["alternate_urls"]:
+                    primary["alternate_urls"].append(url)
+        return kept
+
+    def _shingles(self, text: str) -> set[int]:
+        words = TOKEN_PATTERN.findall(text.lower())
+        size = self.shingle_words
+        return {
+            zlib.crc32(" ".join(words[start : start + size]).encode("utf-8"))
+            for start in range(max(0, len(words) - size + 1))
+        }
+
+    def _signature(self, shingles: set[int]) -> list[int]:
+        signature = [EMPTY_BIN] * SIGNATURE_SIZE
+        for value in shingles:
+            slot = value % SIGNATURE_SIZE
+            rank = value // SIGNATURE_SIZE
+            signature[slot] = min(signature[slot], rank)
+        return signature
+
+    def _band_keys(self, signature: list[int]) -> list[tuple[int, tuple[int, ...]]]:
+        keys = []
+        for band in range(BANDS):
+            rows = tuple(signature[band * ROWS : (band + 1) * ROWS])
+            # Short extracts leave most bins empty; an all-empty band would put them in one bucket.
+            if any(row != EMPTY_BIN for row in rows):
+                keys.append((band, rows))
+        return keys
+
+    def _find_match(
+        self,
+        shingles: set[int],
+        keys: list[tuple[int, tuple[int, ...]]],
+        buckets: dict[tuple[int, tuple[int, ...]], list[int]],
+        kept_shingles: list[set[int]],
+    ) -> int | None:
+        candidates = {candidate for key in keys for candidate in buckets.get(key, ())}
+        # Lowest index first, so a copy folds into the highest-ranked matching source.
+        for candidate in sorted(candidates):
+            other = kept_shingles[candidate]
+            overlap = len(shingles & other)
+            if overlap / (len(shingles) + len(other) - overlap) >= self.threshold:
+                return candidate
+        return None
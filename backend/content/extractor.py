@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-from bs4 import BeautifulSoup
-
 from backend.config import get_settings
 
 
@@ -24,6 +22,8 @@ class ContentExtractor:
             text = ""
 
         if not text:
+            from bs4 import BeautifulSoup
+
             soup = BeautifulSoup(html, "lxml")
             for tag in soup(["script", "style", "nav", "header", "footer", "noscript"]):
                 tag.decompose()
@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 import asyncio
-
-import aiohttp
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
 
 from backend.config import get_settings
 from backend.utils.logger import get_logger
+from backend.utils.metrics import metrics
+from backend.utils.tracing import record_span
 
 logger = get_logger(__name__)
 
@@ -15,7 +17,6 @@ logger = get_logger(__name__)
 class ContentFetcher:
     def __init__(self) -> None:
         self.settings = get_settings()
-        self.timeout = aiohttp.ClientTimeout(total=self.settings.content_timeout)
         self.headers = {
             "User-Agent": (
                 "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -25,26 +26,66 @@ class ContentFetcher:
         }
 
     async def fetch(self, url: str) -> str | None:
+        import aiohttp
+
+        started = time.perf_counter()
+        timeout = aiohttp.ClientTimeout(total=self.settings.content_timeout)
         try:
-            async with aiohttp.ClientSession(timeout=self.timeout, headers=self.headers) as session:
+            async with aiohttp.ClientSession(timeout=timeout, headers=self.headers) as session:
                 async with session.get(url, allow_redirects=True) as response:
                     if response.status >= 400:
+                        metrics.inc(
+                            "autosearch_fetch_failures_total", reason=f"http_{response.status // 100}xx"
+                        )
                         return None
                     return await response.text(errors="ignore")
+        except asyncio.TimeoutError:
+            metrics.inc("autosearch_fetch_failures_total", reason="timeout")
+            logger.debug("Fetch timed out for %s", url)
+            return None
+        except aiohttp.ClientError as exc:
+            metrics.inc("autosearch_fetch_failures_total", reason="client_error")
+            logger.debug("Fetch failed for %s: %s", url, exc)
+            return None
         except Exception as exc:  # pragma: no cover
+            metrics.inc("autosearch_fetch_failures_total", reason="other")
             logger.debug("Fetch failed for %s: %s", url, exc)
             return None
+        finally:
+            metrics.observe("autosearch_fetch_seconds", time.perf_counter() - started)
+            record_span("fetch", started, url=url)
 
     async def fetch_many(self, urls: list[str], limit: int | None = None) -> dict[str, str]:
+        return {url: html async for url, html in self.iter_fetch(urls, limit=limit)}
+
+    async def iter_fetch(
+        self,
+        urls: list[str],
+        limit: int | None = None,
+        concurrency: int = 6,
+        fetch: Callable[[str], Awaitable[str | None]] | None = None,
+    ) -> AsyncGenerator[tuple[str, str], None]:
+        """Yield `(url, html)` pairs in completion order, skipping failed fetches.
+
+        `fetch` replaces `self.fetch` per URL, e.g. to share fetches across a batch.
+        """
+        fetch = fetch or self.fetch
         max_urls = limit or self.settings.content_max_pages
         selected = urls[:max_urls]
 
-        semaphore = asyncio.Semaphore(6)
+        semaphore = asyncio.Semaphore(concurrency)
 
         async def bounded_fetch(target_url: str) -> tuple[str, str | None]:
             async with semaphore:
-                html = await self.fetch(target_url)
+                html = await fetch(target_url)
                 return target_url, html
 
-        pairs = await asyncio.gather(*(bounded_fetch(url) for url in selected), return_exceptions=False)
-        return {url: html for url, html in pairs if html}
+        tasks = [asyncio.ensure_future(bounded_fetch(url)) for url in selected]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                url, html = await next_done
+                if html:
+                    yield url, html
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,121 @@
+"""Query-focused passage selection between extraction and synthesis."""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, replace
+
+from backend.config import get_settings
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+TOKEN_PATTERN = re.compile(r"[a-z0-9]{2,}")
+
+
+@dataclass
+class Passage:
+    source_index: int
+    position: int
+    text: str
+    term_counts: Counter
+    length: int
+    score: float = 0.0
+
+
+class PassageSelector:
+    """Pick the sentence windows of each extract that best match the query.
+
+    All windows of all sources are scored in one BM25 pass so document
+    frequencies are shared across the whole evidence set.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self.settings = get_settings()
+        self.k1 = k1
+        self.b = b
+
+    def select(self, query: str, sources: list[dict]) -> list[dict]:
+        passages = self._build_passages(sources)
+        if passages:
+            self._score(query, passages)
+
+        by_source: dict[int, list[Passage]] = {}
+        for passage in passages:
+            by_source.setdefault(passage.source_index, []).append(passage)
+
+        selected: list[dict] = []
+        for index, source in enumerate(sources):
+            item = dict(source)
+            candidates = by_source.get(index)
+            if candidates:
+                item["passages"] = [passage.text for passage in self._pick(candidates)]
+            selected.append(item)
+        return selected
+
+    def _build_passages(self, sources: list[dict]) -> list[Passage]:
+        window = self.settings.passage_window_sentences
+        passages: list[Passage] = []
+        for index, source in enumerate(sources):
+            content = source.get("content") or ""
+            sentences = [part.strip() for part in SENTENCE_BOUNDARY.split(content) if part.strip()]
+            for position, start in enumerate(range(0, len(sentences), window)):
+                text = " ".join(sentences[start : start + window])
+                tokens = TOKEN_PATTERN.findall(text.lower())
+                passages.append(
+                    Passage(
+                        source_index=index,
+                        position=position,
+                        text=text,
+                        term_counts=Counter(tokens),
+                        length=len(tokens),
+                    )
+                )
+        return passages
+
+    def _score(self, query: str, passages: list[Passage]) -> None:
+        query_terms = set(TOKEN_PATTERN.findall(query.lower()))
+        if not query_terms:
+            return
+
+        total = len(passages)
+        avg_length = sum(passage.length for passage in passages) / total or 1.0
+        doc_freq = Counter()
+        for passage in passages:
+            doc_freq.update(query_terms.intersection(passage.term_counts))
+
+        idf = {
+            term: math.log(1.0 + (total - freq + 0.5) / (freq + 0.5))
+            for term, freq in doc_freq.items()
+        }
+        for passage in passages:
+            norm = self.k1 * (1.0 - self.b + self.b * passage.length / avg_length)
+            score = 0.0
+            for term, weight in idf.items():
+                tf = passage.term_counts.get(term, 0)
+                if tf:
+                    score += weight * tf * (self.k1 + 1.0) / (tf + norm)
+            passage.score = score
+
+    def _pick(self, candidates: list[Passage]) -> list[Passage]:
+        ranked = [passage for passage in candidates if passage.score > 0.0]
+        ranked.sort(key=lambda passage: passage.score, reverse=True)
+        if not ranked:
+            # No lexical overlap: keep the leading text like the unselected prompt did.
+            ranked = candidates
+
+        budget = self.settings.passage_max_chars
+        picked: list[Passage] = []
+        used = 0
+        for passage in ranked:
+            if len(picked) >= self.settings.passage_max_per_source:
+                break
+            if used + len(passage.text) > budget:
+                if picked:
+                    continue
+                passage = replace(passage, text=passage.text[:budget])
+            picked.append(passage)
+            used += len(passage.text)
+
+        picked.sort(key=lambda passage: passage.position)
+        return picked
@@ -8,9 +8,12 @@ import time
 from collections.abc import AsyncGenerator
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlparse
 
 from backend.config import get_settings
 from backend.utils.logger import get_logger
+from backend.utils.metrics import metrics
+from backend.utils.tracing import record_span
 
 logger = get_logger(__name__)
 
@@ -66,6 +69,11 @@ class LLMClient:
             "max_tokens": max_tokens,
         }
 
+    def _provider_label(self, runtime: dict[str, Any]) -> str:
+        if not runtime["base_url"]:
+            return "openai"
+        return urlparse(runtime["base_url"]).hostname or "custom"
+
     def _read_local_key_file(self) -> str | None:
         key_file = (self.settings.llm_api_key_file or "").strip()
         if not key_file:
@@ -108,6 +116,14 @@ class LLMClient:
     def _set_last_error(self, message: str) -> None:
         self._last_error_message = message.strip()
 
+    @property
+    def is_cooling_down(self) -> bool:
+        return self._is_cooling_down()
+
+    @property
+    def cooldown_remaining(self) -> float:
+        return self._cooldown_remaining()
+
     def _is_cooling_down(self) -> bool:
         return time.monotonic() < self._cooldown_until
 
@@ -183,7 +199,8 @@ class LLMClient:
         text = str(exc).lower()
         return any(token in text for token in ("429", "rate limit", "resource_exhausted", "quota"))
 
-    def _handle_rate_limit(self, exc: Exception) -> None:
+    def _handle_rate_limit(self, exc: Exception, provider: str = "unknown") -> None:
+        metrics.inc("autosearch_llm_rate_limited_total", provider=provider)
         retry_seconds = self._extract_retry_seconds(exc)
         self._cooldown_until = max(self._cooldown_until, time.monotonic() + retry_seconds)
         self._set_last_error(f"LLM quota exceeded. Retry in about {retry_seconds:.1f}s.")
@@ -206,12 +223,15 @@ class LLMClient:
             self._set_last_error("LLM provider is not configured.")
             return ""
 
+        provider = self._provider_label(runtime)
         if self._is_cooling_down():
+            metrics.inc("autosearch_llm_cooldown_rejections_total", provider=provider)
             self._set_last_error(
                 f"LLM quota cooldown active. Retry in about {self._cooldown_remaining():.1f}s."
             )
             return ""
 
+        started = time.perf_counter()
         try:
             response = await client.chat.completions.create(
                 model=runtime["model"],
@@ -225,11 +245,19 @@ class LLMClient:
             return response.choices[0].message.content or ""
         except Exception as exc:  # pragma: no cover
             if self._is_rate_limit_error(exc):
-                self._handle_rate_limit(exc)
+                self._handle_rate_limit(exc, provider)
             else:
                 self._set_last_error("Model request failed. Please retry.")
             logger.warning("LLM completion failed: %s", exc)
             return ""
+        finally:
+            metrics.observe(
+                "autosearch_llm_seconds",
+                time.perf_counter() - started,
+                provider=provider,
+                operation="complete",
+            )
+            record_span("llm.complete", started, provider=provider, model=runtime["model"])
 
     async def stream(
         self, system_prompt: str, user_prompt: str, runtime_config: dict[str, Any] | None = None
@@ -242,12 +270,16 @@ class LLMClient:
             self._set_last_error("LLM provider is not configured.")
             return
 
+        provider = self._provider_label(runtime)
         if self._is_cooling_down():
+            metrics.inc("autosearch_llm_cooldown_rejections_total", provider=provider)
             self._set_last_error(
                 f"LLM quota cooldown active. Retry in about {self._cooldown_remaining():.1f}s."
             )
             return
 
+        stream = None
+        started = time.perf_counter()
         try:
             stream = await client.chat.completions.create(
                 model=runtime["model"],
@@ -259,13 +291,28 @@ class LLMClient:
                     {"role": "user", "content": user_prompt},
                 ],
             )
+            first_token = True
             async for chunk in stream:
                 delta = chunk.choices[0].delta.content
                 if delta:
+                    if first_token:
+                        first_token = False
+                        record_span("llm.ttft", started, provider=provider)
                     yield delta
         except Exception as exc:  # pragma: no cover
             if self._is_rate_limit_error(exc):
-                self._handle_rate_limit(exc)
+                self._handle_rate_limit(exc, provider)
             else:
                 self._set_last_error("Model stream failed. Please retry.")
             logger.warning("LLM streaming failed: %s", exc)
+        finally:
+            metrics.observe(
+                "autosearch_llm_seconds",
+                time.perf_counter() - started,
+                provider=provider,
+                operation="stream",
+            )
+            record_span("llm.stream", started, provider=provider, model=runtime["model"])
+            # Runs on cancellation too, releasing the upstream HTTP stream instead of draining it.
+            if stream is not None:
+                await stream.close()
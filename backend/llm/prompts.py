@@ -17,9 +17,10 @@ def build_user_prompt(query: str, sources: list[dict]) -> str:
         title = source.get("title", "Untitled")
         url = source.get("url", "")
         snippet = source.get("snippet", "")
-        content = source.get("content", "")
+        passages = source.get("passages")
+        content = " ... ".join(passages) if passages else (source.get("content") or "")[:900]
         source_chunks.append(
-            f"[{index}] {title}\nURL: {url}\nSnippet: {snippet}\nContent: {content[:900]}\n"
+            f"[{index}] {title}\nURL: {url}\nSnippet: {snippet}\nContent: {content}\n"
         )
 
     joined = "\n".join(source_chunks)
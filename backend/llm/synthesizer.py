@@ -6,6 +6,7 @@ from collections.abc import AsyncGenerator
 
 from backend.llm.client import LLMClient
 from backend.llm.prompts import build_system_prompt, build_user_prompt
+from backend.utils.tracing import span
 
 
 class AnswerSynthesizer:
@@ -22,8 +23,9 @@ class AnswerSynthesizer:
         if not sources:
             return "No reliable sources were retrieved for this query."
 
-        system_prompt = build_system_prompt(language)
-        user_prompt = build_user_prompt(query, sources)
+        with span("prompt.build", sources=len(sources)):
+            system_prompt = build_system_prompt(language)
+            user_prompt = build_user_prompt(query, sources)
 
         answer = await self.client.complete(
             system_prompt=system_prompt,
@@ -31,7 +33,7 @@ class AnswerSynthesizer:
             runtime_config=llm_config,
         )
         if not answer.strip():
-            return self._fallback_answer(sources)
+            return self.fallback_answer(sources)
         return answer
 
     async def stream(
@@ -45,8 +47,9 @@ class AnswerSynthesizer:
             yield "No reliable sources were retrieved for this query."
             return
 
-        system_prompt = build_system_prompt(language)
-        user_prompt = build_user_prompt(query, sources)
+        with span("prompt.build", sources=len(sources)):
+            system_prompt = build_system_prompt(language)
+            user_prompt = build_user_prompt(query, sources)
 
         had_output = False
         async for chunk in self.client.stream(
@@ -58,9 +61,9 @@ class AnswerSynthesizer:
             yield chunk
 
         if not had_output:
-            yield self._fallback_answer(sources)
+            yield self.fallback_answer(sources)
 
-    def _fallback_answer(self, sources: list[dict]) -> str:
+    def fallback_answer(self, sources: list[dict]) -> str:
         bullet_lines = []
         for index, source in enumerate(sources[:5], start=1):
             bullet_lines.append(f"- {source.get('title', 'Untitled')} [{index}]")
@@ -3,22 +3,111 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import contextlib
+import os
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
 from backend.config import get_settings
-from backend.models.schemas import HealthResponse, RuntimeLLMConfig, SearchRequest
-from backend.pipeline.search_pipeline import SearchPipeline
-from backend.utils.logger import setup_logging
+from backend.models.schemas import (
+    BatchSearchRequest,
+    HealthResponse,
+    RuntimeLLMConfig,
+    SearchRequest,
+)
+from backend.pipeline.search_pipeline import SearchPipeline, to_ndjson
+from backend.server import preloaded_before_fork, worker_index
+from backend.utils.logger import get_logger, setup_logging
+from backend.utils.metrics import metrics
+from backend.utils.ratelimit import RateLimitError
 
 settings = get_settings()
 setup_logging(debug=settings.debug)
+logger = get_logger(__name__)
+
+
+_pipeline: SearchPipeline | None = None
+
+
+def get_pipeline() -> SearchPipeline:
+    """The worker's pipeline: built by `lifespan`, or on first use when no lifespan ran."""
+    global _pipeline
+    if _pipeline is None:
+        pipeline = SearchPipeline()
+        metrics.register_gauge(
+            "autosearch_queue_depth",
+            lambda: pipeline.arxiv_client.rate_limiter.waiters,
+            queue="arxiv_rate_limiter",
+        )
+        _pipeline = pipeline
+    return _pipeline
+
+
+def _drop_inherited_pipeline() -> None:
+    # A pre-forking parent may have built one to preload; every worker needs its own
+    # caches, limiters and admission state.
+    global _pipeline
+    _pipeline = None
+
 
-app = FastAPI(title=settings.app_name, version=settings.app_version)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_drop_inherited_pipeline)
+
+
+def __getattr__(name: str) -> object:
+    # Keeps `from backend.main import pipeline` working without building it at import time.
+    if name == "pipeline":
+        return get_pipeline()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    app.state.ready = False
+    app.state.preloaded = settings.startup_preload or preloaded_before_fork()
+    started = time.perf_counter()
+    pipeline = get_pipeline()
+    metrics.set_gauge("autosearch_startup_seconds", time.perf_counter() - started, phase="init")
+    if app.state.preloaded:
+        # After a pre-fork preload this only binds the worker's pipeline to the shared model.
+        started = time.perf_counter()
+        steps = await asyncio.to_thread(pipeline.preload)
+        metrics.set_gauge(
+            "autosearch_startup_seconds", time.perf_counter() - started, phase="preload"
+        )
+        logger.info("Preload finished: %s", steps)
+
+    harvest_task: asyncio.Task | None = None
+    # One harvester per host is enough; the index and its checkpoints are shared on disk.
+    if (
+        settings.arxiv_harvest_enabled
+        and pipeline.arxiv_client.index is not None
+        and worker_index() == 0
+    ):
+        from backend.arxiv.harvester import ArxivHarvester
+
+        harvest_task = asyncio.create_task(ArxivHarvester(pipeline.arxiv_client).run_forever())
+    app.state.ready = True
+    try:
+        yield
+    finally:
+        app.state.ready = False
+        if harvest_task is not None:
+            harvest_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await harvest_task
+
+
+app = FastAPI(title=settings.app_name, version=settings.app_version, lifespan=lifespan)
+app.state.ready = False
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
@@ -26,11 +115,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-pipeline = SearchPipeline()
-
 
 @app.get("/api/health", response_model=HealthResponse)
 async def health() -> HealthResponse:
+    pipeline = get_pipeline()
     return HealthResponse(
         status="healthy",
         version=settings.app_version,
@@ -40,23 +128,75 @@ async def health() -> HealthResponse:
     )
 
 
+@app.get("/api/live")
+async def live() -> dict:
+    return {"status": "alive"}
+
+
+@app.get("/api/ready")
+async def ready():
+    if not app.state.ready:
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready", "preloaded": app.state.preloaded}
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/api/search")
-async def search(request: SearchRequest):
+async def search(request: SearchRequest, http_request: Request):
     if not request.query.strip():
         raise HTTPException(status_code=400, detail="Query cannot be empty")
 
+    pipeline = get_pipeline()
     if request.stream:
-        generator = pipeline.search_stream(request)
-        return StreamingResponse(generator, media_type="text/event-stream")
-
-    data = await pipeline.search_sync(request)
+        try:
+            lease = await pipeline.admission.acquire("stream")
+        except RateLimitError as exc:
+            return service_unavailable(exc)
+        generator = pipeline.search_stream(request, is_disconnected=http_request.is_disconnected)
+        return StreamingResponse(lease.hold(generator), media_type="text/event-stream")
+
+    try:
+        async with pipeline.admission.slot("sync"):
+            data = await pipeline.search_sync(request)
+    except RateLimitError as exc:
+        return service_unavailable(exc)
     return JSONResponse(content=data)
 
 
+def service_unavailable(exc: RateLimitError) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+    )
+
+
+@app.post("/api/search/batch")
+async def search_batch(batch: BatchSearchRequest):
+    if len(batch.requests) > settings.batch_max_size:
+        raise HTTPException(
+            status_code=400, detail=f"Batch exceeds {settings.batch_max_size} queries"
+        )
+    if any(not item.query.strip() for item in batch.requests):
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+
+    async def ndjson():
+        async for item in get_pipeline().search_batch(batch.requests, concurrency=batch.concurrency):
+            yield to_ndjson(item)
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
 @app.post("/api/llm/verify")
 async def verify_llm(config: RuntimeLLMConfig | None = None):
     runtime_cfg = config.model_dump(exclude_none=True) if config else None
-    client = pipeline.synthesizer.client
+    client = get_pipeline().synthesizer.client
     model_used = client.resolved_model(runtime_cfg)
 
     if not client.is_available_for(runtime_cfg):
@@ -129,12 +269,43 @@ async def frontend_asset(asset_path: str):
 
 def run_cli() -> None:
     parser = argparse.ArgumentParser(prog="autosearch", description="AutoSearch AI CLI")
-    parser.add_argument("command", nargs="?", default="serve", choices=["serve"])
+    parser.add_argument(
+        "command",
+        nargs="?",
+        default="serve",
+        choices=["serve", "export-analyses", "import-analyses"],
+    )
     parser.add_argument("--host", default=settings.host)
     parser.add_argument("--port", default=settings.port, type=int)
+    parser.add_argument("--workers", default=settings.workers, type=int)
+    parser.add_argument(
+        "--preload",
+        action=argparse.BooleanOptionalAction,
+        default=settings.startup_preload,
+        help="Import the app and load the reranker before forking workers",
+    )
+    parser.add_argument("--file", help="JSONL path for export-analyses / import-analyses")
     args = parser.parse_args()
 
     if args.command == "serve":
-        import uvicorn
-
-        uvicorn.run("backend.main:app", host=args.host, port=args.port, reload=False)
+        if args.workers < 1:
+            parser.error("--workers must be at least 1")
+        from backend.server import serve
+
+        serve(args.host, args.port, workers=args.workers, preload=args.preload)
+        return
+
+    if not settings.arxiv_analysis_store_path:
+        parser.error("ARXIV_ANALYSIS_STORE_PATH must be set to use the analysis store")
+    if not args.file:
+        parser.error(f"{args.command} requires --file")
+
+    from backend.arxiv.store import ArxivAnalysisStore
+
+    store = ArxivAnalysisStore(settings.arxiv_analysis_store_path)
+    if args.command == "export-analyses":
+        count = store.export_jsonl(args.file)
+        print(f"Exported {count} analyses to {args.file}")
+    else:
+        count = store.import_jsonl(args.file)
+        print(f"Imported {count} analyses from {args.file}")
@@ -11,6 +11,10 @@ from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Loaded cross-encoders by model name. A pre-forking server fills this before forking,
+# so every worker's Reranker reuses the parent's weights through copy-on-write pages.
+_models: dict[str, object] = {}
+
 
 @dataclass
 class ScoredText:
@@ -34,6 +38,12 @@ class Reranker:
         if self.is_loaded:
             return True
 
+        shared = _models.get(self.settings.reranker_model)
+        if shared is not None:
+            self.model = shared
+            self.is_loaded = True
+            return True
+
         try:
             from sentence_transformers import CrossEncoder
         except ImportError:
@@ -42,6 +52,7 @@ class Reranker:
 
         try:
             self.model = CrossEncoder(self.settings.reranker_model, max_length=512, device="cpu")
+            _models[self.settings.reranker_model] = self.model
             self.is_loaded = True
             logger.info("Reranker loaded: %s", self.settings.reranker_model)
             return True
@@ -58,9 +69,19 @@ class Reranker:
         if not self.load() or self.model is None:
             return candidates[:limit]
 
-        pairs = [(query, f"{item.get('title', '')}\n{item.get('content') or item.get('snippet', '')}") for item in candidates]
-        scores = self.model.predict(pairs)
+        return self.order(candidates, self.predict(self.pairs(query, candidates)), limit)
 
+    def pairs(self, query: str, candidates: list[dict]) -> list[tuple[str, str]]:
+        return [(query, f"{item.get('title', '')}\n{item.get('content') or item.get('snippet', '')}") for item in candidates]
+
+    def predict(self, pairs: list[tuple[str, str]]) -> list[float]:
+        """Score (query, passage) pairs; pairs may come from several queries at once."""
+        if not pairs:
+            return []
+        return [float(score) for score in self.model.predict(pairs)]
+
+    def order(self, candidates: list[dict], scores: Iterable[float], top_k: int | None = None) -> list[dict]:
+        limit = top_k or self.settings.reranker_top_k
         ranked: list[ScoredText] = []
         for payload, score in zip(candidates, scores):
             normalized_score = float(score)
@@ -28,9 +28,15 @@ class SearchRequest(BaseModel):
     max_sources: int = Field(default=6, ge=1, le=20)
     language: str = "en"
     stream: bool = True
+    include_trace: bool = False
     llm_config: RuntimeLLMConfig | None = None
 
 
+class BatchSearchRequest(BaseModel):
+    requests: list[SearchRequest] = Field(..., min_length=1)
+    concurrency: int | None = Field(default=None, ge=1, le=32)
+
+
 class SearchSource(BaseModel):
     title: str
     url: str
@@ -49,6 +55,7 @@ class SearchSource(BaseModel):
     limitations: str | None = None
     reproduction_difficulty: str | None = None
     code_repo_url: str | None = None
+    alternate_urls: list[str] | None = None
 
 
 class SearchResponse(BaseModel):
@@ -57,7 +64,10 @@ class SearchResponse(BaseModel):
     sources: list[SearchSource]
     related_queries: list[str] = Field(default_factory=list)
     search_time: float
+    timings: dict[str, float] = Field(default_factory=dict)
+    trace: dict[str, Any] | None = None
     model_used: str
+    degradation_level: int = 0
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -0,0 +1,136 @@
+"""Call sharing and pooled reranker inference for batched searches."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from typing import Any
+
+Pair = tuple[str, str]
+
+
+class SharedCalls:
+    """Run each keyed call at most once and let every caller await the same result.
+
+    A batch installs one instance for its lifetime so overlapping queries reuse
+    engine searches and page fetches. Callers are shielded from each other: one
+    caller being cancelled does not cancel the shared call for the rest.
+
+    Finished results (raw page HTML among them) are kept for later items, but
+    only the `max_completed` most recently used; older ones are dropped and
+    would be fetched again. Calls still in flight are never dropped.
+    """
+
+    def __init__(self, max_completed: int | None = None) -> None:
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+        self._completed: OrderedDict[Hashable, None] = OrderedDict()
+        self.max_completed = max_completed
+        self.hits = 0
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _done: self._retire(key))
+        else:
+            self.hits += 1
+            if key in self._completed:
+                self._completed.move_to_end(key)
+        return await asyncio.shield(task)
+
+    def _retire(self, key: Hashable) -> None:
+        if key not in self._tasks:
+            return
+        self._completed[key] = None
+        while self.max_completed is not None and len(self._completed) > self.max_completed:
+            oldest, _ = self._completed.popitem(last=False)
+            self._tasks.pop(oldest, None)
+
+    def close(self) -> None:
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+        self._tasks.clear()
+        self._completed.clear()
+
+
+class RerankBatcher:
+    """Pool cross-encoder pairs from concurrent batch items into one `predict` call.
+
+    The first `score` call opens a window of `window_seconds`; every item that
+    reaches reranking inside it adds its (query, passage) pairs to the same
+    model call, which runs off the event loop. A window also closes early once
+    it holds `max_pairs`. Each caller gets back the scores for its own pairs.
+    """
+
+    def __init__(
+        self,
+        predict: Callable[[list[Pair]], Sequence[float]],
+        window_seconds: float,
+        max_pairs: int,
+    ) -> None:
+        self._predict = predict
+        self.window_seconds = window_seconds
+        self.max_pairs = max_pairs
+        self._pending: list[tuple[list[Pair], asyncio.Future]] = []
+        self._pending_pairs = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._runs: set[asyncio.Future] = set()
+        self.predict_calls = 0
+
+    async def score(self, pairs: list[Pair]) -> list[float]:
+        if not pairs:
+            return []
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((pairs, future))
+        self._pending_pairs += len(pairs)
+        if self._pending_pairs >= self.max_pairs:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_seconds, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # Callers cancelled while waiting drop out of the window before inference.
+        pending = [(pairs, future) for pairs, future in self._pending if not future.done()]
+        self._pending = []
+        self._pending_pairs = 0
+        if not pending:
+            return
+        pooled = [pair for pairs, _ in pending for pair in pairs]
+        self.predict_calls += 1
+        task = asyncio.ensure_future(asyncio.to_thread(self._predict, pooled))
+        self._runs.add(task)
+        task.add_done_callback(lambda done: self._deliver(done, pending))
+
+    def _deliver(
+        self, task: asyncio.Future, pending: list[tuple[list[Pair], asyncio.Future]]
+    ) -> None:
+        self._runs.discard(task)
+        offset = 0
+        for pairs, future in pending:
+            if not future.done():
+                if task.cancelled():
+                    future.cancel()
+                elif task.exception() is not None:
+                    future.set_exception(task.exception())
+                else:
+                    future.set_result(list(task.result()[offset : offset + len(pairs)]))
+            offset += len(pairs)
+
+    def close(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for _, future in self._pending:
+            future.cancel()
+        self._pending = []
+        self._pending_pairs = 0
+        for task in self._runs:
+            task.cancel()
@@ -0,0 +1,96 @@
+"""Sub-query planning for deep research mode."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from backend.llm.client import LLMClient
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+HEURISTIC_ANGLES = (
+    "{query}",
+    "{query} explained",
+    "{query} latest developments",
+    "{query} limitations and criticism",
+    "{query} compared to alternatives",
+    "{query} real-world examples",
+    "{query} statistics and data",
+    "{query} expert analysis",
+)
+
+
+class ResearchPlanner:
+    """Split a question into sub-queries, asking the LLM first and falling back to templates."""
+
+    def __init__(self, client: LLMClient) -> None:
+        self.client = client
+
+    async def plan(
+        self,
+        query: str,
+        max_queries: int,
+        llm_config: dict | None = None,
+        timeout: float | None = None,
+    ) -> list[str]:
+        fallback = self._heuristic_plan(query, max_queries)
+        if max_queries <= 1:
+            return fallback
+        if not self.client.is_available_for(llm_config) or self.client.is_cooling_down:
+            return fallback
+
+        system_prompt = (
+            "You plan web research. Return only a JSON array of short, distinct search engine "
+            f"queries (at most {max_queries - 1}) that together cover the user's question from "
+            "different angles. Do not repeat the question itself."
+        )
+        try:
+            raw = await asyncio.wait_for(
+                self.client.complete(
+                    system_prompt=system_prompt,
+                    user_prompt=f"Question: {query}",
+                    runtime_config=llm_config,
+                ),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Research planning timed out; using heuristic sub-queries")
+            return fallback
+
+        planned = self._parse_queries(raw)
+        if not planned:
+            return fallback
+        return self._dedupe([query, *planned])[:max_queries]
+
+    def _parse_queries(self, raw: str) -> list[str]:
+        text = raw.strip()
+        if text.startswith("```"):
+            text = text.strip("`")
+            if text.lower().startswith("json"):
+                text = text[4:].strip()
+        start, end = text.find("["), text.rfind("]")
+        if 0 <= start < end:
+            text = text[start : end + 1]
+        try:
+            payload = json.loads(text)
+        except json.JSONDecodeError:
+            return []
+        if not isinstance(payload, list):
+            return []
+        return [item.strip() for item in payload if isinstance(item, str) and item.strip()]
+
+    def _heuristic_plan(self, query: str, max_queries: int) -> list[str]:
+        stripped = query.strip()
+        return [angle.format(query=stripped) for angle in HEURISTIC_ANGLES][: max(1, max_queries)]
+
+    def _dedupe(self, queries: list[str]) -> list[str]:
+        seen: set[str] = set()
+        unique: list[str] = []
+        for item in queries:
+            key = " ".join(item.lower().split())
+            if key not in seen:
+                seen.add(key)
+                unique.append(item)
+        return unique
@@ -0,0 +1,91 @@
+"""Load-driven degradation levels: trade answer quality for latency when a worker is saturated."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from enum import IntEnum
+
+from backend.utils.metrics import metrics
+
+# Lag is only measured when a request arrives; an old sample halves in weight every this many seconds.
+LAG_HALF_LIFE_SECONDS = 1.0
+
+
+class DegradationLevel(IntEnum):
+    """Cumulative: each level also applies every cheaper level below it."""
+
+    NORMAL = 0
+    SKIP_RERANK = 1
+    REDUCE_SOURCES = 2
+    QUICK_ONLY = 3
+    SNIPPET_ONLY = 4
+
+
+class LoadShedder:
+    """Map live load signals to a `DegradationLevel`.
+
+    Each signal becomes a pressure where 1.0 means "at capacity": admitted
+    in-flight requests over the admission limit, event-loop lag over
+    `lag_budget`, and remaining LLM cooldown over `llm_wait_budget`. The
+    highest pressure is compared against ascending `thresholds`, one per
+    level above NORMAL. Admission never lets in-flight pressure pass 1.0,
+    so levels past that are only reached on loop lag or LLM cooldown.
+    """
+
+    def __init__(
+        self,
+        in_flight: Callable[[], int],
+        capacity: int,
+        llm_wait: Callable[[], float],
+        lag_budget: float,
+        llm_wait_budget: float,
+        thresholds: list[float],
+        enabled: bool = True,
+        lag_half_life: float = LAG_HALF_LIFE_SECONDS,
+    ) -> None:
+        self._in_flight = in_flight
+        self._llm_wait = llm_wait
+        self.capacity = capacity
+        self.lag_budget = lag_budget
+        self.llm_wait_budget = llm_wait_budget
+        self.thresholds = sorted(thresholds)[: len(DegradationLevel) - 1]
+        self.enabled = enabled
+        self.lag_half_life = lag_half_life
+        self.loop_lag = 0.0
+        self.sampled_at: float | None = None
+        self.level = DegradationLevel.NORMAL
+
+        metrics.register_gauge("autosearch_degradation_level", lambda: int(self.level))
+        metrics.register_gauge("autosearch_event_loop_lag_seconds", lambda: self.loop_lag)
+
+    async def sample_lag(self) -> float:
+        """Time one trip through the ready queue; a busy loop takes longer to come back."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        if self.sampled_at is not None:
+            # After a burst, an idle gap should not leave the next request judged by stale lag.
+            self.loop_lag *= 0.5 ** ((started - self.sampled_at) / self.lag_half_life)
+        await asyncio.sleep(0)
+        self.sampled_at = loop.time()
+        self.loop_lag += 0.3 * (self.sampled_at - started - self.loop_lag)
+        return self.loop_lag
+
+    def pressure(self) -> float:
+        signals = [
+            self.loop_lag / self.lag_budget,
+            self._llm_wait() / self.llm_wait_budget,
+        ]
+        if self.capacity > 0:
+            signals.append(self._in_flight() / self.capacity)
+        return max(signals)
+
+    async def assess(self) -> DegradationLevel:
+        if not self.enabled:
+            return DegradationLevel.NORMAL
+        await self.sample_lag()
+        pressure = self.pressure()
+        self.level = DegradationLevel(sum(1 for limit in self.thresholds if pressure >= limit))
+        if self.level:
+            metrics.inc("autosearch_degraded_requests_total", level=self.level.name.lower())
+        return self.level
@@ -2,65 +2,387 @@
 
 from __future__ import annotations
 
+import asyncio
+import importlib
 import json
 import math
 import time
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import aclosing
+from contextvars import ContextVar
 
 from backend.arxiv import ArxivClient, ArxivPaperAnalyzer
 from backend.config import get_settings
+from backend.content.dedupe import NearDuplicateCollapser
 from backend.content.extractor import ContentExtractor
 from backend.content.fetcher import ContentFetcher
+from backend.content.passages import PassageSelector
 from backend.llm.synthesizer import AnswerSynthesizer
 from backend.models.reranker import Reranker
 from backend.models.schemas import SearchMode, SearchRequest
+from backend.pipeline.batch import RerankBatcher, SharedCalls
+from backend.pipeline.deep_research import ResearchPlanner
+from backend.pipeline.degradation import DegradationLevel, LoadShedder
 from backend.search.aggregator import SearchAggregator
+from backend.search.fusion import arxiv_key, reciprocal_rank_fusion, strip_arxiv_version
+from backend.utils.admission import AdmissionController
 from backend.utils.cache import TTLCache
+from backend.utils.logger import get_logger
+from backend.utils.metrics import metrics
+from backend.utils.ratelimit import RateLimitError
+from backend.utils.timings import record_timing, track_timings
+from backend.utils.tracing import Trace, export_otlp, record_span, span, track_trace
+
+logger = get_logger(__name__)
+
+# Receives progressive stage events (`search_results`, `source_ready`, ...) for SSE requests.
+_stage_listener: ContextVar[Callable[[str, dict], None] | None] = ContextVar(
+    "stage_listener", default=None
+)
+
+# Set for the duration of `search_batch` so overlapping queries share engine calls and fetches.
+_shared_calls: ContextVar[SharedCalls | None] = ContextVar("shared_calls", default=None)
+# Likewise set by `search_batch`, so concurrent items pool their reranker pairs into one predict.
+_rerank_batcher: ContextVar[RerankBatcher | None] = ContextVar("rerank_batcher", default=None)
+
+# Degradation level chosen for the current request; retrieval and synthesis consult it.
+_degradation: ContextVar[DegradationLevel] = ContextVar(
+    "degradation", default=DegradationLevel.NORMAL
+)
+
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# json.dumps builds a new encoder per call when given options; reuse one instead.
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+def _dumps(data: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(data).decode("utf-8")
+    return _JSON_ENCODER.encode(data)
 
 
 def to_sse(event: str, data: dict | str) -> str:
-    payload = json.dumps(data, ensure_ascii=False) if not isinstance(data, str) else data
+    payload = _dumps(data) if not isinstance(data, str) else data
     return f"event: {event}\ndata: {payload}\n\n"
 
 
+def to_ndjson(data: dict) -> str:
+    return _dumps(data) + "\n"
+
+
 class SearchPipeline:
     def __init__(self) -> None:
         self.settings = get_settings()
         self.aggregator = SearchAggregator()
         self.fetcher = ContentFetcher()
         self.extractor = ContentExtractor()
+        self.deduplicator = NearDuplicateCollapser()
+        self.passage_selector = PassageSelector()
         self.reranker = Reranker()
         self.synthesizer = AnswerSynthesizer()
         self.arxiv_client = ArxivClient()
         self.paper_analyzer = ArxivPaperAnalyzer()
+        self.planner = ResearchPlanner(self.synthesizer.client)
         self.cache = TTLCache(
             ttl_seconds=self.settings.cache_ttl,
             max_size=self.settings.cache_max_size,
         )
+        self._background: set[asyncio.Task] = set()
+        self.admission = AdmissionController(
+            max_inflight=self.settings.admission_max_inflight,
+            max_queue=self.settings.admission_max_queue,
+            queue_timeout=self.settings.admission_queue_timeout_seconds,
+            prioritize_streams=self.settings.admission_prioritize_streams,
+        )
+        self.load_shedder = LoadShedder(
+            in_flight=lambda: self.admission.in_flight,
+            capacity=self.settings.admission_max_inflight,
+            llm_wait=lambda: self.synthesizer.client.cooldown_remaining,
+            lag_budget=self.settings.degradation_loop_lag_seconds,
+            llm_wait_budget=self.settings.degradation_llm_wait_seconds,
+            thresholds=self.settings.degradation_thresholds,
+            enabled=self.settings.degradation_enabled,
+        )
+
+    def preload(self) -> dict[str, float]:
+        """Pay one-off import and model-load costs now instead of on the first request.
+
+        Returns the seconds spent on each step so startup can be profiled.
+        """
+        steps: dict[str, Callable[[], object]] = {
+            "http_client": lambda: importlib.import_module("aiohttp"),
+            # trafilatura first, then the BeautifulSoup/lxml fallback on an extract-free page.
+            "extractor": lambda: self.extractor.extract("<html><body></body></html>"),
+            "llm_client": lambda: self._import_optional("openai"),
+            "reranker": self.reranker.load,
+        }
+        timings: dict[str, float] = {}
+        for name, step in steps.items():
+            started = time.perf_counter()
+            step()
+            timings[name] = round(time.perf_counter() - started, 4)
+        return timings
+
+    def _import_optional(self, module: str) -> None:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            logger.info("Optional dependency %s is not installed; skipping preload", module)
 
     async def _retrieve(self, request: SearchRequest) -> list[dict]:
         if request.mode == SearchMode.ARXIV:
             return await self._retrieve_arxiv(request)
+        if request.mode == SearchMode.DEEP:
+            return await self._retrieve_deep(request)
+        if request.mode == SearchMode.ACADEMIC:
+            return await self._retrieve_academic(request)
+
+        stage_start = time.perf_counter()
+        raw = await self._engine_search(request.query, max_results=request.max_sources * 2)
+        self._finish_stage(
+            "search", stage_start, "search_results", {"items": self._previews(raw)}
+        )
 
-        raw = await self.aggregator.search(request.query, max_results=request.max_sources * 2)
+        if request.mode == SearchMode.QUICK and (
+            _degradation.get() >= DegradationLevel.SNIPPET_ONLY
+            or self._snippets_suffice(raw, request.max_sources)
+        ):
+            # Snippet-only fast path: synthesize straight from engine titles and snippets.
+            metrics.inc("autosearch_snippet_only_total", mode=request.mode.value)
+            return await self._rank_sources(request.query, raw, request.max_sources)
+
+        await self._fetch_contents(raw, limit=request.max_sources)
+        return await self._rank_sources(request.query, raw, request.max_sources)
+
+    async def _retrieve_deep(self, request: SearchRequest) -> list[dict]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.settings.deep_time_budget_seconds
+
+        stage_start = time.perf_counter()
+        sub_queries = await self.planner.plan(
+            request.query,
+            max_queries=self.settings.deep_max_sub_queries,
+            llm_config=self._request_llm_config(request),
+            timeout=min(self.settings.deep_plan_timeout_seconds, deadline - loop.time()),
+        )
+        self._finish_stage("plan", stage_start, "research_plan", {"queries": sub_queries})
+
+        stage_start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.settings.deep_max_concurrency)
+
+        async def branch(sub_query: str) -> list[dict]:
+            async with semaphore:
+                return await self._engine_search(
+                    sub_query, max_results=self.settings.deep_results_per_query
+                )
+
+        tasks = [asyncio.ensure_future(branch(sub_query)) for sub_query in sub_queries]
+        done, pending = await asyncio.wait(tasks, timeout=max(0.0, deadline - loop.time()))
+        for task in pending:
+            task.cancel()
+        branches = [task.result() for task in tasks if task in done and not task.exception()]
+        merged = self._merge_branches(branches)
+        self._finish_stage(
+            "search", stage_start, "search_results", {"items": self._previews(merged)}
+        )
 
-        urls = [item.get("url", "") for item in raw if item.get("url")]
-        html_map = await self.fetcher.fetch_many(urls, limit=request.max_sources)
+        try:
+            await asyncio.wait_for(
+                self._fetch_contents(
+                    merged,
+                    limit=self.settings.deep_max_pages,
+                    concurrency=self.settings.deep_fetch_concurrency,
+                ),
+                timeout=max(0.0, deadline - loop.time()),
+            )
+        except asyncio.TimeoutError:
+            # Pages that arrived before the budget ran out keep their extracted content.
+            logger.info("Deep research fetch budget exhausted for %r", request.query)
+        return await self._rank_sources(request.query, merged, request.max_sources)
+
+    async def _retrieve_academic(self, request: SearchRequest) -> list[dict]:
+        stage_start = time.perf_counter()
+        # The arXiv limiter is host-wide and slow (one call per few seconds), so the arXiv leg gets
+        # its own short deadline instead of the full limiter budget; past it the answer is web-only.
+        arxiv_deadline = self.settings.academic_arxiv_timeout_seconds
+        web, papers = await asyncio.gather(
+            self._engine_search(request.query, max_results=request.max_sources * 2),
+            asyncio.wait_for(
+                self.arxiv_client.search(
+                    query=request.query,
+                    max_results=min(self.settings.arxiv_max_results, request.max_sources * 2),
+                    categories=self.settings.arxiv_categories,
+                    queue_timeout=arxiv_deadline,
+                ),
+                timeout=arxiv_deadline,
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(web, Exception):
+            logger.warning("Web search failed in academic mode: %s", web)
+            web = []
+        if isinstance(papers, Exception):
+            timed_out = isinstance(papers, (asyncio.TimeoutError, RateLimitError))
+            reason = "timeout" if timed_out else "error"
+            logger.warning("arXiv search %s in academic mode: %r", reason, papers)
+            metrics.inc("autosearch_academic_web_only_total", reason=reason)
+            papers = []
+
+        ranked_papers = [
+            self._paper_to_source(paper)
+            for paper in self.arxiv_client.rank_papers(papers, query=request.query)
+        ]
+        fused = reciprocal_rank_fusion(
+            [ranked_papers, web], key=self._fusion_key, k=self.settings.academic_rrf_k
+        )
+        self._finish_stage(
+            "search", stage_start, "search_results", {"items": self._previews(fused)}
+        )
 
-        enriched: list[dict] = []
-        for item in raw:
-            url = item.get("url", "")
-            html = html_map.get(url)
-            if html:
-                item["content"] = self.extractor.extract(html)
-            enriched.append(item)
+        selected = fused[: request.max_sources]
+        # Paper abstracts already serve as content; only plain web hits need a page fetch.
+        web_hits = [item for item in selected if self._fusion_key(item).startswith("http")]
+        if web_hits and _degradation.get() < DegradationLevel.SNIPPET_ONLY:
+            await self._fetch_contents(web_hits, limit=len(web_hits))
+        return self._collapse_duplicates(selected)
+
+    def _fusion_key(self, item: dict) -> str:
+        if item.get("arxiv_id"):
+            return f"arxiv:{strip_arxiv_version(item['arxiv_id'])}"
+        url = item.get("url", "").strip()
+        identifier = arxiv_key(url)
+        return f"arxiv:{identifier}" if identifier else url
+
+    def _merge_branches(self, branches: list[list[dict]]) -> list[dict]:
+        """Interleave branch results round-robin, deduplicating URLs across branches."""
+        merged: dict[str, dict] = {}
+        for rank in range(max((len(items) for items in branches), default=0)):
+            for items in branches:
+                if rank >= len(items):
+                    continue
+                item = items[rank]
+                url = item.get("url", "").strip()
+                if not url:
+                    continue
+                existing = merged.get(url)
+                if existing is None:
+                    merged[url] = dict(item)
+                    continue
+                existing["relevance_score"] = float(existing.get("relevance_score") or 0.0) + float(
+                    item.get("relevance_score") or 1.0
+                )
+                if len(item.get("snippet", "")) > len(existing.get("snippet", "")):
+                    existing["snippet"] = item.get("snippet", "")
+        return list(merged.values())
+
+    async def _engine_search(self, query: str, max_results: int) -> list[dict]:
+        shared = _shared_calls.get()
+        if shared is None:
+            return await self.aggregator.search(query, max_results=max_results)
+        key = ("search", " ".join(query.lower().split()), max_results)
+        results = await shared.run(
+            key, lambda: self.aggregator.search(query, max_results=max_results)
+        )
+        # Callers attach fetched content to these dicts, so each one gets its own copies.
+        return [dict(item) for item in results]
+
+    async def _fetch_page(self, url: str) -> str | None:
+        shared = _shared_calls.get()
+        if shared is None:
+            return await self.fetcher.fetch(url)
+        return await shared.run(("fetch", url), lambda: self.fetcher.fetch(url))
+
+    def _snippets_suffice(self, items: list[dict], max_sources: int) -> bool:
+        if not self.settings.quick_snippet_only:
+            return False
+        usable = sum(
+            1
+            for item in items
+            if len(item.get("snippet") or "") >= self.settings.quick_min_snippet_chars
+        )
+        return usable >= min(self.settings.quick_min_sources, max_sources)
 
-        if self.settings.reranker_enabled:
-            reranked = self.reranker.rerank(request.query, enriched, top_k=request.max_sources)
+    async def _fetch_contents(self, items: list[dict], limit: int, concurrency: int = 6) -> None:
+        stage_start = time.perf_counter()
+        by_url = {item.get("url", ""): item for item in items if item.get("url")}
+        pages = self.fetcher.iter_fetch(
+            list(by_url), limit=limit, concurrency=concurrency, fetch=self._fetch_page
+        )
+        # aclosing cancels outstanding page fetches as soon as this request is cancelled.
+        async with aclosing(pages):
+            async for url, html in pages:
+                item = by_url[url]
+                with span("extract", url=url):
+                    item["content"] = self.extractor.extract(html)
+                self._emit_stage(
+                    "source_ready",
+                    "fetch",
+                    stage_start,
+                    {"url": url, "title": item.get("title", "Untitled")},
+                )
+        self._finish_stage("fetch", stage_start)
+
+    def _collapse_duplicates(self, items: list[dict]) -> list[dict]:
+        if not self.settings.near_duplicate_enabled:
+            return items
+        stage_start = time.perf_counter()
+        collapsed = self.deduplicator.collapse(items)
+        if len(collapsed) < len(items):
+            metrics.inc("autosearch_near_duplicates_total", amount=len(items) - len(collapsed))
+        self._finish_stage("dedupe", stage_start)
+        return collapsed
+
+    async def _rank_sources(self, query: str, items: list[dict], top_k: int) -> list[dict]:
+        # Mirrored copies would cost rerank compute and prompt tokens twice.
+        items = self._collapse_duplicates(items)
+        if self.settings.reranker_enabled and _degradation.get() < DegradationLevel.SKIP_RERANK:
+            stage_start = time.perf_counter()
+            reranked = await self._rerank(query, items, top_k)
+            self._finish_stage("rerank", stage_start, "rerank_done", {"count": len(reranked)})
             if reranked:
                 return reranked
 
-        return enriched[: request.max_sources]
+        return items[:top_k]
+
+    async def _rerank(self, query: str, items: list[dict], top_k: int) -> list[dict]:
+        batcher = _rerank_batcher.get()
+        # Off the event loop, so heartbeats and disconnect checks keep running during inference.
+        if batcher is None or not items or not await asyncio.to_thread(self.reranker.load):
+            return await asyncio.to_thread(self.reranker.rerank, query, items, top_k)
+        scores = await batcher.score(self.reranker.pairs(query, items))
+        return self.reranker.order(items, scores, top_k)
+
+    def _emit_stage(self, event: str, stage: str, started: float, data: dict) -> None:
+        listener = _stage_listener.get()
+        if listener is not None:
+            stage_time = round(time.perf_counter() - started, 3)
+            listener(event, {**data, "stage": stage, "stage_time": stage_time})
+
+    def _finish_stage(
+        self, stage: str, started: float, event: str | None = None, data: dict | None = None
+    ) -> None:
+        elapsed = time.perf_counter() - started
+        record_timing(stage, elapsed)
+        record_span(stage, started)
+        metrics.observe("autosearch_stage_seconds", elapsed, stage=stage)
+        if event is not None:
+            self._emit_stage(event, stage, started, data or {})
+
+    def _previews(self, items: list[dict]) -> list[dict]:
+        return [
+            {
+                "title": item.get("title", "Untitled"),
+                "url": item.get("url", ""),
+                "snippet": item.get("snippet", ""),
+                "source_engine": item.get("source_engine", "unknown"),
+            }
+            for item in items
+        ]
 
     def _request_llm_config(self, request: SearchRequest) -> dict | None:
         if request.llm_config is None:
@@ -73,12 +395,24 @@ class SearchPipeline:
             self.settings.arxiv_max_results,
             max(request.max_sources * 2, request.max_sources),
         )
+        stage_start = time.perf_counter()
         papers = await self.arxiv_client.search(
             query=request.query,
             max_results=target_size,
             categories=self.settings.arxiv_categories,
         )
+        self._finish_stage(
+            "search",
+            stage_start,
+            "search_results",
+            {"items": self._previews([self._paper_to_source(paper) for paper in papers])},
+        )
+
+        stage_start = time.perf_counter()
         ranked = self.arxiv_client.rank_papers(papers, query=request.query)
+        self._finish_stage("rerank", stage_start, "rerank_done", {"count": len(ranked)})
+        if _degradation.get() >= DegradationLevel.SNIPPET_ONLY:
+            return [self._paper_to_source(paper) for paper in ranked[: request.max_sources]]
         analyzed = await self.paper_analyzer.analyze_many(
             papers=ranked[: request.max_sources],
             query=request.query,
@@ -119,12 +453,33 @@ class SearchPipeline:
             f"pros and cons of {query}",
         ]
 
+    def _prompt_sources(self, request: SearchRequest, sources: list[dict]) -> list[dict]:
+        if not self.settings.passage_selection_enabled:
+            return sources
+        return self.passage_selector.select(request.query, sources)
+
+    def _degrade(self, request: SearchRequest, level: DegradationLevel) -> SearchRequest:
+        updates: dict = {}
+        if level >= DegradationLevel.REDUCE_SOURCES and request.max_sources > 2:
+            updates["max_sources"] = max(2, request.max_sources // 2)
+        if level >= DegradationLevel.QUICK_ONLY and request.mode == SearchMode.DEEP:
+            updates["mode"] = SearchMode.QUICK
+        return request.model_copy(update=updates) if updates else request
+
+    def _fallback_answer(self, request: SearchRequest, sources: list[dict]) -> str:
+        if request.mode == SearchMode.ARXIV:
+            return self._arxiv_fallback_answer(sources)
+        return self.synthesizer.fallback_answer(sources)
+
     async def _build_answer(self, request: SearchRequest, sources: list[dict]) -> str:
+        if _degradation.get() >= DegradationLevel.SNIPPET_ONLY:
+            return self._fallback_answer(request, sources)
         llm_config = self._request_llm_config(request)
+        prompt_sources = self._prompt_sources(request, sources)
         if request.mode != SearchMode.ARXIV:
             return await self.synthesizer.generate(
                 query=request.query,
-                sources=sources,
+                sources=prompt_sources,
                 language=request.language,
                 llm_config=llm_config,
             )
@@ -132,7 +487,7 @@ class SearchPipeline:
         if self.synthesizer.client.is_available_for(llm_config):
             return await self.synthesizer.generate(
                 query=f"Summarize latest arXiv papers about: {request.query}",
-                sources=sources,
+                sources=prompt_sources,
                 language=request.language,
                 llm_config=llm_config,
             )
@@ -141,11 +496,14 @@ class SearchPipeline:
     async def _stream_answer(
         self, request: SearchRequest, sources: list[dict]
     ) -> AsyncGenerator[str, None]:
+        if _degradation.get() >= DegradationLevel.SNIPPET_ONLY:
+            yield self._fallback_answer(request, sources)
+            return
         llm_config = self._request_llm_config(request)
         if request.mode != SearchMode.ARXIV or self.synthesizer.client.is_available_for(llm_config):
             async for chunk in self.synthesizer.stream(
                 query=request.query,
-                sources=sources,
+                sources=self._prompt_sources(request, sources),
                 language=request.language,
                 llm_config=llm_config,
             ):
@@ -185,14 +543,42 @@ class SearchPipeline:
             f"{request.query}:{request.mode}:{request.max_sources}:{request.language}:{llm_cache_marker}"
         )
         if self.settings.cache_enabled:
-            cached = self.cache.get(cache_key)
+            lookup_start = time.perf_counter()
+            # A hit runs no stages, so its trace is the request root alone.
+            with track_trace("request", self._tracing(request), mode=request.mode.value) as hit_trace:
+                cached = self.cache.get(cache_key)
+            metrics.inc(
+                "autosearch_cache_requests_total",
+                cache="response",
+                result="hit" if cached else "miss",
+            )
             if cached:
-                return cached
+                return self._cache_hit(request, cached, lookup_start, hit_trace)
 
         start = time.perf_counter()
-        sources = await self._retrieve(request)
-        answer = await self._build_answer(request=request, sources=sources)
+        level = await self.load_shedder.assess()
+        request = self._degrade(request, level)
+        token = _degradation.set(level)
+        try:
+            with (
+                metrics.track_inflight("autosearch_inflight_requests", kind="sync"),
+                track_trace(
+                    "request",
+                    self._tracing(request),
+                    mode=request.mode.value,
+                    degradation_level=int(level),
+                ) as trace,
+                track_timings() as timings,
+            ):
+                sources = await self._retrieve(request)
+                stage_start = time.perf_counter()
+                answer = await self._build_answer(request=request, sources=sources)
+                self._finish_stage("synthesize", stage_start)
+        finally:
+            _degradation.reset(token)
         elapsed = time.perf_counter() - start
+        self._export_trace(trace)
+        metrics.observe("autosearch_request_seconds", elapsed, mode=request.mode.value, kind="sync")
 
         response = {
             "query": request.query,
@@ -200,38 +586,243 @@ class SearchPipeline:
             "sources": self._sanitize_sources(sources),
             "related_queries": self._related_queries(request.query, request.mode),
             "search_time": round(elapsed, 3),
+            "timings": timings,
             "model_used": self._model_used(request),
+            "degradation_level": int(level),
         }
 
-        if self.settings.cache_enabled:
+        # A degraded answer is only good enough for now; do not serve it after load drops.
+        if self.settings.cache_enabled and level == DegradationLevel.NORMAL:
             self.cache.set(cache_key, response)
+        if request.include_trace and trace is not None:
+            return {**response, "trace": trace.to_dict()}
+        return response
+
+    def _cache_hit(
+        self, request: SearchRequest, cached: dict, started: float, trace: Trace | None
+    ) -> dict:
+        elapsed = time.perf_counter() - started
+        # The cached timings describe the request that filled the cache, not this one.
+        response = {**cached, "search_time": round(elapsed, 3), "timings": {"cache": round(elapsed, 4)}}
+        if trace is not None:
+            trace.root.attributes["cache"] = "hit"
+            self._export_trace(trace)
+            if request.include_trace:
+                response["trace"] = trace.to_dict()
         return response
 
-    async def search_stream(self, request: SearchRequest) -> AsyncGenerator[str, None]:
+    async def search_batch(
+        self, requests: list[SearchRequest], concurrency: int | None = None
+    ) -> AsyncGenerator[dict, None]:
+        """Run many searches with bounded concurrency, yielding each result as it completes.
+
+        Engine searches and page fetches are shared across the whole batch, so
+        overlapping queries only pay for them once. Items reranking at about the
+        same time share one cross-encoder `predict` call.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.settings.batch_max_concurrency)
+        shared = SharedCalls(max_completed=self.settings.batch_shared_max_results)
+        batcher = RerankBatcher(
+            self.reranker.predict,
+            window_seconds=self.settings.batch_rerank_window_seconds,
+            max_pairs=self.settings.batch_rerank_max_pairs,
+        )
+        token = _shared_calls.set(shared)
+        batcher_token = _rerank_batcher.set(batcher)
+
+        async def run_one(index: int, request: SearchRequest) -> dict:
+            async with semaphore:
+                try:
+                    async with self.admission.slot("batch"):
+                        result = await self.search_sync(request)
+                except RateLimitError as exc:
+                    return {
+                        "index": index,
+                        "query": request.query,
+                        "error": str(exc),
+                        "retry_after": round(exc.retry_after, 3),
+                    }
+                except Exception as exc:
+                    logger.exception("Batch item %d failed", index)
+                    return {"index": index, "query": request.query, "error": str(exc)}
+                return {"index": index, "query": request.query, "result": result}
+
+        try:
+            tasks = [asyncio.ensure_future(run_one(i, item)) for i, item in enumerate(requests)]
+        finally:
+            # Tasks copied the context on creation; the caller's context goes back to normal.
+            _rerank_batcher.reset(batcher_token)
+            _shared_calls.reset(token)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            metrics.inc("autosearch_batch_shared_calls_total", amount=shared.hits)
+            metrics.inc("autosearch_batch_rerank_predict_calls_total", amount=batcher.predict_calls)
+            shared.close()
+            batcher.close()
+
+    async def search_stream(
+        self,
+        request: SearchRequest,
+        is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+    ) -> AsyncGenerator[str, None]:
         start = time.perf_counter()
+        queue: asyncio.Queue[tuple[str, dict | str] | None] = asyncio.Queue()
+        producer = asyncio.create_task(self._produce_stream(request, start, queue))
+        watcher = None
+        if is_disconnected is not None:
+            watcher = asyncio.create_task(self._watch_disconnect(is_disconnected, producer))
         try:
-            sources = await self._retrieve(request)
-            safe_sources = self._sanitize_sources(sources)
-            yield to_sse("sources", {"items": safe_sources})
-            yield to_sse("answer_start", {"status": "streaming"})
-
-            answer_parts: list[str] = []
-            async for chunk in self._stream_answer(request=request, sources=sources):
-                answer_parts.append(chunk)
-                yield to_sse("answer_chunk", {"chunk": chunk})
+            async for event in self._drain_stream(queue, start):
+                yield event
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+            if not producer.done():
+                # The consumer went away mid-stream (client closed or server shutdown).
+                producer.cancel()
+                metrics.inc("autosearch_stream_cancellations_total", reason="stream_closed")
+
+    async def _watch_disconnect(
+        self, is_disconnected: Callable[[], Awaitable[bool]], producer: asyncio.Task
+    ) -> None:
+        while not producer.done():
+            if await is_disconnected():
+                logger.info("SSE client disconnected; cancelling in-flight search")
+                producer.cancel()
+                metrics.inc("autosearch_stream_cancellations_total", reason="client_disconnect")
+                return
+            await asyncio.sleep(self.settings.sse_disconnect_poll_seconds)
+
+    async def _drain_stream(
+        self, queue: asyncio.Queue[tuple[str, dict | str] | None], start: float
+    ) -> AsyncGenerator[str, None]:
+        """Serialize queued events, coalescing answer deltas and filling idle gaps with heartbeats."""
+        loop = asyncio.get_running_loop()
+        window = self.settings.sse_coalesce_ms / 1000
+        max_chars = self.settings.sse_coalesce_chars
+        heartbeat = self.settings.sse_heartbeat_seconds
+        buffer: list[str] = []
+        buffered = 0
+        flush_at = 0.0
+        last_sent = loop.time()
+
+        while True:
+            now = loop.time()
+            if buffer and (buffered >= max_chars or now >= flush_at):
+                yield to_sse("answer_chunk", {"chunk": "".join(buffer)})
+                buffer, buffered, last_sent = [], 0, now
+
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                deadline = min(flush_at, last_sent + heartbeat) if buffer else last_sent + heartbeat
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=max(0.0, deadline - now))
+                except asyncio.TimeoutError:
+                    if not buffer:
+                        # Keeps idle-timeout proxies from cutting slow retrievals or LLM warm-up.
+                        elapsed = round(time.perf_counter() - start, 3)
+                        yield to_sse("heartbeat", {"elapsed": elapsed})
+                        last_sent = loop.time()
+                    continue
+
+            if item is not None and item[0] == "answer_chunk":
+                if not buffer:
+                    flush_at = loop.time() + window
+                buffer.append(item[1])
+                buffered += len(item[1])
+                continue
+
+            if buffer:
+                yield to_sse("answer_chunk", {"chunk": "".join(buffer)})
+                buffer, buffered = [], 0
+            if item is None:
+                return
+            yield to_sse(*item)
+            last_sent = loop.time()
+
+    async def _produce_stream(
+        self,
+        request: SearchRequest,
+        start: float,
+        queue: asyncio.Queue[tuple[str, dict | str] | None],
+    ) -> None:
+        def publish(event: str, data: dict) -> None:
+            queue.put_nowait((event, {**data, "elapsed": round(time.perf_counter() - start, 3)}))
+
+        # This task runs in its own context copy, so the listener never leaks to other requests.
+        _stage_listener.set(publish)
+        metrics.add_gauge("autosearch_inflight_requests", 1, kind="stream")
+        try:
+            level = await self.load_shedder.assess()
+            request = self._degrade(request, level)
+            _degradation.set(level)
+            with (
+                track_trace(
+                    "request",
+                    self._tracing(request),
+                    mode=request.mode.value,
+                    stream=True,
+                    degradation_level=int(level),
+                ) as trace,
+                track_timings() as timings,
+            ):
+                sources = await self._retrieve(request)
+                safe_sources = self._sanitize_sources(sources)
+                queue.put_nowait(("sources", {"items": safe_sources}))
+                queue.put_nowait(("answer_start", {"status": "streaming"}))
+
+                stage_start = time.perf_counter()
+                answer_parts: list[str] = []
+                async for chunk in self._stream_answer(request=request, sources=sources):
+                    answer_parts.append(chunk)
+                    queue.put_nowait(("answer_chunk", chunk))
+                self._finish_stage("synthesize", stage_start)
 
             elapsed = time.perf_counter() - start
+            metrics.observe(
+                "autosearch_request_seconds", elapsed, mode=request.mode.value, kind="stream"
+            )
             payload = {
                 "query": request.query,
                 "answer": "".join(answer_parts),
-                "sources": safe_sources,
                 "related_queries": self._related_queries(request.query, request.mode),
                 "search_time": round(elapsed, 3),
+                "timings": timings,
                 "model_used": self._model_used(request),
+                "degradation_level": int(level),
             }
-            yield to_sse("answer_end", payload)
+            self._export_trace(trace)
+            if request.include_trace and trace is not None:
+                payload["trace"] = trace.to_dict()
+            if self.settings.sse_end_sources == "full":
+                payload["sources"] = safe_sources
+            else:
+                # The list already went out in the `sources` event; point at it instead.
+                payload["sources_ref"] = "sources"
+            queue.put_nowait(("answer_end", payload))
         except Exception as exc:
-            yield to_sse("error", {"message": str(exc)})
+            queue.put_nowait(("error", {"message": str(exc)}))
+        finally:
+            metrics.add_gauge("autosearch_inflight_requests", -1, kind="stream")
+            queue.put_nowait(None)
+
+    def _tracing(self, request: SearchRequest) -> bool:
+        return request.include_trace or bool(self.settings.trace_export_endpoint)
+
+    def _export_trace(self, trace: Trace | None) -> None:
+        if trace is None or not self.settings.trace_export_endpoint:
+            return
+        task = asyncio.create_task(
+            export_otlp(trace, self.settings.trace_export_endpoint, self.settings.trace_service_name)
+        )
+        # Hold a reference so the fire-and-forget export is not garbage collected mid-flight.
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
 
     def _sanitize_sources(self, sources: list[dict]) -> list[dict]:
         cleaned: list[dict] = []
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from collections import defaultdict
 
 from backend.config import get_settings
@@ -12,6 +13,8 @@ from backend.search.brave import BraveSearchEngine
 from backend.search.duckduckgo import DuckDuckGoSearchEngine
 from backend.search.google import GoogleSearchEngine
 from backend.utils.logger import get_logger
+from backend.utils.metrics import metrics
+from backend.utils.tracing import span
 
 logger = get_logger(__name__)
 
@@ -40,7 +43,7 @@ class SearchAggregator:
             self.engines = [DuckDuckGoSearchEngine()]
 
     async def search(self, query: str, max_results: int = 8) -> list[dict]:
-        tasks = [engine.search(query, max_results=max_results) for engine in self.engines]
+        tasks = [self._timed_search(engine, query, max_results) for engine in self.engines]
         responses = await asyncio.gather(*tasks, return_exceptions=True)
 
         merged: list[dict] = []
@@ -53,6 +56,21 @@ class SearchAggregator:
         deduped = self._dedupe_and_score(merged)
         return deduped[:max_results]
 
+    async def _timed_search(
+        self, engine: BaseSearchEngine, query: str, max_results: int
+    ) -> list[dict]:
+        started = time.perf_counter()
+        try:
+            with span("engine.search", engine=engine.name):
+                return await engine.search(query, max_results=max_results)
+        except Exception:
+            metrics.inc("autosearch_engine_errors_total", engine=engine.name)
+            raise
+        finally:
+            metrics.observe(
+                "autosearch_engine_seconds", time.perf_counter() - started, engine=engine.name
+            )
+
     def _dedupe_and_score(self, items: list[dict]) -> list[dict]:
         by_url: dict[str, dict] = {}
         support_count: defaultdict[str, int] = defaultdict(int)
@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-import aiohttp
-
 from backend.config import get_settings
 from backend.search.base import BaseSearchEngine
 from backend.utils.logger import get_logger
@@ -24,10 +22,12 @@ class BingSearchEngine(BaseSearchEngine):
         headers = {"Ocp-Apim-Subscription-Key": self.settings.bing_api_key}
         params = {"q": query, "count": max_results, "mkt": "en-US"}
 
+        import aiohttp
+
         try:
             async with aiohttp.ClientSession() as session:
                 async with session.get(
-                    "https://api.bing.microsoft.com/v7.0/search",
+                    self.settings.bing_base_url,
                     headers=headers,
                     params=params,
                     timeout=12,
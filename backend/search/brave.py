@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-import aiohttp
-
 from backend.config import get_settings
 from backend.search.base import BaseSearchEngine
 from backend.utils.logger import get_logger
@@ -27,10 +25,12 @@ class BraveSearchEngine(BaseSearchEngine):
         }
         params = {"q": query, "count": max_results}
 
+        import aiohttp
+
         try:
             async with aiohttp.ClientSession() as session:
                 async with session.get(
-                    "https://api.search.brave.com/res/v1/web/search",
+                    self.settings.brave_base_url,
                     headers=headers,
                     params=params,
                     timeout=12,
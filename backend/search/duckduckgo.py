@@ -8,9 +8,7 @@ from __future__ import annotations
 
 from urllib.parse import parse_qs, unquote, urlparse
 
-import aiohttp
-from bs4 import BeautifulSoup
-
+from backend.config import get_settings
 from backend.search.base import BaseSearchEngine
 from backend.utils.logger import get_logger
 
@@ -20,13 +18,18 @@ logger = get_logger(__name__)
 class DuckDuckGoSearchEngine(BaseSearchEngine):
     name = "duckduckgo"
 
+    def __init__(self) -> None:
+        self.settings = get_settings()
+
     async def search(self, query: str, max_results: int = 8) -> list[dict]:
+        import aiohttp
+
         try:
             async with aiohttp.ClientSession(
                 headers={"User-Agent": "Mozilla/5.0"}, timeout=aiohttp.ClientTimeout(total=12)
             ) as session:
                 async with session.get(
-                    "https://html.duckduckgo.com/html/",
+                    self.settings.duckduckgo_base_url,
                     params={"q": query},
                 ) as response:
                     if response.status != 200:
@@ -36,6 +39,11 @@ class DuckDuckGoSearchEngine(BaseSearchEngine):
             logger.warning("DuckDuckGo request failed: %s", exc)
             return []
 
+        return self.parse_results(html, max_results)
+
+    def parse_results(self, html: str, max_results: int = 8) -> list[dict]:
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(html, "lxml")
         items: list[dict] = []
         for anchor in soup.select("a.result__a"):
@@ -0,0 +1,56 @@
+"""Rank fusion for merging independently ranked result lists."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+
+ARXIV_URL_PATTERN = re.compile(
+    r"arxiv\.org/(?:abs|pdf|html)/"
+    r"(?P<id>\d{4}\.\d{4,5}|[a-z][a-z.\-]*/\d{7})(?:v\d+)?(?:\.pdf)?/?(?:[?#].*)?$",
+    re.IGNORECASE,
+)
+ARXIV_VERSION_PATTERN = re.compile(r"v\d+$")
+
+
+def arxiv_key(url: str) -> str | None:
+    """Return the version-less arXiv identifier behind an abs, PDF or HTML URL."""
+    match = ARXIV_URL_PATTERN.search(url.strip())
+    if match is None:
+        return None
+    return match.group("id").lower()
+
+
+def strip_arxiv_version(arxiv_id: str) -> str:
+    return ARXIV_VERSION_PATTERN.sub("", arxiv_id.strip()).lower()
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: list[list[dict]],
+    key: Callable[[dict], str] | None = None,
+    k: int = 60,
+    weights: list[float] | None = None,
+) -> list[dict]:
+    """Merge ranked lists by summing `weight / (k + rank)` per item.
+
+    Items are identified by `key(item)` (the URL by default); the first
+    occurrence wins and later duplicates only contribute score. Scores are
+    written to `relevance_score`.
+    """
+    key = key or (lambda item: item.get("url", "").strip())
+    weights = weights or [1.0] * len(ranked_lists)
+    merged: dict[str, dict] = {}
+    scores: dict[str, float] = {}
+
+    for items, weight in zip(ranked_lists, weights):
+        for rank, item in enumerate(items, start=1):
+            identity = key(item)
+            if not identity:
+                continue
+            scores[identity] = scores.get(identity, 0.0) + weight / (k + rank)
+            if identity not in merged:
+                merged[identity] = dict(item)
+
+    for identity, item in merged.items():
+        item["relevance_score"] = round(scores[identity], 6)
+    return sorted(merged.values(), key=lambda item: item["relevance_score"], reverse=True)
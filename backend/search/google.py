@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-import aiohttp
-
 from backend.config import get_settings
 from backend.search.base import BaseSearchEngine
 from backend.utils.logger import get_logger
@@ -28,10 +26,12 @@ class GoogleSearchEngine(BaseSearchEngine):
             "num": min(max_results, 10),
         }
 
+        import aiohttp
+
         try:
             async with aiohttp.ClientSession() as session:
                 async with session.get(
-                    "https://www.googleapis.com/customsearch/v1", params=params, timeout=12
+                    self.settings.google_base_url, params=params, timeout=12
                 ) as response:
                     if response.status != 200:
                         return []
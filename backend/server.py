@@ -0,0 +1,137 @@
+"""Pre-forking multi-worker server.
+
+uvicorn's own `--workers` starts every worker with multiprocessing's spawn method, so each one
+imports the app and loads the reranker from scratch. With `preload`, `serve` imports the app,
+loads the reranker weights and binds the socket once in a supervisor process. It then forks the
+workers, which share those pages copy-on-write. Each worker still builds its own pipeline in
+the lifespan hook, so caches, limiters, admission state and HTTP sessions stay per process.
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import signal
+import socket
+import time
+
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+APP = "backend.main:app"
+
+# Set in each forked worker to its slot number, 0..workers-1.
+WORKER_INDEX_ENV = "AUTOSEARCH_WORKER_INDEX"
+
+RESTART_DELAY_SECONDS = 1.0
+
+_preloaded = False
+
+
+def serve(host: str, port: int, workers: int = 1, preload: bool = False) -> None:
+    import uvicorn
+
+    if not hasattr(os, "fork"):
+        if preload:
+            logger.warning("Preloading before fork needs os.fork; starting workers without it")
+        uvicorn.run(APP, host=host, port=port, workers=workers)
+        return
+    if workers == 1 and not preload:
+        uvicorn.run(APP, host=host, port=port)
+        return
+    Supervisor(host, port, workers, preload).run()
+
+
+def worker_index() -> int:
+    """This process's worker slot; 0 when not running under the supervisor."""
+    return int(os.environ.get(WORKER_INDEX_ENV, "0"))
+
+
+def preloaded_before_fork() -> bool:
+    """True in workers forked from a supervisor that already ran the preload."""
+    return _preloaded
+
+
+class Supervisor:
+    """Fork `workers` uvicorn servers on one shared socket and restart any that exit."""
+
+    def __init__(self, host: str, port: int, workers: int, preload: bool) -> None:
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.preload = preload
+        self.children: dict[int, int] = {}
+        self.stopping = False
+
+    def run(self) -> None:
+        import uvicorn
+
+        if self.preload:
+            self._preload()
+        sock = uvicorn.Config(APP, host=self.host, port=self.port).bind_socket()
+        # Keep the collector from touching (and so copying) every object inherited by the workers.
+        gc.freeze()
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        for index in range(self.workers):
+            self._spawn(index, sock)
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            index = self.children.pop(pid, None)
+            if index is None or self.stopping:
+                continue
+            logger.warning(
+                "Worker %d (pid %d) exited with status %d; restarting",
+                index,
+                pid,
+                os.waitstatus_to_exitcode(status),
+            )
+            time.sleep(RESTART_DELAY_SECONDS)
+            if not self.stopping:
+                self._spawn(index, sock)
+        sock.close()
+
+    def _preload(self) -> None:
+        global _preloaded
+        started = time.perf_counter()
+        from backend.main import get_pipeline
+
+        # The pipeline built here is dropped in each child (see backend.main); the imported
+        # modules and the reranker weights in `backend.models.reranker._models` are what carry over.
+        steps = get_pipeline().preload()
+        _preloaded = True
+        logger.info("Preloaded in %.2fs before forking: %s", time.perf_counter() - started, steps)
+
+    def _spawn(self, index: int, sock: socket.socket) -> None:
+        pid = os.fork()
+        if pid:
+            self.children[pid] = index
+            return
+
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        os.environ[WORKER_INDEX_ENV] = str(index)
+        code = 0
+        try:
+            import uvicorn
+
+            uvicorn.Server(uvicorn.Config(APP, host=self.host, port=self.port)).run(sockets=[sock])
+        except BaseException:
+            logger.exception("Worker %d crashed", index)
+            code = 1
+        finally:
+            os._exit(code)
+
+    def _stop(self, _signum: int, _frame: object) -> None:
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
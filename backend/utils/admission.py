@@ -0,0 +1,130 @@
+"""Per-worker admission control: bounded concurrency with a prioritized wait queue."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+import weakref
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from backend.utils.metrics import metrics
+from backend.utils.ratelimit import RateLimitError
+
+# Lower runs first. Stream clients are watching a spinner; batch jobs can wait.
+PRIORITIES = {"stream": 0, "sync": 1, "batch": 2}
+
+
+class Lease:
+    """One admitted request; `release` is idempotent so every exit path may call it."""
+
+    def __init__(self, controller: AdmissionController) -> None:
+        self._controller = controller
+        self._started = time.monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._controller._release(time.monotonic() - self._started)
+
+    def hold(self, body: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Wrap a streaming body so the slot is held until the stream ends."""
+
+        async def wrapper() -> AsyncIterator[str]:
+            try:
+                async for chunk in body:
+                    yield chunk
+            finally:
+                self.release()
+
+        wrapped = wrapper()
+        # A response that fails before iterating never enters `finally`; release on collection.
+        weakref.finalize(wrapped, self.release)
+        return wrapped
+
+
+class AdmissionController:
+    """Admit at most `max_inflight` requests; queue up to `max_queue` more for `queue_timeout`.
+
+    Waiters are served by priority, then arrival. A full queue or an expired
+    wait raises `RateLimitError` with a Retry-After estimate derived from
+    recent request durations. `max_inflight=0` admits everything but still
+    counts in-flight requests for load signals.
+    """
+
+    def __init__(
+        self,
+        max_inflight: int,
+        max_queue: int,
+        queue_timeout: float,
+        prioritize_streams: bool = True,
+    ) -> None:
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.prioritize_streams = prioritize_streams
+        self.in_flight = 0
+        self.queue_depth = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._avg_hold = 1.0
+
+        metrics.register_gauge("autosearch_queue_depth", lambda: self.queue_depth, queue="admission")
+        metrics.register_gauge("autosearch_admission_in_flight", lambda: self.in_flight)
+
+    async def acquire(self, kind: str = "sync") -> Lease:
+        if self.max_inflight <= 0 or (self.in_flight < self.max_inflight and not self.queue_depth):
+            self.in_flight += 1
+            return Lease(self)
+
+        if self.queue_depth >= self.max_queue:
+            self._reject("queue_full", kind)
+
+        priority = PRIORITIES.get(kind, 1) if self.prioritize_streams else 0
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self.queue_depth += 1
+        try:
+            await asyncio.wait_for(future, timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._reject("timeout", kind)
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as this caller went away; pass it on.
+                self._release(0.0)
+            raise
+        finally:
+            self.queue_depth -= 1
+        # `_release` transferred its slot to this waiter, so in_flight is already counted.
+        return Lease(self)
+
+    @asynccontextmanager
+    async def slot(self, kind: str = "sync") -> AsyncIterator[Lease]:
+        lease = await self.acquire(kind)
+        try:
+            yield lease
+        finally:
+            lease.release()
+
+    def retry_after(self) -> float:
+        slots = max(1, self.max_inflight)
+        return max(1.0, self._avg_hold * (self.queue_depth + 1) / slots)
+
+    def _reject(self, reason: str, kind: str) -> None:
+        metrics.inc("autosearch_admission_rejections_total", reason=reason, kind=kind)
+        raise RateLimitError(
+            "Server is at capacity; retry shortly.", retry_after=self.retry_after()
+        )
+
+    def _release(self, held: float) -> None:
+        if held:
+            self._avg_hold += 0.1 * (held - self._avg_hold)
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
@@ -0,0 +1,152 @@
+"""In-process operational metrics with Prometheus text exposition."""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Latency buckets in seconds, from cache hits up to slow LLM completions.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+class Histogram:
+    """Fixed-bucket histogram; `observe` is one bisect plus two additions."""
+
+    __slots__ = ("buckets", "count", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Labelled counters, gauges and histograms keyed by metric name plus sorted label pairs."""
+
+    def __init__(self) -> None:
+        self._counters: defaultdict[LabelKey, float] = defaultdict(float)
+        self._gauges: defaultdict[LabelKey, float] = defaultdict(float)
+        self._gauge_callbacks: dict[LabelKey, Callable[[], float]] = {}
+        self._histograms: dict[LabelKey, Histogram] = {}
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        self._counters[(name, tuple(sorted(labels.items())))] += amount
+
+    def value(self, name: str, **labels: str) -> float:
+        return self._counters.get((name, tuple(sorted(labels.items()))), 0.0)
+
+    def add_gauge(self, name: str, amount: float, **labels: str) -> None:
+        self._gauges[(name, tuple(sorted(labels.items())))] += amount
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        self._gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def gauge(self, name: str, **labels: str) -> float:
+        key = (name, tuple(sorted(labels.items())))
+        callback = self._gauge_callbacks.get(key)
+        if callback is not None:
+            return float(callback())
+        return self._gauges.get(key, 0.0)
+
+    def register_gauge(self, name: str, callback: Callable[[], float], **labels: str) -> None:
+        """Sample `callback` at scrape time, for values another component already tracks."""
+        self._gauge_callbacks[(name, tuple(sorted(labels.items())))] = callback
+
+    @contextmanager
+    def track_inflight(self, name: str, **labels: str) -> Iterator[None]:
+        self.add_gauge(name, 1, **labels)
+        try:
+            yield
+        finally:
+            self.add_gauge(name, -1, **labels)
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram()
+        histogram.observe(value)
+
+    def histogram(self, name: str, **labels: str) -> Histogram | None:
+        return self._histograms.get((name, tuple(sorted(labels.items()))))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format (version 0.0.4)."""
+        lines: list[str] = []
+        self._render_simple(lines, "counter", dict(self._counters))
+
+        gauges = dict(self._gauges)
+        for key, callback in list(self._gauge_callbacks.items()):
+            # A broken probe must not break the scrape: skip that gauge and say why.
+            try:
+                gauges[key] = float(callback())
+            except (ArithmeticError, AttributeError, LookupError, TypeError, ValueError) as exc:
+                logger.warning("Gauge %s failed: %s", key[0], exc)
+        self._render_simple(lines, "gauge", gauges)
+
+        families: defaultdict[str, list[tuple[tuple[tuple[str, str], ...], Histogram]]] = (
+            defaultdict(list)
+        )
+        for (name, labels), histogram in list(self._histograms.items()):
+            families[name].append((labels, histogram))
+        for name in sorted(families):
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in sorted(families[name], key=lambda entry: entry[0]):
+                cumulative = 0
+                for bound, count in zip((*histogram.buckets, math.inf), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == math.inf else _format_value(bound)
+                    lines.append(
+                        f"{name}_bucket{_format_labels((*labels, ('le', le)))} {cumulative}"
+                    )
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def _render_simple(self, lines: list[str], kind: str, values: dict[LabelKey, float]) -> None:
+        families: defaultdict[str, list[tuple[tuple[tuple[str, str], ...], float]]] = (
+            defaultdict(list)
+        )
+        for (name, labels), value in values.items():
+            families[name].append((labels, value))
+        for name in sorted(families):
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(families[name], key=lambda entry: entry[0]):
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if not math.isfinite(value):
+        return "NaN" if math.isnan(value) else ("+Inf" if value > 0 else "-Inf")
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,99 @@
+"""Token-bucket rate limiter that can be shared by every worker on one host."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock; fall back to per-process state
+    fcntl = None
+
+
+class RateLimitError(RuntimeError):
+    """Raised when a caller cannot be scheduled within its wait budget."""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """GCRA token bucket: one token every `interval_seconds`, up to `burst` at once.
+
+    The bucket state is a single "theoretical arrival time" timestamp. With a
+    `state_path`, it lives in a file guarded by `flock`, so separate uvicorn
+    workers draw from the same bucket. Callers reserve a slot in arrival order,
+    then sleep until it; a reservation that would exceed the caller's timeout is
+    refused without consuming a token.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        burst: int = 1,
+        state_path: str | None = None,
+        max_waiters: int = 32,
+        timeout_seconds: float | None = 30.0,
+    ) -> None:
+        self.interval_seconds = max(0.0, interval_seconds)
+        self.burst = max(1, burst)
+        self.state_path = Path(state_path) if state_path and fcntl is not None else None
+        self.max_waiters = max_waiters
+        self.timeout_seconds = timeout_seconds
+        self.waiters = 0
+        self._tat = 0.0
+
+    async def acquire(self, timeout: float | None = None) -> float:
+        """Wait for a token and return the seconds spent waiting."""
+        if self.waiters >= self.max_waiters:
+            raise RateLimitError(
+                "Rate limiter queue is full.", retry_after=self.interval_seconds * self.waiters
+            )
+
+        budget = self.timeout_seconds if timeout is None else timeout
+        self.waiters += 1
+        try:
+            if self.state_path is not None:
+                wait = await asyncio.to_thread(self._reserve_shared, budget)
+            else:
+                wait = self._reserve(self._tat, budget)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            return wait
+        finally:
+            self.waiters -= 1
+
+    def _reserve(self, stored_tat: float, budget: float | None) -> float:
+        now = time.time()
+        tat = max(stored_tat, now)
+        wait = max(0.0, tat - (self.burst - 1) * self.interval_seconds - now)
+        if budget is not None and wait > budget:
+            raise RateLimitError(
+                f"Rate limiter wait of {wait:.1f}s exceeds the {budget:.1f}s budget.",
+                retry_after=wait,
+            )
+        self._tat = tat + self.interval_seconds
+        return wait
+
+    def _reserve_shared(self, budget: float | None) -> float:
+        assert self.state_path is not None and fcntl is not None
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_path, "a+", encoding="utf-8") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                try:
+                    stored_tat = float(handle.read().strip() or 0.0)
+                except ValueError:
+                    stored_tat = 0.0
+                wait = self._reserve(stored_tat, budget)
+                handle.seek(0)
+                handle.truncate()
+                handle.write(repr(self._tat))
+                handle.flush()
+                return wait
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
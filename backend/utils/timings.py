@@ -0,0 +1,30 @@
+"""Per-request timing collection shared across pipeline components."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current_timings: ContextVar[dict[str, float] | None] = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def track_timings() -> Iterator[dict[str, float]]:
+    """Collect `record_timing` calls made while handling one request."""
+    timings: dict[str, float] = {}
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        try:
+            _current_timings.reset(token)
+        except ValueError:
+            # Async generators may be finalized from another context; just detach there.
+            _current_timings.set(None)
+
+
+def record_timing(name: str, seconds: float) -> None:
+    timings = _current_timings.get()
+    if timings is not None:
+        timings[name] = round(timings.get(name, 0.0) + seconds, 4)
@@ -0,0 +1,188 @@
+"""Per-request trace spans with OTLP/JSON export."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Span:
+    name: str
+    span_id: str
+    parent_id: str | None
+    start: float
+    end: float | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+class Trace:
+    """Spans recorded for one request, timed with `perf_counter` and anchored to wall time."""
+
+    def __init__(self, name: str, **attributes: Any) -> None:
+        self.trace_id = os.urandom(16).hex()
+        self._epoch_ns = time.time_ns()
+        self._anchor = time.perf_counter()
+        self.root = Span(name, os.urandom(8).hex(), None, self._anchor, attributes=attributes)
+        self.spans: list[Span] = [self.root]
+
+    def add(
+        self,
+        name: str,
+        start: float,
+        end: float | None = None,
+        parent_id: str | None = None,
+        **attributes: Any,
+    ) -> Span:
+        span = Span(name, os.urandom(8).hex(), parent_id or self.root.span_id, start, end, attributes)
+        self.spans.append(span)
+        return span
+
+    def finish(self) -> None:
+        if self.root.end is None:
+            self.root.end = time.perf_counter()
+
+    def to_dict(self) -> dict:
+        """Compact form for API responses: offsets and durations in milliseconds."""
+        return {
+            "trace_id": self.trace_id,
+            "spans": [
+                {
+                    "name": span.name,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "start_ms": round((span.start - self._anchor) * 1000, 3),
+                    "duration_ms": round(((span.end or span.start) - span.start) * 1000, 3),
+                    "attributes": span.attributes,
+                }
+                for span in self.spans
+            ],
+        }
+
+    def to_otlp(self, service_name: str) -> dict:
+        """OTLP/JSON `ExportTraceServiceRequest` accepted by collectors on `/v1/traces`."""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "autosearch"},
+                            "spans": [self._otlp_span(span) for span in self.spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def _otlp_span(self, span: Span) -> dict:
+        payload = {
+            "traceId": self.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self._unix_nanos(span.start)),
+            "endTimeUnixNano": str(self._unix_nanos(span.end or span.start)),
+            "attributes": _otlp_attributes(span.attributes),
+        }
+        if span.parent_id:
+            payload["parentSpanId"] = span.parent_id
+        return payload
+
+    def _unix_nanos(self, perf: float) -> int:
+        return self._epoch_ns + int((perf - self._anchor) * 1e9)
+
+
+_current_trace: ContextVar[Trace | None] = ContextVar("request_trace", default=None)
+_current_span_id: ContextVar[str | None] = ContextVar("current_span_id", default=None)
+
+
+@contextmanager
+def track_trace(name: str, enabled: bool = True, **attributes: Any) -> Iterator[Trace | None]:
+    """Collect spans recorded while handling one request; yields None when disabled."""
+    if not enabled:
+        yield None
+        return
+    trace = Trace(name, **attributes)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        trace.finish()
+        try:
+            _current_trace.reset(token)
+        except ValueError:
+            # Async generators may be finalized from another context; just detach there.
+            _current_trace.set(None)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """Time a block as a child of the enclosing span; a no-op outside `track_trace`."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    current = trace.add(name, time.perf_counter(), parent_id=_current_span_id.get(), **attributes)
+    token = _current_span_id.set(current.span_id)
+    try:
+        yield current
+    finally:
+        current.end = time.perf_counter()
+        try:
+            _current_span_id.reset(token)
+        except ValueError:
+            _current_span_id.set(None)
+
+
+def record_span(name: str, start: float, end: float | None = None, **attributes: Any) -> None:
+    """Record an already-measured interval (`perf_counter` seconds) under the enclosing span."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(
+            name,
+            start,
+            time.perf_counter() if end is None else end,
+            parent_id=_current_span_id.get(),
+            **attributes,
+        )
+
+
+async def export_otlp(trace: Trace, endpoint: str, service_name: str, timeout: float = 5.0) -> None:
+    """POST one trace to an OTLP/HTTP JSON collector, e.g. `http://localhost:4318/v1/traces`."""
+    import aiohttp
+
+    try:
+        async with (
+            aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session,
+            session.post(endpoint, json=trace.to_otlp(service_name)) as response,
+        ):
+            if response.status >= 400:
+                logger.debug("Trace export rejected with HTTP %s", response.status)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as exc:  # pragma: no cover - best effort
+        logger.debug("Trace export failed: %s", exc)
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict]:
+    converted = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        converted.append({"key": key, "value": typed})
+    return converted
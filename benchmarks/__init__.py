@@ -0,0 +1 @@
+"""Offline load and micro benchmarks (not shipped in the wheel)."""
@@ -0,0 +1,303 @@
+"""Offline end-to-end load test for the FastAPI app.
+
+Starts the upstream stubs and a real uvicorn server pointed at them, drives
+`POST /api/search` in sync (JSON) and SSE modes at a fixed concurrency, and
+saves a JSON report that later runs can be compared against.
+
+    python -m benchmarks.load --concurrency 16 --requests 200 --label baseline
+    python -m benchmarks.load --label candidate --compare benchmarks/results/baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+
+from benchmarks.stubs import add_stub_arguments, stub_config_from_args
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+ENGINES = ("duckduckgo", "google", "bing", "brave")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def app_environment(stub_url: str, args: argparse.Namespace) -> dict[str, str]:
+    env = dict(os.environ)
+    env.update(
+        {
+            "SEARCH_ENGINES": json.dumps(args.engines),
+            "DUCKDUCKGO_BASE_URL": f"{stub_url}/ddg/html/",
+            "GOOGLE_BASE_URL": f"{stub_url}/google",
+            "GOOGLE_API_KEY": "bench",
+            "GOOGLE_CX_ID": "bench",
+            "BING_BASE_URL": f"{stub_url}/bing",
+            "BING_API_KEY": "bench",
+            "BRAVE_BASE_URL": f"{stub_url}/brave",
+            "BRAVE_API_KEY": "bench",
+            "ARXIV_BASE_URL": f"{stub_url}/arxiv",
+            "ARXIV_MIN_INTERVAL_SECONDS": "0",
+            "ARXIV_RATE_LIMIT_SHARED": "false",
+            "LLM_PROVIDER": "custom",
+            "LLM_BASE_URL": f"{stub_url}/v1",
+            "LLM_API_KEY": "bench",
+            "LLM_API_KEY_FILE": "",
+            "LLM_MODEL": "stub-model",
+            "RERANKER_ENABLED": str(args.reranker).lower(),
+            "CACHE_ENABLED": str(args.cache).lower(),
+        }
+    )
+    return env
+
+
+async def wait_ready(url: str, process: asyncio.subprocess.Process, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            if process.returncode is not None:
+                raise RuntimeError(
+                    f"{url} exited with code {process.returncode} before becoming ready"
+                )
+            try:
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.1)
+    raise TimeoutError(f"{url} was not ready within {timeout:.0f}s")
+
+
+async def one_request(
+    session: aiohttp.ClientSession, base_url: str, body: dict, stream: bool
+) -> dict:
+    started = time.perf_counter()
+    ttfb = first_chunk = None
+    async with session.post(f"{base_url}/api/search", json={**body, "stream": stream}) as response:
+        status = response.status
+        buffer = b""
+        async for data in response.content.iter_any():
+            now = time.perf_counter()
+            if ttfb is None:
+                ttfb = now - started
+            if stream and first_chunk is None:
+                buffer += data
+                if b"event: answer_chunk" in buffer:
+                    first_chunk = now - started
+                    buffer = b""
+                else:
+                    # Keep just enough of the tail to catch an event name split across reads.
+                    buffer = buffer[-32:]
+    latency = time.perf_counter() - started
+    if not stream:
+        # A JSON response carries the whole answer, so its first answer text arrives with the body.
+        first_chunk = latency
+    return {
+        "status": status,
+        "latency": latency,
+        "ttfb": ttfb or latency,
+        "first_chunk": first_chunk,
+    }
+
+
+async def drive(base_url: str, args: argparse.Namespace, stream: bool) -> dict:
+    bodies = [
+        {
+            "query": f"benchmark query {index % args.distinct_queries}",
+            "mode": args.mode,
+            "max_sources": args.max_sources,
+        }
+        for index in range(args.requests + args.warmup)
+    ]
+    samples: list[dict] = []
+    errors = 0
+    cursor = 0
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    timeout = aiohttp.ClientTimeout(total=args.request_timeout)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        for body in bodies[: args.warmup]:
+            await one_request(session, base_url, body, stream)
+
+        async def worker() -> None:
+            nonlocal cursor, errors
+            while cursor < len(bodies):
+                body = bodies[cursor]
+                cursor += 1
+                try:
+                    sample = await one_request(session, base_url, body, stream)
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    errors += 1
+                    continue
+                if sample["status"] != 200:
+                    errors += 1
+                    continue
+                samples.append(sample)
+
+        cursor = args.warmup
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        wall = time.perf_counter() - started
+
+    return summarize(samples, errors, wall)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(samples: list[dict], errors: int, wall: float) -> dict:
+    summary: dict[str, float | int] = {
+        "completed": len(samples),
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "rps": round(len(samples) / wall, 2) if wall else 0.0,
+    }
+    for field in ("latency", "ttfb", "first_chunk"):
+        values = [sample[field] for sample in samples if sample[field] is not None]
+        for name, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+            summary[f"{field}_{name}_ms"] = round(percentile(values, fraction) * 1000, 1)
+    return summary
+
+
+def compare(current: dict, baseline: dict) -> list[str]:
+    lines = [
+        f"Comparison against {baseline.get('label', 'baseline')} ({baseline.get('git_rev', '?')})"
+    ]
+    for mode, metrics in current["results"].items():
+        previous = baseline.get("results", {}).get(mode)
+        if not previous:
+            continue
+        lines.append(f"[{mode}]")
+        for key, value in metrics.items():
+            old = previous.get(key)
+            if not isinstance(value, (int, float)) or not old:
+                continue
+            change = (value - old) / old * 100
+            lines.append(f"  {key:<22} {old:>10} -> {value:>10} ({change:+.1f}%)")
+    return lines
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(args: argparse.Namespace) -> dict:
+    stub_port = args.stub_port or free_port()
+    app_port = args.app_port or free_port()
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    app_url = f"http://127.0.0.1:{app_port}"
+
+    stub_args = [
+        f"--{name.replace('_', '-')}={value}"
+        for name, value in vars(stub_config_from_args(args)).items()
+    ]
+    stubs = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "benchmarks.stubs", "--port", str(stub_port), *stub_args
+    )
+    server = None
+    try:
+        await wait_ready(f"{stub_url}/health", stubs)
+        server = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "backend.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(app_port),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+            env=app_environment(stub_url, args),
+            stderr=None if args.app_logs else asyncio.subprocess.DEVNULL,
+        )
+        await wait_ready(f"{app_url}/api/health", server)
+
+        results = {}
+        for transport in args.transports:
+            results[transport] = await drive(app_url, args, stream=transport == "sse")
+    finally:
+        for process in (server, stubs):
+            if process is not None and process.returncode is None:
+                process.terminate()
+                await process.wait()
+
+    return {
+        "label": args.label,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_rev": git_revision(),
+        "config": {
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "mode": args.mode,
+            "engines": args.engines,
+            "max_sources": args.max_sources,
+            "reranker": args.reranker,
+            "cache": args.cache,
+            "stubs": vars(stub_config_from_args(args)),
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline load test for /api/search")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100, help="Measured requests per transport")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--distinct-queries", type=int, default=50)
+    parser.add_argument("--mode", default="quick", choices=["quick", "deep", "academic", "arxiv"])
+    parser.add_argument("--max-sources", type=int, default=6)
+    parser.add_argument("--engines", type=lambda value: value.split(","), default=list(ENGINES))
+    parser.add_argument(
+        "--transports", type=lambda value: value.split(","), default=["sync", "sse"]
+    )
+    parser.add_argument("--reranker", action="store_true", help="Load the cross-encoder")
+    parser.add_argument("--cache", action="store_true", help="Keep the response cache enabled")
+    parser.add_argument("--request-timeout", type=float, default=120.0)
+    parser.add_argument("--stub-port", type=int, default=0)
+    parser.add_argument("--app-port", type=int, default=0)
+    parser.add_argument("--app-logs", action="store_true", help="Show the server's log output")
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--output-dir", type=Path, default=RESULTS_DIR)
+    parser.add_argument("--compare", type=Path, help="Earlier report to diff against")
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    path = args.output_dir / f"{args.label}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    print(json.dumps(report["results"], indent=2))
+    print(f"Saved {path}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        print("\n".join(compare(report, baseline)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Memory footprint of a multi-worker server, with and without pre-fork preloading.
+
+Starts the app in each serving mode against the upstream stubs, sends a few warm-up searches,
+then sums proportional set size (PSS) over the whole process tree from /proc (Linux only).
+PSS splits each shared page between the processes mapping it, so it is the number that shows
+copy-on-write savings. Summed RSS counts shared pages once per process.
+
+    python -m benchmarks.memory --workers 4
+    python -m benchmarks.memory --workers 4 --reranker --modes spawn,preload
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+
+from benchmarks.load import (
+    ENGINES,
+    RESULTS_DIR,
+    app_environment,
+    free_port,
+    git_revision,
+    wait_ready,
+)
+from benchmarks.stubs import add_stub_arguments, stub_config_from_args
+
+PROC = Path("/proc")
+SERVE = "from backend.main import run_cli; run_cli()"
+MODES = ("spawn", "fork", "preload")
+
+
+def command(mode: str, port: int, workers: int) -> list[str]:
+    if mode == "spawn":
+        # uvicorn's own multi-process mode: every worker is a fresh interpreter.
+        return [
+            sys.executable, "-m", "uvicorn", "backend.main:app",
+            "--port", str(port), "--workers", str(workers),
+        ]  # fmt: skip
+    preload = "--preload" if mode == "preload" else "--no-preload"
+    return [
+        sys.executable, "-c", SERVE, "serve",
+        "--port", str(port), "--workers", str(workers), preload,
+    ]  # fmt: skip
+
+
+def descendants(root: int) -> list[int]:
+    parents: dict[int, int] = {}
+    for stat in PROC.glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        parents[int(stat.parent.name)] = int(fields[1])
+    found = [root]
+    for pid in found:
+        found.extend(child for child, parent in parents.items() if parent == pid)
+    return found
+
+
+def smaps(pid: int) -> dict[str, int]:
+    """Rss, Pss and private bytes of one process, from /proc/<pid>/smaps_rollup."""
+    values = {}
+    for line in (PROC / str(pid) / "smaps_rollup").read_text().splitlines()[1:]:
+        key, _, rest = line.partition(":")
+        values[key] = int(rest.split()[0]) * 1024
+    return {
+        "rss": values.get("Rss", 0),
+        "pss": values.get("Pss", 0),
+        "private": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0),
+    }
+
+
+async def wait_for_workers(root: int, minimum: int, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while len(descendants(root)) < minimum:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"fewer than {minimum} processes after {timeout:.0f}s")
+        await asyncio.sleep(0.2)
+
+
+async def measure(mode: str, stub_url: str, args: argparse.Namespace) -> dict:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = await asyncio.create_subprocess_exec(
+        *command(mode, port, args.workers),
+        env=app_environment(stub_url, args),
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=None if args.app_logs else asyncio.subprocess.DEVNULL,
+    )
+    try:
+        await wait_for_workers(server.pid, args.workers + 1)
+        await wait_ready(f"{base_url}/api/ready", server)
+        # Fresh connections sent together, so the warm-up spreads across workers.
+        connector = aiohttp.TCPConnector(force_close=True)
+        async with aiohttp.ClientSession(connector=connector) as session:
+
+            async def search(index: int) -> None:
+                body = {"query": f"memory benchmark {index}", "mode": args.mode, "stream": False}
+                async with session.post(f"{base_url}/api/search", json=body) as response:
+                    await response.read()
+
+            await asyncio.gather(*(search(index) for index in range(args.requests)))
+        await asyncio.sleep(args.settle)
+
+        processes = {}
+        for pid in descendants(server.pid):
+            try:
+                processes[pid] = smaps(pid)
+            except (OSError, ValueError):
+                continue
+    finally:
+        if server.returncode is None:
+            server.terminate()
+            await server.wait()
+
+    mib = 1024 * 1024
+    workers = [usage for pid, usage in processes.items() if pid != server.pid]
+    return {
+        "processes": len(processes),
+        "total_pss_mib": round(sum(usage["pss"] for usage in processes.values()) / mib, 1),
+        "total_rss_mib": round(sum(usage["rss"] for usage in processes.values()) / mib, 1),
+        "worker_private_mib": [round(usage["private"] / mib, 1) for usage in workers],
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    stub_port = free_port()
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    stub_args = [
+        f"--{name.replace('_', '-')}={value}"
+        for name, value in vars(stub_config_from_args(args)).items()
+    ]
+    stubs = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "benchmarks.stubs", "--port", str(stub_port), *stub_args
+    )
+    results = {}
+    try:
+        await wait_ready(f"{stub_url}/health", stubs)
+        for mode in args.modes:
+            results[mode] = await measure(mode, stub_url, args)
+    finally:
+        if stubs.returncode is None:
+            stubs.terminate()
+            await stubs.wait()
+
+    return {
+        "label": args.label,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_rev": git_revision(),
+        "config": {
+            "workers": args.workers,
+            "requests": args.requests,
+            "mode": args.mode,
+            "reranker": args.reranker,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare multi-worker memory by serving mode")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--modes",
+        type=lambda value: value.split(","),
+        default=list(MODES),
+        help="spawn (uvicorn --workers), fork (serve --no-preload), preload (serve --preload)",
+    )
+    parser.add_argument("--requests", type=int, default=20, help="Warm-up searches before sampling")
+    parser.add_argument("--settle", type=float, default=1.0, help="Seconds to wait before sampling")
+    parser.add_argument("--mode", default="quick", choices=["quick", "deep", "academic", "arxiv"])
+    parser.add_argument("--engines", type=lambda value: value.split(","), default=list(ENGINES))
+    parser.add_argument("--reranker", action="store_true", help="Enable the cross-encoder")
+    parser.add_argument("--cache", action="store_true")
+    parser.add_argument("--app-logs", action="store_true", help="Show the server's log output")
+    parser.add_argument("--label", default="memory")
+    parser.add_argument("--output-dir", type=Path, default=RESULTS_DIR)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    if not (PROC / "self" / "smaps_rollup").exists():
+        parser.error("needs Linux /proc/<pid>/smaps_rollup")
+    unknown = [mode for mode in args.modes if mode not in MODES]
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(unknown)}")
+
+    report = asyncio.run(run(args))
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    path = args.output_dir / f"{args.label}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(json.dumps(report["results"], indent=2))
+    print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""Component micro-benchmarks over a checked-in synthetic corpus.
+
+Each benchmark times one hot-path component in isolation and reports
+operations per second plus per-operation allocations (via tracemalloc).
+The inputs in `synthetic_corpus/` are generated, not captured from real
+sites, so the numbers are for spotting regressions between revisions,
+not for predicting throughput on real pages.
+
+Save a run as a baseline and later fail on regressions:
+
+    python -m benchmarks.micro --save benchmarks/results/micro-baseline.json
+    python -m benchmarks.micro --baseline benchmarks/results/micro-baseline.json --threshold 0.15
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+CORPUS_DIR = Path(__file__).resolve().parent / "synthetic_corpus"
+
+Operation = Callable[[], object]
+
+
+@dataclass
+class BenchResult:
+    name: str
+    ops_per_sec: float
+    rounds: list[float]
+    alloc_peak_kb: float
+    alloc_blocks: int
+    skipped: str | None = None
+
+
+def corpus(kind: str) -> list[str]:
+    return [path.read_text(encoding="utf-8") for path in sorted((CORPUS_DIR / kind).iterdir())]
+
+
+def bench_extractor() -> Operation:
+    from backend.content.extractor import ContentExtractor
+
+    extractor = ContentExtractor()
+    pages = corpus("html")
+    return lambda: [extractor.extract(html) for html in pages]
+
+
+def bench_reranker() -> Operation | str:
+    from backend.models.reranker import Reranker
+
+    reranker = Reranker()
+    reranker.settings = reranker.settings.model_copy(update={"reranker_enabled": True})
+    if not reranker.load():
+        return "reranker model unavailable (install the `reranker` extra)"
+    items = [
+        {"title": f"Result {index}", "content": text[:2000]}
+        for index, text in enumerate(corpus("html") * 3)
+    ]
+    return lambda: reranker.rerank("how to reduce retrieval latency", items, top_k=6)
+
+
+def bench_arxiv_parse_feed() -> Operation:
+    from backend.arxiv.client import ArxivClient
+
+    client = ArxivClient()
+    feeds = corpus("atom")
+    return lambda: [client._parse_feed(xml) for xml in feeds]
+
+
+def bench_arxiv_rank_papers() -> Operation:
+    from backend.arxiv.client import ArxivClient
+
+    client = ArxivClient()
+    papers = [paper for xml in corpus("atom") for paper in client._parse_feed(xml)]
+    return lambda: client.rank_papers(papers, "transformer attention inference latency")
+
+
+def bench_duckduckgo_parse() -> Operation:
+    from backend.search.duckduckgo import DuckDuckGoSearchEngine
+
+    engine = DuckDuckGoSearchEngine()
+    pages = corpus("ddg")
+    return lambda: [engine.parse_results(html, max_results=30) for html in pages]
+
+
+def bench_build_user_prompt() -> Operation:
+    from backend.content.extractor import ContentExtractor
+    from backend.llm.prompts import build_user_prompt
+
+    extractor = ContentExtractor()
+    sources = [
+        {
+            "title": f"Source {index}",
+            "url": f"https://example.com/{index}",
+            "snippet": text[:300],
+            "content": extractor.extract(text),
+        }
+        for index, text in enumerate(corpus("html") * 2)
+    ]
+    return lambda: build_user_prompt("how to reduce retrieval latency", sources)
+
+
+def bench_near_duplicates() -> Operation:
+    from backend.content.dedupe import NearDuplicateCollapser
+    from backend.content.extractor import ContentExtractor
+
+    extractor = ContentExtractor()
+    collapser = NearDuplicateCollapser()
+    texts = [extractor.extract(html) for html in corpus("html")]
+    # Each page once as itself and twice as a mirror with different boilerplate around it.
+    items = [
+        {"url": f"https://site{copy}.example/{index}", "content": f"Mirror {copy}. {text}"}
+        for copy in range(3)
+        for index, text in enumerate(texts)
+    ]
+    return lambda: collapser.collapse(items)
+
+
+def bench_ttl_cache() -> Operation:
+    from backend.utils.cache import TTLCache
+
+    cache = TTLCache(ttl_seconds=3600, max_size=1024)
+    keys = [f"query:{index}:quick:6:en" for index in range(2048)]
+    value = {"answer": "cached"}
+
+    def operation() -> None:
+        # Half the keys overflow max_size, so this also exercises LRU eviction.
+        for key in keys:
+            if cache.get(key) is None:
+                cache.set(key, value)
+
+    return operation
+
+
+BENCHMARKS: dict[str, Callable[[], Operation | str]] = {
+    "extractor": bench_extractor,
+    "reranker": bench_reranker,
+    "arxiv_parse_feed": bench_arxiv_parse_feed,
+    "arxiv_rank_papers": bench_arxiv_rank_papers,
+    "duckduckgo_parse": bench_duckduckgo_parse,
+    "build_user_prompt": bench_build_user_prompt,
+    "near_duplicates": bench_near_duplicates,
+    "ttl_cache": bench_ttl_cache,
+}
+
+
+def measure(name: str, rounds: int, min_time: float) -> BenchResult:
+    prepared = BENCHMARKS[name]()
+    if isinstance(prepared, str):
+        return BenchResult(name, 0.0, [], 0.0, 0, skipped=prepared)
+    operation = prepared
+
+    # Warm caches and lazy imports, then size a round to last at least `min_time`.
+    operation()
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            operation()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed < min_time / 4 else 1 + int(min_time / max(elapsed, 1e-9))
+
+    samples: list[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(loops):
+            operation()
+        samples.append(loops / (time.perf_counter() - started))
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(max(0, stat.count_diff) for stat in after.compare_to(before, "lineno"))
+
+    return BenchResult(
+        name=name,
+        ops_per_sec=round(statistics.median(samples), 2),
+        rounds=[round(sample, 2) for sample in samples],
+        alloc_peak_kb=round(peak / 1024, 1),
+        alloc_blocks=blocks,
+    )
+
+
+def regressions(results: list[BenchResult], baseline: dict, threshold: float) -> list[str]:
+    previous = {item["name"]: item for item in baseline.get("results", [])}
+    failures = []
+    for result in results:
+        old = previous.get(result.name)
+        if result.skipped or not old or old.get("skipped"):
+            continue
+        if result.ops_per_sec < old["ops_per_sec"] * (1 - threshold):
+            failures.append(f"{result.name}: {old['ops_per_sec']} -> {result.ops_per_sec} ops/sec")
+        if old["alloc_peak_kb"] and result.alloc_peak_kb > old["alloc_peak_kb"] * (1 + threshold):
+            failures.append(
+                f"{result.name}: peak allocation {old['alloc_peak_kb']} -> "
+                f"{result.alloc_peak_kb} KiB"
+            )
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run component micro-benchmarks")
+    parser.add_argument("names", nargs="*", help=f"Subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per round")
+    parser.add_argument("--save", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Earlier --save output to check against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="Allowed fractional slowdown or allocation growth before failing",
+    )
+    args = parser.parse_args()
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    results = []
+    for name in args.names or list(BENCHMARKS):
+        result = measure(name, args.rounds, args.min_time)
+        results.append(result)
+        if result.skipped:
+            print(f"{name:<20} skipped: {result.skipped}")
+        else:
+            print(
+                f"{name:<20} {result.ops_per_sec:>12,.1f} ops/s"
+                f"  peak {result.alloc_peak_kb:>9,.1f} KiB  {result.alloc_blocks:>7} blocks"
+            )
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "corpus": "synthetic",
+            "results": [asdict(result) for result in results],
+        }
+        args.save.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        failures = regressions(results, baseline, args.threshold)
+        if failures:
+            print(f"Regressions beyond {args.threshold:.0%}:")
+            print("\n".join(f"  {line}" for line in failures))
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Cold-start benchmark: import time, time to ready and first-request latency.
+
+Each run spawns a fresh interpreter, so nothing is shared between runs:
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --runs 5 --preload --label preload
+    python -m benchmarks.startup --profile 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+
+from benchmarks.load import (
+    ENGINES,
+    RESULTS_DIR,
+    app_environment,
+    free_port,
+    git_revision,
+    wait_ready,
+)
+from benchmarks.stubs import add_stub_arguments, stub_config_from_args
+
+IMPORT_PROBE = (
+    "import time; started = time.perf_counter(); import backend.main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+async def measure_import(env: dict[str, str]) -> float:
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-c", IMPORT_PROBE, env=env, stdout=asyncio.subprocess.PIPE
+    )
+    stdout, _ = await process.communicate()
+    if process.returncode:
+        raise RuntimeError("importing backend.main failed")
+    return float(stdout.decode().strip())
+
+
+async def measure_server(stub_url: str, args: argparse.Namespace) -> dict[str, float]:
+    env = app_environment(stub_url, args)
+    env["STARTUP_PRELOAD"] = str(args.preload).lower()
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+
+    started = time.perf_counter()
+    server = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "backend.main:app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--log-level",
+        "warning",
+        env=env,
+        stderr=None if args.app_logs else asyncio.subprocess.DEVNULL,
+    )
+    try:
+        await wait_ready(f"{base_url}/api/live", server)
+        live = time.perf_counter() - started
+        await wait_ready(f"{base_url}/api/ready", server)
+        ready = time.perf_counter() - started
+
+        body = {"query": "cold start benchmark", "mode": args.mode, "stream": False}
+        async with aiohttp.ClientSession() as session:
+            request_started = time.perf_counter()
+            async with session.post(f"{base_url}/api/search", json=body) as response:
+                await response.read()
+                if response.status != 200:
+                    raise RuntimeError(f"first request failed with HTTP {response.status}")
+            first_request = time.perf_counter() - request_started
+    finally:
+        if server.returncode is None:
+            server.terminate()
+            await server.wait()
+
+    return {"live_seconds": live, "ready_seconds": ready, "first_request_seconds": first_request}
+
+
+async def run(args: argparse.Namespace) -> dict:
+    stub_port = free_port()
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    stub_args = [
+        f"--{name.replace('_', '-')}={value}"
+        for name, value in vars(stub_config_from_args(args)).items()
+    ]
+    stubs = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "benchmarks.stubs", "--port", str(stub_port), *stub_args
+    )
+    samples: dict[str, list[float]] = {}
+    try:
+        await wait_ready(f"{stub_url}/health", stubs)
+        for _ in range(args.runs):
+            samples.setdefault("import_seconds", []).append(
+                await measure_import(app_environment(stub_url, args))
+            )
+            for key, value in (await measure_server(stub_url, args)).items():
+                samples.setdefault(key, []).append(value)
+    finally:
+        if stubs.returncode is None:
+            stubs.terminate()
+            await stubs.wait()
+
+    results = {
+        key: {
+            "median": round(statistics.median(values), 4),
+            "max": round(max(values), 4),
+            "runs": [round(value, 4) for value in values],
+        }
+        for key, values in samples.items()
+    }
+    return {
+        "label": args.label,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_rev": git_revision(),
+        "config": {"runs": args.runs, "preload": args.preload, "mode": args.mode},
+        "results": results,
+    }
+
+
+def import_profile(limit: int) -> list[tuple[float, str]]:
+    """Top imports of `backend.main` by cumulative time, from `python -X importtime`."""
+    import subprocess
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line.split(":", 1)[1].split("|"))
+        rows.append((int(cumulative) / 1e6, name))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure cold-start time of the API server")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--preload", action="store_true", help="Set STARTUP_PRELOAD=true")
+    parser.add_argument("--mode", default="quick", choices=["quick", "deep", "academic", "arxiv"])
+    parser.add_argument("--engines", type=lambda value: value.split(","), default=list(ENGINES))
+    parser.add_argument("--reranker", action="store_true", help="Enable the cross-encoder")
+    parser.add_argument("--cache", action="store_true")
+    parser.add_argument("--app-logs", action="store_true", help="Show the server's log output")
+    parser.add_argument("--profile", type=int, metavar="N", help="Only print the N slowest imports")
+    parser.add_argument("--label", default="startup")
+    parser.add_argument("--output-dir", type=Path, default=RESULTS_DIR)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    if args.profile:
+        for seconds, name in import_profile(args.profile):
+            print(f"{seconds * 1000:>9.1f} ms  {name}")
+        return
+
+    report = asyncio.run(run(args))
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    path = args.output_dir / f"{args.label}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(json.dumps(report["results"], indent=2))
+    print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    main()
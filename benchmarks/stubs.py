@@ -0,0 +1,307 @@
+"""Local stand-ins for every upstream the backend calls.
+
+One aiohttp app serves DuckDuckGo HTML, Google/Bing/Brave JSON, article pages,
+the arXiv Atom API and an OpenAI-compatible chat endpoint, each with a
+configurable latency distribution, so load tests run offline and repeatably.
+
+    python -m benchmarks.stubs --port 9100 --page-latency-ms 120
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from dataclasses import asdict, dataclass
+from html import escape
+
+from aiohttp import web
+
+WORDS = (
+    "search",
+    "retrieval",
+    "ranking",
+    "latency",
+    "throughput",
+    "index",
+    "query",
+    "document",
+    "model",
+    "evidence",
+    "citation",
+    "source",
+    "answer",
+    "pipeline",
+    "cache",
+    "network",
+    "protocol",
+    "vector",
+    "embedding",
+    "dataset",
+    "benchmark",
+    "analysis",
+    "method",
+    "result",
+    "system",
+    "performance",
+    "memory",
+    "token",
+    "stream",
+    "server",
+)
+
+
+@dataclass
+class StubConfig:
+    seed: int = 7
+    results_per_query: int = 8
+    page_pool: int = 200
+    engine_latency_ms: float = 80.0
+    page_latency_ms: float = 120.0
+    latency_sigma: float = 0.5
+    page_size_kb_min: float = 8.0
+    page_size_kb_max: float = 120.0
+    arxiv_latency_ms: float = 150.0
+    arxiv_entries: int = 24
+    llm_ttft_ms: float = 300.0
+    llm_tokens: int = 120
+    llm_token_interval_ms: float = 8.0
+
+
+class Upstreams:
+    def __init__(self, config: StubConfig) -> None:
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.base_url = ""
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/health", self.health)
+        app.router.add_get("/ddg/html/", self.duckduckgo)
+        app.router.add_post("/ddg/html/", self.duckduckgo)
+        app.router.add_get("/google", self.google)
+        app.router.add_get("/bing", self.bing)
+        app.router.add_get("/brave", self.brave)
+        app.router.add_get("/pages/{page_id}", self.page)
+        app.router.add_get("/arxiv", self.arxiv)
+        app.router.add_post("/v1/chat/completions", self.chat)
+        return app
+
+    async def delay(self, median_ms: float) -> None:
+        if median_ms > 0:
+            await asyncio.sleep(
+                self.rng.lognormvariate(0.0, self.config.latency_sigma) * median_ms / 1000
+            )
+
+    def hits(self, query: str, engine: str) -> list[dict]:
+        # Engines draw from one page pool per query, so results overlap and exercise dedupe.
+        digest = int(hashlib.sha1(f"{query}|{engine}".encode()).hexdigest(), 16)
+        local = random.Random(digest)
+        shared = random.Random(int(hashlib.sha1(query.encode()).hexdigest(), 16))
+        pool = shared.sample(range(self.config.page_pool), k=self.config.results_per_query * 2)
+        picked = local.sample(pool, k=self.config.results_per_query)
+        return [
+            {
+                "title": f"{query.title()} result {page_id}",
+                "url": f"{self.base_url}/pages/{page_id}",
+                "snippet": render_words(local, 30),
+            }
+            for page_id in picked
+        ]
+
+    async def health(self, _request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok", "config": asdict(self.config)})
+
+    async def duckduckgo(self, request: web.Request) -> web.Response:
+        await self.delay(self.config.engine_latency_ms)
+        query = request.query.get("q") or (await request.post()).get("q", "")
+        return web.Response(
+            text=render_ddg_page(self.hits(str(query), "ddg")), content_type="text/html"
+        )
+
+    async def google(self, request: web.Request) -> web.Response:
+        await self.delay(self.config.engine_latency_ms)
+        items = [
+            {"title": hit["title"], "link": hit["url"], "snippet": hit["snippet"]}
+            for hit in self.hits(request.query.get("q", ""), "google")
+        ]
+        return web.json_response({"items": items})
+
+    async def bing(self, request: web.Request) -> web.Response:
+        await self.delay(self.config.engine_latency_ms)
+        rows = [
+            {"name": hit["title"], "url": hit["url"], "snippet": hit["snippet"]}
+            for hit in self.hits(request.query.get("q", ""), "bing")
+        ]
+        return web.json_response({"webPages": {"value": rows}})
+
+    async def brave(self, request: web.Request) -> web.Response:
+        await self.delay(self.config.engine_latency_ms)
+        rows = [
+            {"title": hit["title"], "url": hit["url"], "description": hit["snippet"]}
+            for hit in self.hits(request.query.get("q", ""), "brave")
+        ]
+        return web.json_response({"web": {"results": rows}})
+
+    async def page(self, request: web.Request) -> web.Response:
+        await self.delay(self.config.page_latency_ms)
+        page_id = int(request.match_info["page_id"])
+        local = random.Random(page_id)
+        size_kb = local.uniform(self.config.page_size_kb_min, self.config.page_size_kb_max)
+        return web.Response(
+            text=render_article(local, f"Result {page_id}", int(size_kb * 1024)),
+            content_type="text/html",
+        )
+
+    async def arxiv(self, request: web.Request) -> web.Response:
+        await self.delay(self.config.arxiv_latency_ms)
+        count = min(int(request.query.get("max_results", "10")), self.config.arxiv_entries)
+        start = int(request.query.get("start", "0"))
+        local = random.Random(request.query.get("search_query", ""))
+        return web.Response(
+            text=render_feed(local, start, count), content_type="application/atom+xml"
+        )
+
+    async def chat(self, request: web.Request) -> web.StreamResponse:
+        payload = await request.json()
+        model = payload.get("model", "stub-model")
+        tokens = [f"{word} " for word in render_words(self.rng, self.config.llm_tokens).split()]
+        await self.delay(self.config.llm_ttft_ms)
+
+        if not payload.get("stream"):
+            await asyncio.sleep(self.config.llm_tokens * self.config.llm_token_interval_ms / 1000)
+            return web.json_response(
+                {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": "".join(tokens) + "[1]"},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": 0,
+                        "completion_tokens": len(tokens),
+                        "total_tokens": len(tokens),
+                    },
+                }
+            )
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for index, token in enumerate(tokens):
+            if index:
+                await asyncio.sleep(self.config.llm_token_interval_ms / 1000)
+            chunk = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+
+def render_words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def render_ddg_page(hits: list[dict]) -> str:
+    results = "".join(
+        f"""
+<div class="result results_links web-result">
+  <div class="links_main result__body">
+    <h2 class="result__title"><a rel="nofollow" class="result__a" href="{escape(hit["url"])}">{escape(hit["title"])}</a></h2>
+    <a class="result__snippet" href="{escape(hit["url"])}">{escape(hit["snippet"])}</a>
+  </div>
+</div>"""
+        for hit in hits
+    )
+    return f'<html><head><title>DuckDuckGo</title></head><body><div id="links">{results}</div></body></html>'
+
+
+def render_article(rng: random.Random, title: str, size_bytes: int) -> str:
+    paragraphs: list[str] = []
+    total = 0
+    while total < size_bytes:
+        sentences = [
+            render_words(rng, rng.randint(8, 24)).capitalize() + "."
+            for _ in range(rng.randint(3, 7))
+        ]
+        paragraph = f"<p>{' '.join(sentences)}</p>"
+        paragraphs.append(paragraph)
+        total += len(paragraph)
+    return (
+        f"<html><head><title>{escape(title)}</title><script>var tracking = 1;</script></head><body>"
+        f"<nav><a href='/'>Home</a> <a href='/about'>About</a></nav>"
+        f"<article><h1>{escape(title)}</h1>{''.join(paragraphs)}</article>"
+        "<footer>Copyright benchmark stub</footer></body></html>"
+    )
+
+
+def render_feed(rng: random.Random, start: int, count: int) -> str:
+    entries = []
+    for offset in range(count):
+        arxiv_id = f"2405.{start + offset + 1:05d}"
+        day = 1 + (start + offset) % 28
+        entries.append(
+            f"""
+  <entry>
+    <id>http://arxiv.org/abs/{arxiv_id}v1</id>
+    <updated>2024-05-{day:02d}T00:00:00Z</updated>
+    <published>2024-05-{day:02d}T00:00:00Z</published>
+    <title>{render_words(rng, 8).title()}</title>
+    <summary>{render_words(rng, 150)}</summary>
+    <author><name>Ada Lovelace</name></author>
+    <author><name>Alan Turing</name></author>
+    <arxiv:comment>12 pages, code at https://github.com/example/{arxiv_id}</arxiv:comment>
+    <arxiv:primary_category term="cs.LG"/>
+    <category term="cs.LG"/>
+    <category term="cs.CL"/>
+    <link href="http://arxiv.org/abs/{arxiv_id}v1" rel="alternate" type="text/html"/>
+    <link href="http://arxiv.org/pdf/{arxiv_id}v1" rel="related" title="pdf" type="application/pdf"/>
+  </entry>"""
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom" '
+        'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">'
+        f"<opensearch:totalResults>{start + count}</opensearch:totalResults>"
+        f"{''.join(entries)}\n</feed>\n"
+    )
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = StubConfig()
+    for name, value in asdict(defaults).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(value), default=value)
+
+
+def stub_config_from_args(args: argparse.Namespace) -> StubConfig:
+    return StubConfig(**{name: getattr(args, name) for name in asdict(StubConfig())})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve offline upstream stand-ins for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", default=9100, type=int)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    upstreams = Upstreams(stub_config_from_args(args))
+    upstreams.base_url = f"http://{args.host}:{args.port}"
+    web.run_app(upstreams.build_app(), host=args.host, port=args.port, print=None, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
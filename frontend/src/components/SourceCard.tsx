@@ -129,6 +129,11 @@ export function SourceCard({ source, index, viewMode = 'grid' }: SourceCardProps
       </p>
       <h4 className="mt-2 line-clamp-2 text-base font-semibold text-ink transition group-hover:text-ember">{source.title}</h4>
       <p className="mt-2 line-clamp-3 text-sm text-ink/74">{source.snippet}</p>
+      {source.alternate_urls?.length ? (
+        <p className="mt-2 line-clamp-1 text-xs text-ink/60">
+          Also at {source.alternate_urls.map(formatHost).join(', ')}
+        </p>
+      ) : null}
     </a>
   );
 }
@@ -122,6 +122,10 @@ export function useSearch() {
         { query, mode, max_sources: 6, language: 'en', llm_config: llmConfig },
         {
           onEvent: (event, data) => {
+            if (event === 'search_results') {
+              setState((prev) => ({ ...prev, sources: prev.sources.length ? prev.sources : data.items || [] }));
+              return;
+            }
             if (event === 'sources') {
               setState((prev) => ({ ...prev, sources: data.items || [] }));
               return;
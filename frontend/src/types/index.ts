@@ -25,6 +25,7 @@ export interface SearchSource {
   limitations?: string;
   reproduction_difficulty?: string;
   code_repo_url?: string;
+  alternate_urls?: string[];
 }
 
 export interface SearchResponse {
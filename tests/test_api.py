@@ -1,6 +1,17 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+import pytest
 from fastapi.testclient import TestClient
 
-from backend.main import app
+from backend.main import app, get_pipeline, pipeline
+from backend.models import reranker as reranker_module
+from backend.utils.admission import AdmissionController
+from backend.utils.metrics import MetricsRegistry, metrics
+from backend.utils.ratelimit import RateLimitError
 
 
 client = TestClient(app)
@@ -14,9 +25,137 @@ def test_health_endpoint():
     assert "version" in payload
 
 
+def test_ready_follows_lifespan_while_live_always_answers():
+    assert client.get("/api/live").json() == {"status": "alive"}
+    assert client.get("/api/ready").status_code == 503
+
+    with TestClient(app) as started:
+        response = started.get("/api/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+        assert metrics.gauge("autosearch_startup_seconds", phase="init") >= 0
+
+
+def test_importing_app_defers_heavy_dependencies():
+    code = (
+        "import sys, backend.main as m; "
+        "print(sorted(n for n in ('aiohttp', 'bs4', 'lxml') if n in sys.modules), m._pipeline)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[] None"
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="pre-fork serving needs os.fork")
+def test_forked_worker_rebuilds_pipeline_but_shares_reranker_weights(monkeypatch):
+    weights = object()
+    monkeypatch.setitem(reranker_module._models, pipeline.settings.reranker_model, weights)
+
+    pid = os.fork()
+    if pid == 0:
+        child = get_pipeline()
+        child.reranker.settings = child.reranker.settings.model_copy(
+            update={"reranker_enabled": True}
+        )
+        shared = child is not pipeline and child.reranker.load() and child.reranker.model is weights
+        os._exit(0 if shared else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert get_pipeline() is pipeline
+
+
 def test_search_empty_query_validation():
     response = client.post(
         "/api/search",
         json={"query": "", "mode": "quick", "max_sources": 3, "language": "en", "stream": False},
     )
     assert response.status_code == 422
+
+
+def test_search_batch_streams_ndjson(monkeypatch):
+    async def fake_search_sync(request):
+        return {"query": request.query, "answer": "ok"}
+
+    monkeypatch.setattr(pipeline, "search_sync", fake_search_sync)
+    response = client.post(
+        "/api/search/batch",
+        json={"requests": [{"query": "a"}, {"query": "b"}]},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["result"]["query"] for line in lines) == ["a", "b"]
+
+
+def test_metrics_endpoint_exposes_prometheus_text():
+    metrics.observe("autosearch_stage_seconds", 0.02, stage="search")
+    metrics.inc("autosearch_cache_requests_total", cache="response", result="hit")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "# TYPE autosearch_stage_seconds histogram" in body
+    assert 'autosearch_stage_seconds_bucket{stage="search",le="0.025"}' in body
+    assert 'autosearch_stage_seconds_bucket{stage="search",le="+Inf"}' in body
+    assert 'autosearch_queue_depth{queue="arxiv_rate_limiter"} 0' in body
+
+
+def test_metrics_render_skips_and_logs_a_failing_gauge(caplog):
+    registry = MetricsRegistry()
+    registry.register_gauge("autosearch_good", lambda: 1)
+    registry.register_gauge("autosearch_broken", lambda: 1 / 0)
+
+    body = registry.render()
+
+    assert "autosearch_good 1" in body
+    assert "autosearch_broken" not in body
+    assert "autosearch_broken" in caplog.text
+
+
+async def test_admission_controller_queues_by_priority_and_rejects_when_full():
+    controller = AdmissionController(max_inflight=1, max_queue=2, queue_timeout=1.0)
+    first = await controller.acquire("sync")
+    order: list[str] = []
+
+    async def waiter(kind: str) -> None:
+        lease = await controller.acquire(kind)
+        order.append(kind)
+        lease.release()
+
+    batch = asyncio.create_task(waiter("batch"))
+    await asyncio.sleep(0)
+    stream = asyncio.create_task(waiter("stream"))
+    await asyncio.sleep(0)
+    assert controller.queue_depth == 2
+
+    with pytest.raises(RateLimitError) as excinfo:
+        await controller.acquire("sync")
+    assert excinfo.value.retry_after >= 1
+    assert metrics.value("autosearch_admission_rejections_total", reason="queue_full", kind="sync")
+
+    first.release()
+    await asyncio.gather(batch, stream)
+    assert order == ["stream", "batch"]
+    assert controller.in_flight == 0 and controller.queue_depth == 0
+
+
+async def test_admission_controller_times_out_waiters():
+    controller = AdmissionController(max_inflight=1, max_queue=4, queue_timeout=0.01)
+    lease = await controller.acquire()
+    with pytest.raises(RateLimitError):
+        await controller.acquire()
+    lease.release()
+    assert controller.in_flight == 0
+
+
+def test_search_returns_503_with_retry_after_when_saturated(monkeypatch):
+    saturated = AdmissionController(max_inflight=1, max_queue=0, queue_timeout=1.0)
+    saturated.in_flight = 1
+    monkeypatch.setattr(pipeline, "admission", saturated)
+
+    response = client.post("/api/search", json={"query": "busy", "stream": True})
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
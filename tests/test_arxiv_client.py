@@ -0,0 +1,288 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from backend.arxiv import ArxivClient, ArxivHarvester, ArxivIndex, PaperRanker
+from backend.arxiv.client import FeedParser
+from backend.utils.ratelimit import RateLimiter, RateLimitError
+
+
+def make_feed(entries: list[tuple[str, str]]) -> str:
+    body = "".join(
+        f"""
+  <entry>
+    <id>http://arxiv.org/abs/{arxiv_id}v1</id>
+    <updated>2024-05-02T00:00:00Z</updated>
+    <published>2024-05-01T00:00:00Z</published>
+    <title>{title}</title>
+    <summary>Abstract about {title}.</summary>
+    <author><name>Ada</name></author>
+    <arxiv:primary_category term="cs.LG"/>
+    <category term="cs.LG"/>
+    <link href="http://arxiv.org/pdf/{arxiv_id}v1" rel="related" type="application/pdf"/>
+  </entry>"""
+        for arxiv_id, title in entries
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">'
+        f"{body}</feed>"
+    )
+
+
+@pytest.fixture
+async def feed_server():
+    requests: list[dict] = []
+    corpus = [
+        ("2405.00001", "Graph neural networks"),
+        ("2405.00002", "Diffusion policies"),
+        ("2405.00003", "Graph transformers"),
+    ]
+
+    async def handler(request: web.Request) -> web.Response:
+        params = dict(request.query)
+        requests.append(params)
+        search_query = params["search_query"]
+        entries = corpus
+        if "lastUpdatedDate" in search_query and "[202405" not in search_query:
+            entries = []
+        start = int(params["start"])
+        page = entries[start : start + int(params["max_results"])]
+        return web.Response(text=make_feed(page), content_type="application/atom+xml")
+
+    app = web.Application()
+    app.router.add_get("/api/query", handler)
+    server = TestServer(app)
+    await server.start_server()
+    yield server, requests
+    await server.close()
+
+
+def make_client(server: TestServer, tmp_path, **overrides) -> ArxivClient:
+    client = ArxivClient()
+    client.settings = client.settings.model_copy(
+        update={
+            "arxiv_base_url": str(server.make_url("/api/query")),
+            "arxiv_min_interval_seconds": 0.0,
+            "arxiv_categories": ["cs.LG"],
+            **overrides,
+        }
+    )
+    client.index = ArxivIndex(str(tmp_path / "index.db"))
+    client.rate_limiter = RateLimiter(interval_seconds=0.0)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_harvester_pages_windows_and_resumes_from_checkpoint(feed_server, tmp_path):
+    server, requests = feed_server
+    client = make_client(server, tmp_path)
+    harvester = ArxivHarvester(client)
+    harvester.settings = client.settings.model_copy(
+        update={
+            "arxiv_harvest_window_days": 10,
+            "arxiv_harvest_initial_days": 20,
+            "arxiv_harvest_page_size": 2,
+        }
+    )
+    until = datetime(2024, 5, 11, tzinfo=timezone.utc)
+
+    assert await harvester.run_once(until=until) == 3
+    windows = [(item["search_query"], item["start"]) for item in requests]
+    assert windows == [
+        ("cat:cs.LG AND lastUpdatedDate:[202404210000 TO 202405010000]", "0"),
+        ("cat:cs.LG AND lastUpdatedDate:[202405010000 TO 202405110000]", "0"),
+        ("cat:cs.LG AND lastUpdatedDate:[202405010000 TO 202405110000]", "2"),
+    ]
+    assert client.index.get_checkpoint("cs.LG") == until.isoformat()
+
+    requests.clear()
+    assert await harvester.run_once(until=until) == 0
+    assert requests == []
+
+
+@pytest.mark.asyncio
+async def test_search_answers_from_index_and_falls_back_on_miss(feed_server, tmp_path):
+    server, requests = feed_server
+    client = make_client(server, tmp_path)
+    client.index.upsert_many(client._parse_feed(make_feed([("2405.00001", "Graph neural networks")])))
+
+    hits = await client.search("graph networks", max_results=5)
+    assert [paper["arxiv_id"] for paper in hits] == ["2405.00001v1"]
+    assert requests == []
+
+    await client.search("protein folding", max_results=5)
+    assert len(requests) == 1
+    assert "protein folding" in requests[0]["search_query"]
+
+
+def test_feed_parser_yields_entries_as_bytes_arrive():
+    client = ArxivClient()
+    data = make_feed([("2405.00001", "Graph neural networks"), ("2405.00002", "Diffusion")]).encode()
+    parser = FeedParser(client)
+
+    seen: list[str] = []
+    for offset in range(0, len(data), 64):
+        seen.extend(paper["arxiv_id"] for paper in parser.feed(data[offset : offset + 64]))
+        if len(seen) == 1:
+            assert offset + 64 < len(data)
+    seen.extend(paper["arxiv_id"] for paper in parser.close())
+
+    assert seen == ["2405.00001v1", "2405.00002v1"]
+    assert parser._root is not None and len(parser._root) == 0
+
+
+@pytest.mark.asyncio
+async def test_iter_search_pages_through_results(feed_server, tmp_path):
+    server, requests = feed_server
+    client = make_client(server, tmp_path)
+
+    query = "cat:cs.LG AND lastUpdatedDate:[202405010000 TO 202405110000]"
+    papers = [paper async for paper in client.iter_search(query, page_size=2)]
+    assert [paper["title"] for paper in papers] == [
+        "Graph neural networks",
+        "Diffusion policies",
+        "Graph transformers",
+    ]
+    assert [item["start"] for item in requests] == ["0", "2"]
+
+    requests.clear()
+    limited = [paper async for paper in client.iter_search(query, page_size=2, max_total=3)]
+    assert len(limited) == 3
+    assert [(item["start"], item["max_results"]) for item in requests] == [("0", "2"), ("2", "1")]
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_shares_bucket_across_instances(tmp_path):
+    state = str(tmp_path / "bucket")
+    first = RateLimiter(interval_seconds=0.05, state_path=state)
+    second = RateLimiter(interval_seconds=0.05, state_path=state)
+
+    assert await first.acquire() == 0.0
+    waited = await second.acquire()
+    assert 0.0 < waited <= 0.05
+
+    with pytest.raises(RateLimitError) as excinfo:
+        await first.acquire(timeout=0.0)
+    assert excinfo.value.retry_after > 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_rejects_when_queue_is_full():
+    limiter = RateLimiter(interval_seconds=0.05, max_waiters=1)
+    await limiter.acquire()
+    pending = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(RateLimitError):
+        await limiter.acquire()
+    assert await pending > 0
+
+
+@pytest.mark.asyncio
+async def test_search_shares_inflight_fetch_and_serves_smaller_from_cache(feed_server, tmp_path):
+    server, requests = feed_server
+    client = make_client(server, tmp_path)
+    client.index = None
+
+    first, second = await asyncio.gather(
+        client.search("graph", max_results=5), client.search("graph", max_results=5)
+    )
+    assert len(requests) == 1
+    assert len(first) == 3
+    assert first == second
+
+    smaller = await client.search("graph", max_results=2)
+    assert len(requests) == 1
+    assert smaller == first[:2]
+
+    await client.search("graph", max_results=5, categories=["cs.CL"])
+    assert len(requests) == 2
+
+
+def test_paper_ranker_matches_whole_words_and_caches_stats():
+    ranker = PaperRanker()
+    papers = [
+        {"arxiv_id": "a", "title": "A paragraph about parsing", "summary": "", "categories": []},
+        {"arxiv_id": "b", "title": "Graph attention", "summary": "graph graph", "categories": []},
+        {"arxiv_id": "c", "title": "Graph kernels", "summary": "", "categories": ["cs.LG"]},
+    ]
+
+    ranked = ranker.rank(papers, "graph")
+
+    assert [paper["arxiv_id"] for paper in ranked][:2] == ["b", "c"]
+    assert ranked[-1]["relevance_score"] == 0.0
+    json.dumps(ranked)
+    assert all(set(paper) == {"arxiv_id", "title", "summary", "categories"} for paper in papers)
+    assert ranker.stats_for(dict(papers[1])) is ranker.stats_for(papers[1])
+
+
+def test_paper_ranker_adds_recency_prior():
+    ranker = PaperRanker()
+    now = datetime(2024, 6, 1, tzinfo=timezone.utc).timestamp()
+    papers = [
+        {"arxiv_id": "old", "title": "Graph", "published_date": "2023-01-01T00:00:00Z"},
+        {"arxiv_id": "new", "title": "Graph", "published_date": "2024-05-31T00:00:00Z"},
+    ]
+
+    ranked = ranker.rank(papers, "graph", now=now)
+
+    assert ranked[0]["arxiv_id"] == "new"
+    assert ranked[0]["relevance_score"] > ranked[1]["relevance_score"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_times_out_on_a_trickling_feed(tmp_path):
+    async def handler(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "application/atom+xml"})
+        await response.prepare(request)
+        await response.write(b'<feed xmlns="http://www.w3.org/2005/Atom">')
+        for _ in range(50):
+            await asyncio.sleep(0.05)
+            await response.write(b" ")
+        return response
+
+    app = web.Application()
+    app.router.add_get("/api/query", handler)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        client = make_client(server, tmp_path)
+        with pytest.raises(asyncio.TimeoutError):
+            await client.fetch_page("cat:cs.LG", timeout=0.3)
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_rejected_rate_limit_opens_no_connector(feed_server, tmp_path, monkeypatch):
+    import aiohttp
+
+    server, requests = feed_server
+    client = make_client(server, tmp_path)
+    client.rate_limiter = RateLimiter(interval_seconds=60.0, timeout_seconds=0.0)
+    await client.rate_limiter.acquire()
+    created: list[object] = []
+    monkeypatch.setattr(aiohttp, "TCPConnector", lambda **kwargs: created.append(kwargs))
+
+    with pytest.raises(RateLimitError):
+        await client.fetch_page("cat:cs.LG")
+    assert created == []
+    assert requests == []
+
+
+@pytest.mark.asyncio
+async def test_search_queue_timeout_refuses_a_long_rate_limit_wait(feed_server, tmp_path):
+    server, requests = feed_server
+    client = make_client(server, tmp_path)
+    client.index = None
+    client.rate_limiter = RateLimiter(interval_seconds=60.0)
+    await client.rate_limiter.acquire()
+
+    with pytest.raises(RateLimitError):
+        await client.search("graph", max_results=5, queue_timeout=0.1)
+    assert requests == []
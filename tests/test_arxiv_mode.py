@@ -1,5 +1,9 @@
+import asyncio
+
 import pytest
 
+from backend.arxiv import ArxivAnalysisStore, ArxivPaperAnalyzer
+from backend.arxiv.store import ANALYSIS_FIELDS
 from backend.models.schemas import SearchMode, SearchRequest
 from backend.pipeline.search_pipeline import SearchPipeline
 
@@ -57,3 +61,142 @@ def test_paper_to_source_mapping_contains_arxiv_fields():
     assert source["arxiv_id"] == "9876.5432"
     assert source["pdf_url"].endswith(".pdf")
     assert source["authors"] == ["A", "B"]
+
+
+@pytest.mark.asyncio
+async def test_analyze_many_runs_concurrently_and_keeps_order(monkeypatch):
+    analyzer = ArxivPaperAnalyzer()
+    analyzer.settings = analyzer.settings.model_copy(
+        update={
+            "arxiv_analysis_llm_budget": 4,
+            "arxiv_analysis_concurrency": 2,
+            "arxiv_analysis_timeout_seconds": 0.2,
+        }
+    )
+    monkeypatch.setattr(analyzer.client, "is_available_for", lambda _config=None: True)
+
+    active = 0
+    peak = 0
+
+    async def fake_analyze_paper(*, query, paper, llm_config=None, use_llm=True):
+        nonlocal active, peak
+        _ = query, llm_config, use_llm
+        active += 1
+        peak = max(peak, active)
+        try:
+            await asyncio.sleep(1.0 if paper["arxiv_id"] == "slow" else 0.01)
+        finally:
+            active -= 1
+        return {"method_highlights": f"llm:{paper['arxiv_id']}"}
+
+    monkeypatch.setattr(analyzer, "analyze_paper", fake_analyze_paper)
+
+    papers = [{"arxiv_id": name, "summary": "A transformer."} for name in ("a", "slow", "c", "d", "e")]
+    result = await analyzer.analyze_many(papers=papers, query="q")
+
+    assert [item["arxiv_id"] for item in result] == ["a", "slow", "c", "d", "e"]
+    assert peak == 2
+    assert result[0]["method_highlights"] == "llm:a"
+    assert result[1]["method_highlights"] == "Core methods: transformer."
+    assert result[4]["method_highlights"] == "Core methods: transformer."
+
+
+@pytest.mark.asyncio
+async def test_analyze_many_batches_papers_with_per_item_fallback(monkeypatch):
+    analyzer = ArxivPaperAnalyzer()
+    analyzer.settings = analyzer.settings.model_copy(
+        update={"arxiv_analysis_llm_budget": 3, "arxiv_analysis_batch_size": 3}
+    )
+    monkeypatch.setattr(analyzer.client, "is_available_for", lambda _config=None: True)
+
+    prompts: list[str] = []
+
+    async def fake_complete(*, system_prompt, user_prompt, runtime_config=None):
+        _ = system_prompt, runtime_config
+        prompts.append(user_prompt)
+        return (
+            "Here you go:\n"
+            '[{"arxiv_id": "1", "method_highlights": "batched", "reproduction_difficulty": "LOW"},'
+            ' "garbage"]'
+        )
+
+    monkeypatch.setattr(analyzer.client, "complete", fake_complete)
+
+    papers = [{"arxiv_id": str(index), "summary": "A diffusion model."} for index in range(4)]
+    result = await analyzer.analyze_many(papers=papers, query="q")
+
+    assert len(prompts) == 1
+    assert "arxiv_id: 2" in prompts[0]
+    assert [item["arxiv_id"] for item in result] == ["0", "1", "2", "3"]
+    assert result[1]["method_highlights"] == "batched"
+    assert result[1]["reproduction_difficulty"] == "low"
+    assert result[0]["method_highlights"] == "Core methods: diffusion."
+    assert result[3]["method_highlights"] == "Core methods: diffusion."
+
+
+@pytest.mark.asyncio
+async def test_analyze_batch_falls_back_for_non_string_fields(monkeypatch, tmp_path):
+    analyzer = ArxivPaperAnalyzer()
+    analyzer.settings = analyzer.settings.model_copy(
+        update={"arxiv_analysis_llm_budget": 3, "arxiv_analysis_batch_size": 3}
+    )
+    analyzer.store = ArxivAnalysisStore(str(tmp_path / "analyses.db"))
+    monkeypatch.setattr(analyzer.client, "is_available_for", lambda _config=None: True)
+
+    async def fake_complete(*, system_prompt, user_prompt, runtime_config=None):
+        _ = system_prompt, user_prompt, runtime_config
+        return (
+            '[{"arxiv_id": "0", "reproduction_difficulty": 2},'
+            ' {"arxiv_id": "1", "method_highlights": "batched"},'
+            ' {"arxiv_id": "2", "limitations": ["a", "b"], "method_highlights": "partial"}]'
+        )
+
+    monkeypatch.setattr(analyzer.client, "complete", fake_complete)
+
+    papers = [{"arxiv_id": str(index), "summary": "A diffusion model."} for index in range(3)]
+    result = await analyzer.analyze_many(papers=papers, query="q")
+
+    assert result[1]["method_highlights"] == "batched"
+    for index in (0, 2):
+        assert {key: result[index][key] for key in ANALYSIS_FIELDS} == (
+            analyzer._fallback_analysis(papers[index])
+        )
+    stored = analyzer.store.get_many(papers)
+    assert set(stored) == {("1", "")}
+
+
+@pytest.mark.asyncio
+async def test_analysis_store_skips_llm_for_seen_papers(monkeypatch, tmp_path):
+    analyzer = ArxivPaperAnalyzer()
+    analyzer.settings = analyzer.settings.model_copy(update={"arxiv_analysis_llm_budget": 1})
+    analyzer.store = ArxivAnalysisStore(str(tmp_path / "analyses.db"))
+    monkeypatch.setattr(analyzer.client, "is_available_for", lambda _config=None: True)
+
+    calls: list[str] = []
+
+    async def fake_analyze_paper(*, query, paper, llm_config=None, use_llm=True):
+        _ = query, llm_config, use_llm
+        calls.append(paper["arxiv_id"])
+        return {**analyzer._fallback_analysis(paper), "method_highlights": f"llm:{paper['arxiv_id']}"}
+
+    monkeypatch.setattr(analyzer, "analyze_paper", fake_analyze_paper)
+
+    papers = [
+        {"arxiv_id": "1", "updated_date": "2024-01-01T00:00:00Z", "summary": "x"},
+        {"arxiv_id": "2", "updated_date": "2024-01-01T00:00:00Z", "summary": "y"},
+    ]
+    first = await analyzer.analyze_many(papers=papers, query="q")
+    second = await analyzer.analyze_many(papers=papers, query="other")
+
+    assert calls == ["1", "2"]
+    assert first[0]["method_highlights"] == "llm:1"
+    assert second[0]["method_highlights"] == "llm:1"
+    assert second[1]["method_highlights"] == "llm:2"
+
+    export_path = tmp_path / "analyses.jsonl"
+    assert analyzer.store.export_jsonl(str(export_path)) == 2
+    shipped = ArxivAnalysisStore(str(tmp_path / "node2.db"))
+    assert shipped.import_jsonl(str(export_path)) == 2
+    revised = {**papers[0], "updated_date": "2024-02-01T00:00:00Z"}
+    found = shipped.get_many([papers[0], revised])
+    assert list(found) == [("1", "2024-01-01T00:00:00Z")]
@@ -0,0 +1,47 @@
+import json
+import sys
+
+import pytest
+
+from benchmarks import micro
+
+
+def run_micro(monkeypatch, *argv: str) -> None:
+    monkeypatch.setattr(
+        sys, "argv", ["micro", "ttl_cache", "--rounds", "1", "--min-time", "0.01", *argv]
+    )
+    micro.main()
+
+
+def write_baseline(tmp_path, ops_per_sec: float, alloc_peak_kb: float):
+    path = tmp_path / "baseline.json"
+    result = {
+        "name": "ttl_cache",
+        "ops_per_sec": ops_per_sec,
+        "rounds": [ops_per_sec],
+        "alloc_peak_kb": alloc_peak_kb,
+        "alloc_blocks": 0,
+        "skipped": None,
+    }
+    path.write_text(json.dumps({"results": [result]}), encoding="utf-8")
+    return path
+
+
+def test_micro_baseline_fails_on_regression(monkeypatch, tmp_path, capsys):
+    baseline = write_baseline(tmp_path, ops_per_sec=1e12, alloc_peak_kb=0.0)
+
+    with pytest.raises(SystemExit) as excinfo:
+        run_micro(monkeypatch, "--baseline", str(baseline), "--threshold", "0.15")
+
+    assert excinfo.value.code == 1
+    assert "ttl_cache: 1000000000000.0 ->" in capsys.readouterr().out
+
+
+def test_micro_baseline_passes_and_saves_synthetic_label(monkeypatch, tmp_path, capsys):
+    baseline = write_baseline(tmp_path, ops_per_sec=0.001, alloc_peak_kb=1e9)
+    saved = tmp_path / "run.json"
+
+    run_micro(monkeypatch, "--baseline", str(baseline), "--save", str(saved))
+
+    assert "No regressions" in capsys.readouterr().out
+    assert json.loads(saved.read_text(encoding="utf-8"))["corpus"] == "synthetic"
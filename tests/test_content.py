@@ -1,4 +1,8 @@
+from collections import Counter
+
+from backend.content.dedupe import NearDuplicateCollapser
 from backend.content.extractor import ContentExtractor
+from backend.content.passages import PassageSelector
 
 
 def test_extractor_returns_clean_text():
@@ -12,3 +16,115 @@ def test_extractor_returns_clean_text():
     assert "Hello" in text
     assert "World" in text
     assert "ignore" not in text
+
+
+def test_passage_selector_keeps_query_relevant_windows_in_order():
+    selector = PassageSelector()
+    content = (
+        "Welcome to our site. Subscribe to the newsletter. "
+        "FastAPI is a modern web framework for Python. "
+        "Cookies help us improve the experience. Read our privacy policy. "
+        "FastAPI builds on Starlette and Pydantic for validation."
+    )
+    sources = [
+        {"title": "A", "url": "https://a.com", "snippet": "", "content": content},
+        {"title": "B", "url": "https://b.com", "snippet": "only snippet"},
+    ]
+
+    selected = selector.select("what is fastapi python framework", sources)
+
+    passages = selected[0]["passages"]
+    assert passages
+    assert "modern web framework" in passages[0]
+    assert all("newsletter" not in passage for passage in passages)
+    assert "passages" not in selected[1]
+    assert "passages" not in sources[0]
+
+
+def test_passage_selector_falls_back_to_leading_text_without_overlap():
+    selector = PassageSelector()
+    sources = [{"title": "A", "url": "https://a.com", "content": "First line. Second line."}]
+
+    selected = selector.select("unrelated", sources)
+
+    assert selected[0]["passages"][0].startswith("First line.")
+
+
+def test_near_duplicate_collapser_folds_mirrors_into_first_copy():
+    article = " ".join(
+        f"Sentence {index} explains how the retrieval pipeline ranks evidence for answers."
+        for index in range(40)
+    )
+    other = " ".join(
+        f"Paragraph {index} covers unrelated gardening advice about tomatoes and soil."
+        for index in range(40)
+    )
+    items = [
+        {"title": "Original", "url": "https://a.com/post", "content": article},
+        {"title": "Other", "url": "https://b.com/garden", "content": other},
+        {"title": "Mirror", "url": "https://mirror.com/post", "content": article + " Copyright M."},
+        {"title": "Snippet only", "url": "https://c.com", "snippet": "short"},
+        {
+            "title": "Syndicated",
+            "url": "https://news.com/post",
+            "content": "Reposted. " + article,
+            "alternate_urls": ["https://amp.news.com/post"],
+        },
+    ]
+
+    collapsed = NearDuplicateCollapser(threshold=0.8).collapse(items)
+
+    assert [item["title"] for item in collapsed] == ["Original", "Other", "Snippet only"]
+    assert collapsed[0]["alternate_urls"] == [
+        "https://mirror.com/post",
+        "https://news.com/post",
+        "https://amp.news.com/post",
+    ]
+    assert "alternate_urls" not in items[0]
+    assert "alternate_urls" not in collapsed[1]
+
+
+def test_near_duplicate_collapser_checks_every_source_sharing_a_bucket(monkeypatch):
+    first = " ".join(f"Step {index} tunes the cache eviction policy." for index in range(20))
+    second = " ".join(f"Part {index} explains gardening with tomatoes." for index in range(20))
+    items = [
+        {"title": "First", "url": "https://a.com", "content": first},
+        {"title": "Second", "url": "https://b.com", "content": second},
+        {"title": "Copy of second", "url": "https://c.com", "content": second + " Mirrored."},
+    ]
+    collapser = NearDuplicateCollapser(threshold=0.8)
+    # Force every source into one band bucket whose first entry is the unrelated page.
+    monkeypatch.setattr(collapser, "_band_keys", lambda _signature: [(0, (0,))])
+
+    collapsed = collapser.collapse(items)
+
+    assert [item["title"] for item in collapsed] == ["First", "Second"]
+    assert collapsed[1]["alternate_urls"] == ["https://c.com"]
+
+
+def test_near_duplicate_collapser_keeps_short_distinct_snippets_apart(monkeypatch):
+    items = [
+        {
+            "title": f"Snippet {index}",
+            "url": f"https://site{index}.com",
+            "content": " ".join(f"topic{index} word{index}x{position}" for position in range(8)),
+        }
+        for index in range(200)
+    ]
+    collapser = NearDuplicateCollapser(threshold=0.8)
+    band_keys = collapser._band_keys
+    bucket_sizes: Counter = Counter()
+
+    def counting_band_keys(signature):
+        keys = band_keys(signature)
+        bucket_sizes.update(keys)
+        return keys
+
+    monkeypatch.setattr(collapser, "_band_keys", counting_band_keys)
+
+    collapsed = collapser.collapse(items)
+
+    assert len(collapsed) == len(items)
+    assert "alternate_urls" not in collapsed[0]
+    # Mostly-empty signatures must not share the all-empty bands.
+    assert max(bucket_sizes.values()) <= 3
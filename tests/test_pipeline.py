@@ -1,7 +1,14 @@
+import asyncio
+import json
+
 import pytest
 
-from backend.models.schemas import SearchRequest
+from backend.models.schemas import SearchMode, SearchRequest
+from backend.pipeline.batch import SharedCalls
+from backend.pipeline.degradation import DegradationLevel, LoadShedder
 from backend.pipeline.search_pipeline import SearchPipeline
+from backend.utils.metrics import metrics
+from backend.utils.tracing import Trace
 
 
 @pytest.mark.asyncio
@@ -67,3 +74,598 @@ def test_sanitize_sources_normalizes_nan_score():
 
     assert cleaned[0]["relevance_score"] == 0.0
     assert cleaned[1]["relevance_score"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_search_stream_emits_stage_events_and_heartbeats(monkeypatch):
+    pipeline = SearchPipeline()
+    pipeline.settings = pipeline.settings.model_copy(
+        update={"reranker_enabled": False, "sse_heartbeat_seconds": 0.01}
+    )
+
+    async def fake_search(_query, max_results=8):
+        _ = max_results
+        return [
+            {"title": "A", "url": "https://a.com", "snippet": "x", "source_engine": "duckduckgo"},
+            {"title": "B", "url": "https://b.com", "snippet": "y", "source_engine": "duckduckgo"},
+        ]
+
+    async def fake_fetch(url):
+        return f"<html><body><p>Content for {url}</p></body></html>"
+
+    async def fake_stream(**_kwargs):
+        await asyncio.sleep(0.05)
+        yield "Answer"
+
+    monkeypatch.setattr(pipeline.aggregator, "search", fake_search)
+    monkeypatch.setattr(pipeline.fetcher, "fetch", fake_fetch)
+    monkeypatch.setattr(pipeline.synthesizer, "stream", fake_stream)
+
+    request = SearchRequest(query="hello", stream=True)
+    events = [event async for event in pipeline.search_stream(request)]
+    names = [event.split("\n", 1)[0].removeprefix("event: ") for event in events]
+
+    assert names[0] == "search_results"
+    assert names.count("source_ready") == 2
+    assert names.index("source_ready") < names.index("sources") < names.index("answer_chunk")
+    assert "heartbeat" in names
+    first = json.loads(events[0].split("data: ", 1)[1])
+    assert first["stage"] == "search"
+    assert "stage_time" in first and "elapsed" in first
+    end = json.loads(events[-1].split("data: ", 1)[1])
+    assert {"search", "fetch"} <= set(end["timings"])
+
+
+@pytest.mark.asyncio
+async def test_search_stream_coalesces_answer_chunks(monkeypatch):
+    pipeline = SearchPipeline()
+    pipeline.settings = pipeline.settings.model_copy(
+        update={"sse_coalesce_ms": 1000, "sse_coalesce_chars": 4}
+    )
+
+    async def fake_retrieve(_request):
+        return [{"title": "A", "url": "https://a.com", "snippet": "x"}]
+
+    async def fake_stream(**_kwargs):
+        for char in "abcdefghij":
+            yield char
+
+    monkeypatch.setattr(pipeline, "_retrieve", fake_retrieve)
+    monkeypatch.setattr(pipeline.synthesizer, "stream", fake_stream)
+
+    events = [event async for event in pipeline.search_stream(SearchRequest(query="hello"))]
+    chunks = [
+        json.loads(event.split("data: ", 1)[1])["chunk"]
+        for event in events
+        if event.startswith("event: answer_chunk")
+    ]
+    end = json.loads(events[-1].split("data: ", 1)[1])
+
+    assert chunks == ["abcd", "efgh", "ij"]
+    assert end["answer"] == "abcdefghij"
+    assert "sources" not in end
+    assert end["sources_ref"] == "sources"
+
+
+@pytest.mark.asyncio
+async def test_search_stream_cancels_work_when_client_disconnects(monkeypatch):
+    pipeline = SearchPipeline()
+    pipeline.settings = pipeline.settings.model_copy(update={"sse_disconnect_poll_seconds": 0.01})
+    cancelled = asyncio.Event()
+
+    async def slow_retrieve(_request):
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return []
+
+    checks = 0
+
+    async def is_disconnected():
+        nonlocal checks
+        checks += 1
+        return checks > 1
+
+    monkeypatch.setattr(pipeline, "_retrieve", slow_retrieve)
+    before = metrics.value("autosearch_stream_cancellations_total", reason="client_disconnect")
+
+    request = SearchRequest(query="hello")
+    events = await asyncio.wait_for(
+        _collect(pipeline.search_stream(request, is_disconnected=is_disconnected)), timeout=2
+    )
+
+    assert cancelled.is_set()
+    assert not any("answer_end" in event for event in events)
+    after = metrics.value("autosearch_stream_cancellations_total", reason="client_disconnect")
+    assert after == before + 1
+
+
+async def _collect(stream):
+    return [event async for event in stream]
+
+
+@pytest.mark.asyncio
+async def test_quick_mode_skips_page_fetch_when_snippets_suffice(monkeypatch):
+    pipeline = SearchPipeline()
+    pipeline.settings = pipeline.settings.model_copy(update={"reranker_enabled": False})
+    long_snippet = "FastAPI is a modern, fast web framework for building APIs with Python. " * 2
+    results = [
+        {"title": f"R{index}", "url": f"https://r{index}.com", "snippet": long_snippet}
+        for index in range(4)
+    ]
+    fetched: list[str] = []
+
+    async def fake_search(_query, max_results=8):
+        _ = max_results
+        return [dict(item) for item in results]
+
+    async def fake_fetch(url):
+        fetched.append(url)
+        return "<html><body><p>page</p></body></html>"
+
+    monkeypatch.setattr(pipeline.aggregator, "search", fake_search)
+    monkeypatch.setattr(pipeline.fetcher, "fetch", fake_fetch)
+
+    sources = await pipeline._retrieve(SearchRequest(query="fastapi", max_sources=3))
+    assert len(sources) == 3
+    assert fetched == []
+
+    results[1]["snippet"] = results[2]["snippet"] = results[3]["snippet"] = "short"
+    await pipeline._retrieve(SearchRequest(query="fastapi", max_sources=3))
+    assert fetched
+
+
+@pytest.mark.asyncio
+async def test_deep_mode_fans_out_sub_queries_and_dedupes_urls(monkeypatch):
+    pipeline = SearchPipeline()
+    pipeline.settings = pipeline.settings.model_copy(
+        update={"reranker_enabled": False, "deep_max_sub_queries": 3, "deep_max_concurrency": 2}
+    )
+    monkeypatch.setattr(pipeline.synthesizer.client, "is_available_for", lambda _cfg=None: False)
+    active = 0
+    peak = 0
+    queries: list[str] = []
+
+    async def fake_search(query, max_results=8):
+        nonlocal active, peak
+        _ = max_results
+        queries.append(query)
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return [
+            {"title": "Shared", "url": "https://shared.com", "snippet": query},
+            {"title": query, "url": f"https://{query.replace(' ', '-')}.com", "snippet": query},
+        ]
+
+    async def fake_fetch(url):
+        return f"<html><body><p>{url} content</p></body></html>"
+
+    monkeypatch.setattr(pipeline.aggregator, "search", fake_search)
+    monkeypatch.setattr(pipeline.fetcher, "fetch", fake_fetch)
+
+    request = SearchRequest(query="fastapi", mode=SearchMode.DEEP, max_sources=10)
+    sources = await pipeline._retrieve(request)
+
+    assert queries[0] == "fastapi" and len(queries) == 3
+    assert peak == 2
+    urls = [source["url"] for source in sources]
+    assert urls.count("https://shared.com") == 1
+    assert len(urls) == 4
+
+
+@pytest.mark.asyncio
+async def test_research_planner_falls_back_on_unparseable_plan(monkeypatch):
+    pipeline = SearchPipeline()
+    client = pipeline.planner.client
+    monkeypatch.setattr(client, "is_available_for", lambda _cfg=None: True)
+
+    async def fake_complete(**_kwargs):
+        return "no json here"
+
+    monkeypatch.setattr(client, "complete", fake_complete)
+    plan = await pipeline.planner.plan("rust async", max_queries=3)
+    assert plan == ["rust async", "rust async explained", "rust async latest developments"]
+
+    async def planned(**_kwargs):
+        return '```json\n["Rust Async", "tokio vs async-std"]\n```'
+
+    monkeypatch.setattr(client, "complete", planned)
+    assert await pipeline.planner.plan("rust async", max_queries=3) == [
+        "rust async",
+        "tokio vs async-std",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_academic_mode_fuses_web_and_arxiv_and_skips_arxiv_fetches(monkeypatch):
+    pipeline = SearchPipeline()
+    paper = {
+        "arxiv_id": "2401.01234v1",
+        "title": "Fast Attention",
+        "url": "http://arxiv.org/abs/2401.01234v1",
+        "summary": "We propose fast attention.",
+        "published_date": "2024-01-02T00:00:00Z",
+        "categories": ["cs.LG"],
+    }
+    web = [
+        {"title": "Fast Attention PDF", "url": "https://arxiv.org/pdf/2401.01234.pdf", "snippet": "pdf"},
+        {"title": "Blog", "url": "https://blog.example.com/attention", "snippet": "blog post"},
+        {"title": "Other paper", "url": "https://arxiv.org/abs/2402.00001", "snippet": "other"},
+        {"title": "Other paper PDF", "url": "https://arxiv.org/pdf/2402.00001v3", "snippet": "other"},
+    ]
+    fetched: list[str] = []
+
+    async def fake_web(_query, max_results=8):
+        _ = max_results
+        return [dict(item) for item in web]
+
+    async def fake_arxiv(**_kwargs):
+        return [dict(paper)]
+
+    async def fake_fetch(url):
+        fetched.append(url)
+        return "<html><body><p>Blog content about attention.</p></body></html>"
+
+    monkeypatch.setattr(pipeline.aggregator, "search", fake_web)
+    monkeypatch.setattr(pipeline.arxiv_client, "search", fake_arxiv)
+    monkeypatch.setattr(pipeline.fetcher, "fetch", fake_fetch)
+
+    request = SearchRequest(query="fast attention", mode=SearchMode.ACADEMIC, max_sources=5)
+    sources = await pipeline._retrieve(request)
+
+    assert [source["title"] for source in sources] == ["Fast Attention", "Other paper", "Blog"]
+    assert sources[0]["source_engine"] == "arxiv"
+    assert fetched == ["https://blog.example.com/attention"]
+
+
+@pytest.mark.asyncio
+async def test_academic_mode_answers_web_only_when_arxiv_misses_its_deadline(monkeypatch):
+    pipeline = SearchPipeline()
+    pipeline.settings = pipeline.settings.model_copy(
+        update={"reranker_enabled": False, "academic_arxiv_timeout_seconds": 0.05}
+    )
+    queue_timeouts: list[float | None] = []
+
+    async def fake_web(_query, max_results=8):
+        _ = max_results
+        return [{"title": "Blog", "url": "https://blog.example.com/attention", "snippet": "blog"}]
+
+    async def slow_arxiv(**kwargs):
+        queue_timeouts.append(kwargs.get("queue_timeout"))
+        await asyncio.sleep(5)
+        return []
+
+    async def fake_fetch(_url):
+        return "<html><body><p>Blog content about attention.</p></body></html>"
+
+    monkeypatch.setattr(pipeline.aggregator, "search", fake_web)
+    monkeypatch.setattr(pipeline.arxiv_client, "search", slow_arxiv)
+    monkeypatch.setattr(pipeline.fetcher, "fetch", fake_fetch)
+    before = metrics.value("autosearch_academic_web_only_total", reason="timeout")
+
+    request = SearchRequest(query="fast attention", mode=SearchMode.ACADEMIC, max_sources=5)
+    started = asyncio.get_running_loop().time()
+    sources = await pipeline._retrieve(request)
+
+    assert asyncio.get_running_loop().time() - started < 1.0
+    assert [source["title"] for source in sources] == ["Blog"]
+    assert queue_timeouts == [0.05]
+    assert metrics.value("autosearch_academic_web_only_total", reason="timeout") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_search_batch_shares_engine_calls_and_fetches(monkeypatch):
+    pipeline = SearchPipeline()
+    pipeline.settings = pipeline.settings.model_copy(
+        update={"reranker_enabled": False, "quick_snippet_only": False, "cache_enabled": False}
+    )
+    searches: list[str] = []
+    fetched: list[str] = []
+
+    async def fake_search(query, max_results=8):
+        _ = max_results
+        searches.append(query)
+        await asyncio.sleep(0.01)
+        return [{"title": "Shared", "url": "https://shared.com", "snippet": "s"}]
+
+    async def fake_fetch(url):
+        fetched.append(url)
+        await asyncio.sleep(0.01)
+        return "<html><body><p>shared page</p></body></html>"
+
+    async def fake_generate(**_kwargs):
+        return "answer"
+
+    monkeypatch.setattr(pipeline.aggregator, "search", fake_search)
+    monkeypatch.setattr(pipeline.fetcher, "fetch", fake_fetch)
+    monkeypatch.setattr(pipeline.synthesizer, "generate", fake_generate)
+
+    requests = [
+        SearchRequest(query="FastAPI", stream=False, max_sources=3),
+        SearchRequest(query="fastapi ", stream=False, max_sources=3),
+        SearchRequest(query="pydantic", stream=False, max_sources=3),
+    ]
+    results = await _collect(pipeline.search_batch(requests, concurrency=3))
+
+    assert sorted(item["index"] for item in results) == [0, 1, 2]
+    assert all(item["result"]["answer"] == "answer" for item in results)
+    assert len(searches) == 2
+    assert fetched == ["https://shared.com"]
+
+
+@pytest.mark.asyncio
+async def test_shared_calls_keeps_only_the_most_recent_finished_results():
+    shared = SharedCalls(max_completed=2)
+    calls: list[str] = []
+
+    def factory(key):
+        async def call():
+            calls.append(key)
+            return f"<html>{key}</html>"
+
+        return call
+
+    for key in ("a", "b", "a", "c"):
+        await shared.run(key, factory(key))
+    assert calls == ["a", "b", "c"]
+    assert len(shared._tasks) == 2
+
+    # "b" was least recently used, so it is dropped and runs again; "a" is still shared.
+    assert await shared.run("a", factory("a")) == "<html>a</html>"
+    assert await shared.run("b", factory("b")) == "<html>b</html>"
+    assert calls == ["a", "b", "c", "b"]
+    assert len(shared._tasks) == 2
+    shared.close()
+
+
+@pytest.mark.asyncio
+async def test_search_batch_pools_rerank_pairs_into_one_predict(monkeypatch):
+    pipeline = SearchPipeline()
+    pipeline.settings = pipeline.settings.model_copy(
+        update={
+            "reranker_enabled": True,
+            "quick_snippet_only": False,
+            "cache_enabled": False,
+            "near_duplicate_enabled": False,
+            "batch_rerank_window_seconds": 0.05,
+        }
+    )
+    topics = ["alpha", "bravo", "charlie", "delta", "echo"]
+    batches: list[int] = []
+
+    class FakeCrossEncoder:
+        def predict(self, pairs):
+            batches.append(len(pairs))
+            return [float(query in passage) for query, passage in pairs]
+
+    pipeline.reranker.model = FakeCrossEncoder()
+    pipeline.reranker.is_loaded = True
+
+    async def fake_search(query, max_results=8):
+        _ = max_results
+        return [
+            {"title": topic, "url": f"https://{topic}.com", "snippet": topic}
+            for topic in topics
+            if topic != query
+        ] + [{"title": query, "url": f"https://{query}.com", "snippet": query}]
+
+    async def fake_fetch(url):
+        topic = url.removeprefix("https://").removesuffix(".com")
+        return f"<html><body><p>{topic} page</p></body></html>"
+
+    async def fake_generate(**_kwargs):
+        return "answer"
+
+    monkeypatch.setattr(pipeline.aggregator, "search", fake_search)
+    monkeypatch.setattr(pipeline.fetcher, "fetch", fake_fetch)
+    monkeypatch.setattr(pipeline.synthesizer, "generate", fake_generate)
+
+    requests = [SearchRequest(query=topic, stream=False, max_sources=5) for topic in topics]
+    results = await _collect(pipeline.search_batch(requests, concurrency=len(topics)))
+
+    assert len(batches) == 1
+    assert batches[0] == len(topics) * len(topics)
+    for item in results:
+        assert item["result"]["sources"][0]["url"] == f"https://{item['query']}.com"
+
+
+@pytest.mark.asyncio
+async def test_search_sync_cache_hit_carries_root_only_trace(monkeypatch):
+    pipeline = SearchPipeline()
+    pipeline.settings = pipeline.settings.model_copy(
+        update={"reranker_enabled": False, "quick_snippet_only": False, "cache_enabled": True}
+    )
+
+    async def fake_search(query, max_results=8):
+        _ = query, max_results
+        return [{"title": "A", "url": "https://a.com", "snippet": "a"}]
+
+    async def fake_fetch(url):
+        _ = url
+        return "<html><body><p>page content</p></body></html>"
+
+    async def fake_generate(**_kwargs):
+        return "answer"
+
+    monkeypatch.setattr(pipeline.aggregator, "search", fake_search)
+    monkeypatch.setattr(pipeline.fetcher, "fetch", fake_fetch)
+    monkeypatch.setattr(pipeline.synthesizer, "generate", fake_generate)
+
+    request = SearchRequest(query="cached trace", stream=False, include_trace=True)
+    first = await pipeline.search_sync(request)
+    second = await pipeline.search_sync(request)
+
+    assert len(first["trace"]["spans"]) > 1
+    assert second["answer"] == first["answer"]
+    assert [item["name"] for item in second["trace"]["spans"]] == ["request"]
+    assert second["trace"]["spans"][0]["attributes"]["cache"] == "hit"
+    assert second["trace"]["trace_id"] != first["trace"]["trace_id"]
+    assert set(second["timings"]) == {"cache"}
+    untraced = await pipeline.search_sync(request.model_copy(update={"include_trace": False}))
+    assert "trace" not in untraced
+
+
+@pytest.mark.asyncio
+async def test_search_sync_returns_trace_spans_when_requested(monkeypatch):
+    pipeline = SearchPipeline()
+    pipeline.settings = pipeline.settings.model_copy(
+        update={"reranker_enabled": False, "quick_snippet_only": False, "cache_enabled": False}
+    )
+
+    class FakeEngine:
+        name = "fake"
+
+        async def search(self, _query, max_results=8):
+            _ = max_results
+            return [{"title": "A", "url": "https://a.com", "snippet": "a"}]
+
+    async def fake_fetch(url):
+        _ = url
+        return "<html><body><p>page content</p></body></html>"
+
+    async def fake_generate(**_kwargs):
+        return "answer"
+
+    pipeline.aggregator.engines = [FakeEngine()]
+    monkeypatch.setattr(pipeline.fetcher, "fetch", fake_fetch)
+    monkeypatch.setattr(pipeline.synthesizer, "generate", fake_generate)
+
+    plain = await pipeline.search_sync(SearchRequest(query="x", stream=False))
+    assert "trace" not in plain
+
+    data = await pipeline.search_sync(SearchRequest(query="x", stream=False, include_trace=True))
+    spans = {item["name"]: item for item in data["trace"]["spans"]}
+    assert {"request", "search", "engine.search", "extract", "fetch", "synthesize"} <= set(spans)
+    root = spans["request"]
+    assert root["parent_id"] is None
+    assert spans["engine.search"]["parent_id"] == root["span_id"]
+    assert spans["engine.search"]["attributes"] == {"engine": "fake"}
+
+    trace = Trace("request")
+    trace.add("fetch", trace.root.start, url="https://a.com")
+    trace.finish()
+    otlp = trace.to_otlp("autosearch")
+    exported = otlp["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert len(exported["traceId"]) == 32 and len(exported["spanId"]) == 16
+    assert int(exported["endTimeUnixNano"]) >= int(exported["startTimeUnixNano"])
+
+
+@pytest.mark.asyncio
+async def test_search_sync_degrades_under_load(monkeypatch):
+    pipeline = SearchPipeline()
+    searched: list[int] = []
+    fetched: list[str] = []
+    generated: list[int] = []
+
+    async def fake_search(_query, max_results=8):
+        searched.append(max_results)
+        return [
+            {"title": f"R{index}", "url": f"https://r{index}.com", "snippet": "short"}
+            for index in range(8)
+        ]
+
+    async def fake_fetch(url):
+        fetched.append(url)
+        return "<html><body><p>page content</p></body></html>"
+
+    async def fake_generate(**kwargs):
+        generated.append(len(kwargs["sources"]))
+        return "LLM answer [1]"
+
+    def fail_rerank(*_args):
+        raise AssertionError("reranker must be skipped when degraded")
+
+    monkeypatch.setattr(pipeline.aggregator, "search", fake_search)
+    monkeypatch.setattr(pipeline.fetcher, "fetch", fake_fetch)
+    monkeypatch.setattr(pipeline.synthesizer, "generate", fake_generate)
+    monkeypatch.setattr(pipeline.reranker, "rerank", fail_rerank)
+    monkeypatch.setattr(pipeline.planner, "plan", fail_rerank)
+    before = metrics.value("autosearch_degraded_requests_total", level="quick_only")
+
+    # 30 of 32 admission slots busy only drops reranking.
+    pipeline.admission.in_flight = 30
+    result = await pipeline.search_sync(SearchRequest(query="fastapi", max_sources=6))
+
+    assert result["degradation_level"] == 1
+    assert len(result["sources"]) == 6 and generated == [6]
+    pipeline.cache._data.clear()
+    generated.clear()
+    searched.clear()
+
+    # Levels past in-flight saturation come from LLM cooldown (budget 10s) or loop lag.
+    pipeline.admission.in_flight = 0
+    pipeline.load_shedder._llm_wait = lambda: 13.0
+    request = SearchRequest(query="fastapi", mode=SearchMode.DEEP, max_sources=6)
+    result = await pipeline.search_sync(request)
+
+    assert result["degradation_level"] == 3
+    assert searched == [6]
+    assert len(result["sources"]) == 3 and generated == [3]
+    assert fetched
+    assert metrics.value("autosearch_degraded_requests_total", level="quick_only") == before + 1
+    assert not pipeline.cache._data
+
+    pipeline.load_shedder._llm_wait = lambda: 20.0
+    fetched.clear()
+    result = await pipeline.search_sync(SearchRequest(query="fastapi", max_sources=6))
+
+    assert result["degradation_level"] == 4
+    assert fetched == [] and generated == [3]
+    assert result["answer"].startswith("I could not produce a full LLM answer")
+
+
+@pytest.mark.asyncio
+async def test_load_shedder_decays_stale_loop_lag():
+    shedder = LoadShedder(
+        in_flight=lambda: 0,
+        capacity=32,
+        llm_wait=lambda: 0.0,
+        lag_budget=0.25,
+        llm_wait_budget=10.0,
+        thresholds=[0.9, 1.0, 1.25, 1.5],
+    )
+    loop = asyncio.get_running_loop()
+    shedder.loop_lag = 0.5
+    shedder.sampled_at = loop.time()
+    assert await shedder.assess() >= DegradationLevel.QUICK_ONLY
+
+    # Ten idle seconds after the burst: the old lag has halved ten times.
+    shedder.loop_lag = 0.5
+    shedder.sampled_at = loop.time() - 10.0
+    assert await shedder.assess() == DegradationLevel.NORMAL
+    assert shedder.loop_lag < 0.01
+
+
+@pytest.mark.asyncio
+async def test_quick_mode_collapses_mirrored_pages_before_rerank(monkeypatch):
+    pipeline = SearchPipeline()
+    pipeline.settings = pipeline.settings.model_copy(update={"reranker_enabled": False})
+    body = "".join(
+        f"<p>Step {index}: configure the FastAPI dependency injection container carefully.</p>"
+        for index in range(30)
+    )
+
+    async def fake_search(_query, max_results=8):
+        _ = max_results
+        return [
+            {"title": "Docs", "url": "https://docs.example.com/di", "snippet": "short"},
+            {"title": "Mirror", "url": "https://mirror.example.org/di", "snippet": "short"},
+            {"title": "Blog", "url": "https://blog.example.com/other", "snippet": "short"},
+        ]
+
+    async def fake_fetch(url):
+        if "blog" in url:
+            return "<html><body><p>A different article about async database drivers.</p></body></html>"
+        return f"<html><body><article>{body}</article></body></html>"
+
+    monkeypatch.setattr(pipeline.aggregator, "search", fake_search)
+    monkeypatch.setattr(pipeline.fetcher, "fetch", fake_fetch)
+
+    sources = await pipeline._retrieve(SearchRequest(query="fastapi di", max_sources=3))
+
+    assert [source["title"] for source in sources] == ["Docs", "Blog"]
+    assert sources[0]["alternate_urls"] == ["https://mirror.example.org/di"]
@@ -1,4 +1,9 @@
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
 from backend.search.aggregator import SearchAggregator
+from backend.search.duckduckgo import DuckDuckGoSearchEngine
+from backend.search.fusion import arxiv_key, reciprocal_rank_fusion
 
 
 def test_dedupe_and_score_merges_same_url():
@@ -18,3 +23,48 @@ def test_dedupe_and_score_merges_same_url():
     assert len(merged) == 2
     assert merged[0]["url"] == "https://example.com/a"
     assert merged[0]["snippet"] == "this is a longer snippet"
+
+
+def test_arxiv_key_normalizes_abs_pdf_and_versions():
+    assert arxiv_key("https://arxiv.org/abs/2401.01234v2") == "2401.01234"
+    assert arxiv_key("http://arxiv.org/pdf/2401.01234.pdf") == "2401.01234"
+    assert arxiv_key("https://arxiv.org/abs/hep-th/9901001") == "hep-th/9901001"
+    assert arxiv_key("https://example.com/abs/2401.01234") is None
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    first = [{"url": "a"}, {"url": "b"}, {"url": "c"}]
+    second = [{"url": "c"}, {"url": "d"}]
+    fused = reciprocal_rank_fusion([first, second], k=60)
+    assert [item["url"] for item in fused] == ["c", "a", "b", "d"]
+
+
+async def test_duckduckgo_engine_uses_configured_base_url():
+    async def handler(request: web.Request) -> web.Response:
+        query = request.query["q"]
+        html = (
+            '<div class="result"><a class="result__a" href="https://example.com/a">'
+            f"{query}</a><a class=\"result__snippet\">About {query}</a></div>"
+        )
+        return web.Response(text=html, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/html/", handler)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        engine = DuckDuckGoSearchEngine()
+        base_url = str(server.make_url("/html/"))
+        engine.settings = engine.settings.model_copy(update={"duckduckgo_base_url": base_url})
+        results = await engine.search("fastapi")
+    finally:
+        await server.close()
+
+    assert results == [
+        {
+            "title": "fastapi",
+            "url": "https://example.com/a",
+            "snippet": "About fastapi",
+            "source_engine": "duckduckgo",
+        }
+    ]